@@ -1,18 +1,43 @@
 import streamlit as st
 import os
+import time as time_module
 from datetime import time, date
+from functools import partial
+from typing import TYPE_CHECKING, Callable, Dict, Optional, Tuple
 
-from src.data_processor.loading_cleaning import prepare_data
-from src.data_processor.rider_categorization import categorize_riders, filter_by_rider_type
-from src.data_processor.feature_engineering import label_rush_hour, calculate_trip_metrics
+import pandas as pd
+
+from src.data_processor.background_loader import BackgroundLoader
+from src.data_processor.station_dimension import StationDimension
+from src.data_processor.memory_governor import MB, MemoryGovernor
+from src.data_processor.rider_categorization import filter_by_rider_type
 from src.data_processor.utils import filter_data_advanced
 
-from src.analytics.usage_patterns import calculate_daily_rides
-from src.analytics.plotting import plot_daily_rides, plot_duration_histogram
+from src.analytics.incremental import PartialAggregates
+from src.analytics.parallel import TaskOutcome, run_concurrently, run_task
+from src.analytics.single_flight import shared_registry
+from src.analytics.registry import LazyModule, get_view
+from src.analytics.usage_patterns import calculate_daily_rides, calculate_kpis
 from src.analytics.stations import get_top_starting_stations
-from src.analytics.plot_top_stations import plot_top_stations
+from src.analytics.spatial import StationIndex, load_station_coordinates
+from src.analytics.sampling import (
+    StratifiedSample, build_stratified_sample, approximate_kpis, approximate_daily_rides,
+    approximate_top_stations, approximate_duration_bins
+)
 
-from src.config import URL, USER_TYPE_COL, DURATION_MIN_COL, START_TIME_COL, IS_RUSH_HOUR_COL
+# Charting stacks and the optional panels' modules load on first use (see src/analytics/registry.py).
+px = LazyModule("plotly.express")
+if TYPE_CHECKING:
+    from src.analytics.anomalies import StationAnomalyDetector
+    from src.analytics.clustering import StationClusters
+    from src.analytics.forecasting import StationForecast
+    from src.analytics.comparison import PeriodComparison
+
+from src.config import (URL, USER_TYPE_COL, DURATION_MIN_COL, START_TIME_COL, IS_RUSH_HOUR_COL, LOADER_REFRESH_SEC,
+                        SAMPLE_WEIGHT_COL, APPROX_SAMPLE_ROWS, STATION_INFO_FILE_PATH,
+                        QUANTILE_SKETCH_ACCURACY, START_STATION_COL, START_STATION_CODE_COL,
+                        END_STATION_COL, END_STATION_CODE_COL, STATION_DIM_FILE_PATH, CLUSTER_COUNT,
+                        WEATHER_FILE_PATH, SPILL_RESTORE_ROWS)
 
 # version 2.0
 # ---------------------------------------------------
@@ -168,175 +193,758 @@ st.set_page_config(
 
 
 # ---------------------------------------------------
-# MAIN FUNCTION
+# DATA LOADING
 # ---------------------------------------------------
-def main():
+@st.cache_resource(show_spinner=False)
+def get_loader(data_source) -> BackgroundLoader:
+    """
+    One background loader per data source, shared across reruns and sessions.
+    Trips are encoded against the persistent station dimension as they load, within the memory budget.
+    """
+    return BackgroundLoader(data_source, station_dimension=StationDimension.load(STATION_DIM_FILE_PATH),
+                            governor=MemoryGovernor()).start()
+
+
+def raise_if_failed(loader: BackgroundLoader) -> None:
+    """
+    Re-raises a failed load's error, first evicting its loader from the cache so the next rerun
+    or session starts a fresh load instead of replaying the same error until a restart.
+    """
+    if loader.error is not None:
+        get_loader.clear(loader.data_source)
+        raise loader.error
+
+
+@st.cache_resource(show_spinner="Building approximate-mode sample…")
+def get_sample(_df, dataset_version: tuple, max_rows: int = APPROX_SAMPLE_ROWS) -> StratifiedSample:
+    """
+    Stratified sample kept alongside the full data; dataset_version (the loader's source fingerprint and
+    row count) stands in for the unhashed frame in the cache key.
+    """
+    return build_stratified_sample(_df, max_rows=max_rows)
+
+
+@st.cache_resource(show_spinner="Scoring station departures…")
+def get_anomaly_detector(_df, dataset_version: tuple, freq: str) -> "StationAnomalyDetector":
+    """
+    Stations x time-bucket anomaly scores for the loaded data; dataset_version keys the cache in place of
+    the frame.
+    """
+    return get_view("StationAnomalyDetector")(freq=freq, station_col=station_col_of(_df)).update(_df)
+
+
+@st.cache_resource(show_spinner="Clustering stations by weekly usage…")
+def get_station_clusters(_df, dataset_version: tuple, k: int,
+                         _station_dimension: Optional[StationDimension] = None) -> "StationClusters":
+    """
+    Stations grouped by hour-of-week profile; clusters on the station codes when the frame carries them.
+    """
+    cluster_stations = get_view("cluster_stations")
+    if _station_dimension is None or START_STATION_CODE_COL not in _df.columns:
+        return cluster_stations(_df, k)
+
+    clusters = cluster_stations(_df, k, start_station_col=START_STATION_CODE_COL,
+                                end_station_col=END_STATION_CODE_COL)
+    return clusters._replace(assignments=_station_dimension.decode(clusters.assignments))
+
+
+@st.cache_resource(show_spinner="Forecasting station demand…")
+def get_station_forecast(_df, dataset_version: tuple) -> "StationForecast":
+    """
+    Next-day hourly departure forecasts and backtest for every station, fit in one batch.
+    """
+    return get_view("forecast_station_demand")(_df, station_col=station_col_of(_df))
+
+
+@st.cache_resource(show_spinner="Joining trips to weather observations…")
+def get_weather_kpis(_df, dataset_version: tuple, by: str, path: str) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    KPIs per weather bucket and daily rides with the day's weather, from the hourly file at path.
+    """
+    weather = get_view("load_weather")(path)
+    by_weather = get_view("kpis_by_weather")(_df, weather, by=by)
+    daily = get_view("join_daily_weather")(calculate_daily_rides(_df), weather)
+    return by_weather, daily
+
+
+@st.cache_resource(show_spinner=False)
+def get_station_index(path: str) -> StationIndex:
+    """
+    Spatial index over the station coordinates, built once per process.
+    """
+    return StationIndex(load_station_coordinates(path))
+
+
+def station_col_of(df: pd.DataFrame) -> str:
+    """The start station column to group on: the stable codes when the frame was encoded, else the names."""
+    return START_STATION_CODE_COL if START_STATION_CODE_COL in df.columns else START_STATION_COL
+
+
+def with_station_names(df: pd.DataFrame, station_dimension: Optional[StationDimension]) -> pd.DataFrame:
+    """A result or trip frame for display: station code columns (and a code index) replaced by the names."""
+    if station_dimension is None:
+        return df
+    if df.index.name == START_STATION_CODE_COL:
+        df = df.set_axis(pd.Index(station_dimension.names(df.index).to_numpy(), name=START_STATION_COL))
+    for code_col, name_col in [(START_STATION_CODE_COL, START_STATION_COL),
+                               (END_STATION_CODE_COL, END_STATION_COL)]:
+        if code_col in df.columns:
+            df = station_dimension.decode(df, code_col, name_col)
+    return df
+
+
+def _ci_suffix(ci) -> str:
+    return f" <small>± {ci:.1f}</small>" if ci else ""
+
+
+def render_kpi_cards(total_rides: int, avg_duration: float, subscriber_rate: float,
+                     total_rides_ci: float = None, avg_duration_ci: float = None,
+                     subscriber_rate_ci: float = None):
+
+    c1, c2, c3 = st.columns(3)
+
+    with c1:
+        st.markdown(
+            f"""
+            <div class="kpi-card">
+                <div class="kpi-card-title">Total Rides</div>
+                <div class="kpi-card-value">{total_rides:,}{_ci_suffix(total_rides_ci)}</div>
+            </div>
+            """,
+            unsafe_allow_html=True
+        )
 
-    # TITLE
-    st.title("🚴 Toronto Bike-Sharing Analytics Dashboard")
-    st.markdown("Interactive analytics for Toronto Bike Share ridership.")
-    st.markdown("---")
+    with c2:
+        st.markdown(
+            f"""
+            <div class="kpi-card">
+                <div class="kpi-card-title">Avg Trip Duration (min)</div>
+                <div class="kpi-card-value">{avg_duration:.1f}{_ci_suffix(avg_duration_ci)}</div>
+            </div>
+            """,
+            unsafe_allow_html=True
+        )
 
-    # DATA PIPELINE
-    raw = prepare_data(URL)
-    df = categorize_riders(raw)
-    df = label_rush_hour(df)
-    df = calculate_trip_metrics(df)
+    with c3:
+        st.markdown(
+            f"""
+            <div class="kpi-card">
+                <div class="kpi-card-title">Annual Member Trip Share</div>
+                <div class="kpi-card-value">{subscriber_rate:.1f}%{_ci_suffix(subscriber_rate_ci)}</div>
+            </div>
+            """,
+            unsafe_allow_html=True
+        )
 
-    # TABS
-    tab_timeline, tab_duration, tab_stations, tab_data = st.tabs(
-        ["Timeline & KPIs", "Duration Analytics", "Stations Analytics", "Data Tables"]
+
+def render_memory_status(governor: Optional[MemoryGovernor]):
+    """Sidebar footprint against the memory budget, and what has been spilled, mapped or released."""
+    if governor is None:
+        return
+    status = governor.status()
+    with st.sidebar.expander("Memory", expanded=status.spilling):
+        footprint = status.resident_bytes if status.resident_bytes is not None else status.held_bytes
+        st.progress(min(status.usage, 1.0),
+                    text=f"{footprint / MB:,.0f} MB of {status.budget_bytes / MB:,.0f} MB budget")
+        st.caption(f"Trip data held in memory: {status.held_bytes / MB:,.0f} MB")
+        if status.spilling:
+            st.caption(f"Spilled to disk ({status.spilled_bytes / MB:,.1f} MB, {status.spilled_rows:,} rows): "
+                       f"{', '.join(status.spilled_columns)}. The Data Tables tab reads them back on request.")
+        else:
+            st.caption("Nothing spilled.")
+        if status.mapped_columns:
+            st.caption(f"Memory-mapped from disk ({status.mapped_rows:,} rows): {', '.join(status.mapped_columns)}. "
+                       f"Views read these columns through the page cache and may be slower.")
+        if status.released:
+            st.caption(f"Cached views released to stay within the budget: {', '.join(status.released)}. "
+                       f"They are recomputed when next shown.")
+
+
+def render_loading_view(loader: BackgroundLoader):
+    """
+    Early results from the chunks processed so far; refreshed on every rerun until loading completes.
+    """
+    render_memory_status(loader.governor)
+    progress = loader.progress
+    if loader.phase == "downloading":
+        st.progress(progress or 0.0, text="Downloading ridership data…")
+    elif progress is None:
+        st.progress(0.0, text=f"Loading data… {loader.rows_loaded:,} rides processed")
+    else:
+        st.progress(progress, text=f"Loading data… {progress:.0%} ({loader.rows_loaded:,} rides processed)")
+
+    snapshot = loader.snapshot()
+    if not snapshot.total_rides:
+        return
+
+    st.subheader("Key Performance Indicators (partial)")
+    render_kpi_cards(**snapshot.kpis())
+
+    st.markdown("---")
+    st.subheader("Daily Ridership Timeline (partial)")
+    st.plotly_chart(get_view("plot_daily_rides")(snapshot.daily_rides()), width="stretch")
+
+    st.subheader("Top Starting Stations (partial)")
+    st.altair_chart(
+        get_view("plot_top_stations")(loader.decode(snapshot.top_stations(10)), "Top 10 Starting Stations"),
+        width="stretch"
     )
 
-    # ============================================================
-    # TAB 1 — TIMELINE + KPI CARDS
-    # ============================================================
-    with tab_timeline:
 
-        st.subheader("Key Performance Indicators")
-
-        total_rides = f"{len(df):,}"
-        avg_duration = df[DURATION_MIN_COL].mean()
-        subscriber_rate = (df["rider_type"] == "Annual member").mean() * 100
-
-        c1, c2, c3 = st.columns(3)
-
-        with c1:
-            st.markdown(
-                f"""
-                <div class="kpi-card">
-                    <div class="kpi-card-title">Total Rides</div>
-                    <div class="kpi-card-value">{total_rides}</div>
-                </div>
-                """,
-                unsafe_allow_html=True
-            )
-
-        with c2:
-            st.markdown(
-                f"""
-                <div class="kpi-card">
-                    <div class="kpi-card-title">Avg Trip Duration (min)</div>
-                    <div class="kpi-card-value">{avg_duration:.1f}</div>
-                </div>
-                """,
-                unsafe_allow_html=True
-            )
-
-        with c3:
-            st.markdown(
-                f"""
-                <div class="kpi-card">
-                    <div class="kpi-card-title">Annual Member Trip Share</div>
-                    <div class="kpi-card-value">{subscriber_rate:.1f}%</div>
-                </div>
-                """,
-                unsafe_allow_html=True
-            )
-
-        st.markdown("---")
-        st.subheader("Daily Ridership Timeline")
-
-        df_timeline = df.copy()
-
-        rider_types = ["All"] + sorted(df[USER_TYPE_COL].unique())
-        rider_choice = st.selectbox("Filter by Rider Type:", rider_types)
-
-        if rider_choice != "All":
-            df_timeline = filter_by_rider_type(df_timeline, rider_choice)
+def render_counter(tab: str) -> None:
+    """
+    Counts renders per tab in session state; with the sidebar toggle on, shows the counts under each tab.
+    A widget inside one tab should only advance that tab's counter.
+    """
+    counts = st.session_state.setdefault("render_counts", {})
+    counts[tab] = counts.get(tab, 0) + 1
+    if st.session_state.get("show_render_counts"):
+        st.caption(f"Rendered {counts[tab]} time(s) this session · all tabs: {counts}")
 
-        daily_rides = calculate_daily_rides(df_timeline)
 
+def render_comparison(comparison: "PeriodComparison", station_dimension: Optional[StationDimension] = None):
+    compute_deltas = get_view("compute_deltas")
+
+    st.markdown("#### KPIs")
+    st.dataframe(
+        comparison.kpis.join(compute_deltas(comparison.kpis)).style.format("{:,.2f}"),
+        width="stretch"
+    )
+
+    col1, col2 = st.columns(2)
+    with col1:
+        hourly_long = comparison.hourly.reset_index().melt(id_vars="hour", var_name="Period", value_name="Share")
+        st.plotly_chart(
+            px.line(hourly_long, x="hour", y="Share", color="Period", title="Hour-of-Day Profile",
+                    labels={"hour": "Hour of Day", "Share": "Share of Trips"}),
+            width="stretch"
+        )
+    with col2:
+        durations_long = comparison.durations.reset_index().melt(
+            id_vars="duration_bin", var_name="Period", value_name="Share"
+        )
         st.plotly_chart(
-            plot_daily_rides(daily_rides),
+            px.bar(durations_long, x="duration_bin", y="Share", color="Period", barmode="group",
+                   title="Trip Duration Distribution",
+                   labels={"duration_bin": "Trip Duration (Minutes)", "Share": "Share of Trips"}),
             width="stretch"
         )
 
-    # ============================================================
-    # TAB 2 — DURATION ANALYTICS
-    # ============================================================
-    with tab_duration:
+    st.markdown("#### Station Changes (Top 20 by baseline trips)")
+    stations = comparison.stations.sort_values(comparison.stations.columns[0], ascending=False).head(20)
+    st.dataframe(with_station_names(stations.join(compute_deltas(stations)), station_dimension), width="stretch")
 
-        st.subheader("Trip Duration Analysis")
 
-        df_duration = df.copy()
+# ---------------------------------------------------
+# TAB VIEWS (pure computations; run concurrently on a full rerun)
+# ---------------------------------------------------
 
-        rider_choice_a = st.selectbox(
-            "Rider Type:",
-            ["All"] + sorted(df[USER_TYPE_COL].unique())
-        )
 
-        if rider_choice_a != "All":
-            df_duration = filter_by_rider_type(df_duration, rider_choice_a)
+def data_filter_defaults(df: pd.DataFrame) -> dict:
+    """
+    Initial values of the Data Tables filters; the widgets and the prefetch in main() both start from these.
+    """
+    return {
+        "data_rider": "All",
+        "data_duration": (0, int(df[DURATION_MIN_COL].max()) + 1),
+        "data_date_start": df[START_TIME_COL].min().date(),
+        "data_date_end": df[START_TIME_COL].max().date(),
+        "data_time_start": time(0, 0),
+        "data_time_end": time(23, 59),
+        "data_anchor": "Anywhere",
+        "data_radius": 500,
+    }
+
+
+def compute_timeline_view(df: pd.DataFrame, sample: Optional[StratifiedSample], rider_choice: str) -> dict:
+    """KPIs and the daily ridership figure."""
+    if sample is not None:
+        kpis = approximate_kpis(sample)
+        df_timeline = sample.sample
+    else:
+        kpis = calculate_kpis(df)
+        df_timeline = df
+
+    if rider_choice != "All":
+        df_timeline = filter_by_rider_type(df_timeline, rider_choice)
+
+    if sample is not None:
+        daily_rides = approximate_daily_rides(sample._replace(sample=df_timeline))
+    else:
+        daily_rides = calculate_daily_rides(df_timeline)
 
-        st.plotly_chart(
-            plot_duration_histogram(df_duration),
-            width="stretch"
-        )
+    return {"kpis": kpis, "figure": get_view("plot_daily_rides")(daily_rides)}
+
+
+def compute_duration_view(df: pd.DataFrame, sample: Optional[StratifiedSample], rider_choice: str) -> dict:
+    """Duration histogram, plus estimated bin counts in approximate mode."""
+    df_duration = sample.sample if sample is not None else df
+    if rider_choice != "All":
+        df_duration = filter_by_rider_type(df_duration, rider_choice)
+
+    return {
+        "figure": get_view("plot_duration_histogram")(
+            df_duration, weight_col=SAMPLE_WEIGHT_COL if sample is not None else None
+        ),
+        "bins": approximate_duration_bins(sample._replace(sample=df_duration)) if sample is not None else None,
+    }
+
+
+def compute_stations_view(df: pd.DataFrame, sample: Optional[StratifiedSample], aggregates: PartialAggregates,
+                          station_dimension: Optional[StationDimension], top_n: int) -> pd.DataFrame:
+    """
+    Top starting stations, with estimated distinct bikes when Bike Id was sketched. Counts and the sketch
+    join on the station codes when the frame carries them; the canonical names are joined last.
+    """
+    station_col = station_col_of(df)
+    if sample is not None:
+        top_df = approximate_top_stations(sample, top_n, station_col=station_col)
+    else:
+        top_df = get_top_starting_stations(df, top_n, station_col=station_col)
+
+    if aggregates.bike_sketch.registers is not None and station_col in aggregates.bike_sketch.keys:
+        # Union of the per-day sketches: bikes seen at each station over the whole period.
+        distinct_bikes = aggregates.bike_sketch.estimate(by=[station_col]).round().astype("int64")
+        top_df = top_df.join(distinct_bikes.rename("distinct_bikes"), on=station_col)
+    return with_station_names(top_df, station_dimension)
+
+
+def compute_data_view(df: pd.DataFrame, station_index: Optional[StationIndex], rider_choice: str,
+                      duration_range: tuple, date_start: date, date_end: date, time_start: time, time_end: time,
+                      anchor: str, radius_m: int) -> pd.DataFrame:
+    """Trips matching the Data Tables filters."""
+    df_filtered = df
+    if rider_choice != "All":
+        df_filtered = filter_by_rider_type(df_filtered, rider_choice)
+
+    # Optional: keep trips starting near a chosen station (needs the GBFS station file).
+    nearby_ids = None
+    if station_index is not None and anchor != "Anywhere":
+        lat, lon = station_index.coordinates_of(anchor)
+        nearby_ids = station_index.station_ids_within(lat, lon, radius_m)
+
+    return filter_data_advanced(
+        df=df_filtered,
+        start_time_range=(time_start, time_end),
+        min_duration=float(duration_range[0]),
+        max_duration=float(duration_range[1]),
+        start_date=date_start,
+        end_date=date_end,
+        station_ids=nearby_ids
+    )
 
-    # ============================================================
-    # TAB 3 — STATIONS ANALYTICS
-    # ============================================================
-    with tab_stations:
 
-        st.subheader("Top Starting Stations")
+def view_tasks(df: pd.DataFrame, sample: Optional[StratifiedSample], aggregates: PartialAggregates,
+               station_index: Optional[StationIndex], station_dimension: Optional[StationDimension],
+               dataset_version: tuple) -> Dict[str, Tuple[tuple, Callable]]:
+    """
+    Each tab's view for the widget values currently in session state: name -> (parameters, zero-arg task).
+
+    Tasks run through the process-wide single-flight registry: sessions asking for the same view of the
+    same data at the same time wait on one computation, and heavy jobs are capped across sessions.
+    """
+    state = st.session_state
+    defaults = data_filter_defaults(df)
+    data_params = tuple(state.get(key, value) for key, value in defaults.items())
+
+    timeline_params = (state.get("timeline_rider", "All"),)
+    duration_params = (state.get("duration_rider", "All"),)
+    stations_params = (state.get("stations_top_n", 10),)
+    tasks = {
+        "timeline": (timeline_params, partial(compute_timeline_view, df, sample, *timeline_params)),
+        "duration": (duration_params, partial(compute_duration_view, df, sample, *duration_params)),
+        "stations": (stations_params, partial(compute_stations_view, df, sample, aggregates, station_dimension,
+                                              *stations_params)),
+        "data": (data_params, partial(compute_data_view, df, station_index, *data_params)),
+    }
+    registry = shared_registry()
+    return {
+        name: (params, partial(registry.run, (dataset_version, name, sample is not None, params), compute))
+        for name, (params, compute) in tasks.items()
+    }
+
+
+def tab_view(precomputed: Dict[str, Tuple[tuple, TaskOutcome]], name: str, params: tuple, compute: Callable):
+    """
+    The view computed in main() when its parameters still match the tab's widgets; otherwise (a fragment
+    rerun after a widget change) it is computed here. Errors are shown in this tab only; returns None then.
+    """
+    entry = precomputed.get(name)
+    outcome = entry[1] if entry is not None and entry[0] == params else run_task(compute)
+    if outcome.error is not None:
+        st.error(f"This view could not be computed: {outcome.error}")
+        return None
+    return outcome.value
+
+
+# ---------------------------------------------------
+# TABS (one fragment each)
+# ---------------------------------------------------
+# ============================================================
+# TAB 1 — TIMELINE + KPI CARDS
+# ============================================================
+@st.fragment
+def render_timeline_tab(df: pd.DataFrame, sample: Optional[StratifiedSample], precomputed: dict,
+                        dataset_version: tuple):
+    """KPI cards and the daily ridership timeline."""
+    rider_types = ["All"] + sorted(df[USER_TYPE_COL].unique())
+    rider_choice = st.session_state.get("timeline_rider", "All")
+    view = tab_view(precomputed, "timeline", (rider_choice,),
+                    partial(compute_timeline_view, df, sample, rider_choice))
+
+    st.subheader("Key Performance Indicators")
+    if view is not None:
+        render_kpi_cards(**view["kpis"])
+
+    st.markdown("---")
+    st.subheader("Daily Ridership Timeline")
+
+    st.selectbox("Filter by Rider Type:", rider_types, key="timeline_rider")
+
+    if view is not None:
+        if sample is not None:
+            st.caption("Daily totals are exact in approximate mode: the sample is stratified by date and rider type.")
+        st.plotly_chart(view["figure"], width="stretch")
+
+    if os.path.exists(WEATHER_FILE_PATH):
+        render_weather_panel(df, dataset_version)
+
+    render_counter("timeline")
+
+
+def render_weather_panel(df: pd.DataFrame, dataset_version: tuple):
+
+    st.subheader("Ridership by Weather")
+    by = st.radio("Bucket by:", ["temperature", "precipitation"], horizontal=True,
+                  format_func=str.capitalize, key="timeline_weather_by")
+    by_weather, daily = get_weather_kpis(df, dataset_version, by, WEATHER_FILE_PATH)
+
+    st.caption("Each trip takes the latest hourly observation before its start. Rides per hour divides by "
+               "how many observed hours fell in the bucket, so frequent conditions don't dominate.")
+    st.dataframe(by_weather.round(2), width="stretch")
+    st.plotly_chart(
+        px.bar(by_weather.reset_index(), x=by, y="rides_per_hour", title=f"Rides per Hour by {by.capitalize()}"),
+        width="stretch"
+    )
+
+    with st.expander("Daily rides with weather"):
+        st.dataframe(daily.round(1), width="stretch")
+
+
+# ============================================================
+# TAB 2 — DURATION ANALYTICS
+# ============================================================
+@st.fragment
+def render_duration_tab(df: pd.DataFrame, sample: Optional[StratifiedSample], aggregates: PartialAggregates,
+                        precomputed: dict):
+    """Duration histogram and sketched percentiles."""
+
+    st.subheader("Trip Duration Analysis")
+
+    rider_choice_a = st.selectbox(
+        "Rider Type:",
+        ["All"] + sorted(df[USER_TYPE_COL].unique()),
+        key="duration_rider"
+    )
+    view = tab_view(precomputed, "duration", (rider_choice_a,),
+                    partial(compute_duration_view, df, sample, rider_choice_a))
+
+    if view is not None:
+        st.plotly_chart(view["figure"], width="stretch")
 
-        top_n = st.slider("Number of Stations:", 3, 20, 10)
+    with st.expander("Duration percentiles by hour of day (min)"):
+        # Read from the sketches built while loading, so no per-group sort of the full frame is needed.
+        percentiles = aggregates.duration_sketch.quantiles(by=["rider_type", "hour"])
+        st.dataframe(percentiles.round(1), width="stretch")
+        st.caption(f"Sketched percentiles: each value is within {QUANTILE_SKETCH_ACCURACY:.0%} of the exact figure.")
 
-        top_df = get_top_starting_stations(df, top_n)
+    if view is not None and view["bins"] is not None:
+        with st.expander("Estimated trips per duration bin (95% CI)"):
+            st.dataframe(view["bins"], width="stretch")
 
+    render_counter("duration")
+
+
+# ============================================================
+# TAB 3 — STATIONS ANALYTICS
+# ============================================================
+@st.fragment
+def render_stations_tab(df: pd.DataFrame, sample: Optional[StratifiedSample], aggregates: PartialAggregates,
+                        station_dimension: Optional[StationDimension], precomputed: dict, dataset_version: tuple):
+    """Top stations, station list with distinct bikes, departure anomalies, behaviour clusters and demand forecasts."""
+
+    st.subheader("Top Starting Stations")
+
+    top_n = st.slider("Number of Stations:", 3, 20, 10, key="stations_top_n")
+    top_df = tab_view(precomputed, "stations", (top_n,),
+                      partial(compute_stations_view, df, sample, aggregates, station_dimension, top_n))
+
+    if top_df is not None:
         st.altair_chart(
-            plot_top_stations(top_df, f"Top {top_n} Starting Stations"),
+            get_view("plot_top_stations")(top_df[[top_df.columns[0], "trip_count"]], f"Top {top_n} Starting Stations"),
             width="stretch"
         )
 
         st.subheader("Station List")
         st.dataframe(top_df, width="stretch")
 
-    # ============================================================
-    # TAB 4 — DATA TABLES
-    # ============================================================
-    with tab_data:
+    st.subheader("Station Anomalies")
+    granularity = st.radio("Granularity:", ["Hourly", "Daily"], horizontal=True)
+    detector = get_anomaly_detector(df, dataset_version, "h" if granularity == "Hourly" else "D")
+    anomalies = detector.anomalies(top_n=20)
+    if anomalies.empty:
+        st.info("No departures deviate sharply from their stations' recent weekly pattern.")
+    else:
+        st.caption(
+            f"Departures compared with the same {'hour of the week' if granularity == 'Hourly' else 'weekday'} "
+            f"over the previous {detector.window} weeks (robust z-score ≥ {detector.threshold:g})."
+        )
+        st.dataframe(with_station_names(anomalies, station_dimension).round({"expected": 1, "score": 1}),
+                     width="stretch", hide_index=True)
 
-        st.subheader("Dataset Explorer")
+    render_station_clusters(df, station_dimension, dataset_version)
+    render_station_forecast(df, station_dimension, dataset_version)
 
-        df_filtered = df.copy()
+    render_counter("stations")
 
-        rider_choice_d = st.selectbox(
-            "Rider Type Filter:",
-            ["All"] + sorted(df[USER_TYPE_COL].unique())
-        )
-        if rider_choice_d != "All":
-            df_filtered = filter_by_rider_type(df_filtered, rider_choice_d)
 
-        max_duration = int(df[DURATION_MIN_COL].max()) + 1
-        duration_range = st.slider(
-            "Trip Duration (min)",
-            0, max_duration, (0, max_duration)
-        )
+def render_station_clusters(df: pd.DataFrame, station_dimension: Optional[StationDimension], dataset_version: tuple):
+
+    st.subheader("Station Behaviour Clusters")
+    k = st.slider("Number of Clusters:", 2, 8, CLUSTER_COUNT, key="stations_clusters")
+    try:
+        clusters = get_station_clusters(df, dataset_version, k, station_dimension)
+    except ValueError as error:
+        st.info(f"Not enough active stations to cluster: {error}")
+        return
+
+    st.caption("Stations grouped by the shape of their hour-of-week departures and arrivals "
+               "(shares of each station's own trips, so busy and quiet stations compare).")
+    st.dataframe(
+        clusters.summary.style.format({"am_departure_share": "{:.1%}", "am_arrival_share": "{:.1%}",
+                                       "weekend_share": "{:.1%}"}),
+        width="stretch"
+    )
+
+    # Centroid profiles: one line per cluster and direction over the 168 hours of the week.
+    profiles = clusters.centroids.reset_index().melt(id_vars="cluster", var_name="series", value_name="Share")
+    profiles["Direction"] = profiles["series"].str[:3].map({"dep": "Departures", "arr": "Arrivals"})
+    profiles["Hour of Week"] = profiles["series"].str[4:].astype(int)
+    profiles["Cluster"] = profiles["cluster"].map(
+        lambda c: f"{c}: {clusters.summary.loc[c, 'name']}"
+    )
+    st.plotly_chart(
+        px.line(profiles, x="Hour of Week", y="Share", color="Cluster", line_dash="Direction",
+                title="Cluster Profiles (Monday 00:00 = hour 0)"),
+        width="stretch"
+    )
+
+    with st.expander("Stations by cluster"):
+        assignments = clusters.assignments.join(clusters.summary["name"], on="cluster")
+        st.dataframe(assignments.sort_values(["cluster", "trips"], ascending=[True, False]),
+                     width="stretch", hide_index=True)
+
+
+def render_station_forecast(df: pd.DataFrame, station_dimension: Optional[StationDimension], dataset_version: tuple):
+
+    st.subheader("Next-Day Demand Forecast")
+    try:
+        forecast = get_station_forecast(df, dataset_version)
+    except ValueError as error:
+        st.info(f"Not enough history to forecast: {error}")
+        return
+
+    summary = forecast.summary
+    st.caption(
+        f"Hourly departures from each station's hour-of-week profile times a damped-trend EWMA level. "
+        f"Backtest from {forecast.backtest_start:%Y-%m-%d} (one day ahead): WAPE {summary['wape']:.0f}% "
+        f"vs {summary['naive_wape']:.0f}% for same-hour-last-week."
+    )
+
+    # Busiest stations first in the picker; the stations may be codes, shown by name.
+    stations = forecast.metrics.sort_values("trips", ascending=False).index
+    names = with_station_names(pd.DataFrame(index=stations), station_dimension).index
+    labels = dict(zip(stations, names))
+    station = st.selectbox("Station:", stations, format_func=labels.get, key="stations_forecast_station")
+    series = forecast.station_series(station).reset_index().melt(id_vars="time", var_name="Series",
+                                                                 value_name="Departures")
+    st.plotly_chart(
+        px.line(series, x="time", y="Departures", color="Series",
+                title=f"Forecast vs Actual — {labels[station]} "
+                      f"(last day: {forecast.forecast_start:%Y-%m-%d} forecast)"),
+        width="stretch"
+    )
+    st.dataframe(with_station_names(forecast.metrics.loc[[station]], station_dimension).round(2), width="stretch")
+
+    with st.expander(f"Forecast for {forecast.forecast_start:%Y-%m-%d}, all stations"):
+        st.dataframe(with_station_names(forecast.next_day(), station_dimension).round(1), width="stretch")
+
+
+# ============================================================
+# TAB 4 — PERIOD COMPARISON
+# ============================================================
+@st.fragment
+def render_comparison_tab(df: pd.DataFrame, station_dimension: Optional[StationDimension]):
+    """Side-by-side KPIs and distributions for two or more periods."""
+    assign_periods, compare_periods = get_view("assign_periods"), get_view("compare_periods")
+
+    st.subheader("Period Comparison")
+
+    comparison_mode = st.radio(
+        "Compare:",
+        ["Weekday vs Weekend", "Month over Month", "Custom Date Ranges"],
+        horizontal=True
+    )
 
-        min_date = df[START_TIME_COL].min().date()
-        max_date = df[START_TIME_COL].max().date()
+    if comparison_mode == "Weekday vs Weekend":
+        periods = assign_periods(df, grouping="weekday_weekend")
+    elif comparison_mode == "Month over Month":
+        periods = assign_periods(df, grouping="month")
+    else:
+        first_day = df[START_TIME_COL].min().date()
+        last_day = df[START_TIME_COL].max().date()
+        mid_day = first_day + (last_day - first_day) // 2
 
         col1, col2 = st.columns(2)
-        date_start = col1.date_input("Start Date", min_date)
-        date_end = col2.date_input("End Date", max_date)
-
-        col3, col4 = st.columns(2)
-        time_start = col3.time_input("Start Time", time(0, 0))
-        time_end = col4.time_input("End Time", time(23, 59))
-
-        df_filtered = filter_data_advanced(
-            df=df_filtered,
-            start_time_range=(time_start, time_end),
-            min_duration=float(duration_range[0]),
-            max_duration=float(duration_range[1]),
-            start_date=date_start,
-            end_date=date_end
-        )
+        range_a = col1.date_input("Period A", (first_day, mid_day), first_day, last_day)
+        range_b = col2.date_input("Period B", (mid_day, last_day), first_day, last_day)
+        if len(range_a) == 2 and len(range_b) == 2:
+            periods = assign_periods(df, periods={"Period A": tuple(range_a), "Period B": tuple(range_b)})
+        else:
+            periods = None
+            st.info("Select a start and end date for both periods.")
+
+    if periods is not None:
+        render_comparison(compare_periods(df, periods, station_col=station_col_of(df)), station_dimension)
+
+    render_counter("comparison")
+
+
+# ============================================================
+# TAB 5 — DATA TABLES
+# ============================================================
+@st.fragment
+def render_data_tab(df: pd.DataFrame, quality_report: Optional[pd.DataFrame],
+                    station_index: Optional[StationIndex], precomputed: dict,
+                    governor: Optional[MemoryGovernor] = None,
+                    station_dimension: Optional[StationDimension] = None):
+    """Filterable trip table and the data-quality report."""
+    defaults = data_filter_defaults(df)
+
+    st.subheader("Dataset Explorer")
+
+    st.selectbox(
+        "Rider Type Filter:",
+        ["All"] + sorted(df[USER_TYPE_COL].unique()),
+        key="data_rider"
+    )
+
+    max_duration = defaults["data_duration"][1]
+    st.slider(
+        "Trip Duration (min)",
+        0, max_duration, defaults["data_duration"], key="data_duration"
+    )
+
+    col1, col2 = st.columns(2)
+    col1.date_input("Start Date", defaults["data_date_start"], key="data_date_start")
+    col2.date_input("End Date", defaults["data_date_end"], key="data_date_end")
+
+    col3, col4 = st.columns(2)
+    col3.time_input("Start Time", defaults["data_time_start"], key="data_time_start")
+    col4.time_input("End Time", defaults["data_time_end"], key="data_time_end")
+
+    if station_index is not None:
+        col5, col6 = st.columns(2)
+        col5.selectbox("Near Station:", ["Anywhere"] + sorted(station_index.names), key="data_anchor")
+        col6.slider("Radius (m)", 100, 3000, defaults["data_radius"], step=100, key="data_radius")
 
+    params = tuple(st.session_state.get(key, value) for key, value in defaults.items())
+    df_filtered = tab_view(precomputed, "data", params, partial(compute_data_view, df, station_index, *params))
+
+    if df_filtered is not None:
         st.write(f"### Showing {len(df_filtered):,} filtered rides")
-        st.dataframe(df_filtered, width="stretch")
+        # Columns spilled under memory pressure are read back from disk only for the first rows, on request.
+        spilled = governor.spilled_columns if governor is not None else []
+        if spilled and st.toggle(f"Include spilled columns for the first {SPILL_RESTORE_ROWS:,} rows",
+                                 key="data_restore_spilled", help=", ".join(spilled)):
+            df_filtered = governor.restore(df_filtered.head(SPILL_RESTORE_ROWS))
+        st.dataframe(with_station_names(df_filtered, station_dimension), width="stretch")
+
+    with st.expander("Data Quality Report"):
+        st.dataframe(quality_report, width="stretch")
+
+    render_counter("data")
+
+
+# ---------------------------------------------------
+# MAIN FUNCTION
+# ---------------------------------------------------
+def main():
+
+    # TITLE
+    st.title("🚴 Toronto Bike-Sharing Analytics Dashboard")
+    st.markdown("Interactive analytics for Toronto Bike Share ridership.")
+    st.markdown("---")
+
+    # DATA PIPELINE (runs in the background; partial results render until it finishes)
+    loader = get_loader(URL)
+    if not loader.done:
+        render_loading_view(loader)
+        time_module.sleep(LOADER_REFRESH_SEC)
+        st.rerun()
+
+    raise_if_failed(loader)
+
+    df = loader.result()
+    quality_report = loader.quality_report()
+    aggregates = loader.snapshot()  # Sketches built while loading (duration percentiles, distinct bikes)
+    dataset_version = loader.version  # Source fingerprint and rows: keys the shared frame's caches and single flights
+
+    # MEMORY (over the budget, cached views are dropped: the costliest to keep and least used first)
+    if loader.governor is not None:
+        for name, cache in [("demand forecast", get_station_forecast), ("station clusters", get_station_clusters),
+                            ("anomaly scores", get_anomaly_detector), ("weather KPIs", get_weather_kpis),
+                            ("approximate-mode sample", get_sample)]:
+            loader.governor.on_pressure(name, cache.clear)
+        loader.governor.relieve()
+
+    # APPROXIMATE MODE (stratified sample, scaled to full counts with 95% CIs)
+    approx_mode = st.sidebar.toggle("Approximate mode", value=False,
+                                    help="Answer from a stratified sample for instant interaction.")
+    sample = get_sample(df, dataset_version) if approx_mode else None
+    if approx_mode:
+        st.sidebar.caption(f"Using {len(sample.sample):,} sampled rides; ± values are 95% confidence intervals.")
+
+    station_index = get_station_index(STATION_INFO_FILE_PATH) if os.path.exists(STATION_INFO_FILE_PATH) else None
+
+    # VIEWS (independent, read-only computations for every tab, dispatched together on the shared pool)
+    tasks = view_tasks(df, sample, aggregates, station_index, loader.station_dimension, dataset_version)
+    run = run_concurrently({name: task for name, (_, task) in tasks.items()})
+    precomputed = {name: (params, run.outcomes[name]) for name, (params, _) in tasks.items()}
+
+    render_memory_status(loader.governor)
+    with st.sidebar.expander("Computation timings"):
+        st.dataframe(run.timings().round(3), width="stretch")
+        st.caption(f"Concurrent: {run.wall_seconds:.2f}s · sequential: {run.sequential_seconds:.2f}s "
+                   f"({run.speedup:.1f}× on the critical path)")
+
+    # TABS (each tab is a fragment: its widgets rerun only that tab, with the shared frame passed by reference)
+    st.sidebar.toggle("Show render counters", key="show_render_counts",
+                      help="Instrumentation: how many times each tab has been rendered this session.")
+    tab_timeline, tab_duration, tab_stations, tab_compare, tab_data = st.tabs(
+        ["Timeline & KPIs", "Duration Analytics", "Stations Analytics", "Period Comparison", "Data Tables"]
+    )
+
+    with tab_timeline:
+        render_timeline_tab(df, sample, precomputed, dataset_version)
+    with tab_duration:
+        render_duration_tab(df, sample, aggregates, precomputed)
+    with tab_stations:
+        render_stations_tab(df, sample, aggregates, loader.station_dimension, precomputed, dataset_version)
+    with tab_compare:
+        render_comparison_tab(df, loader.station_dimension)
+    with tab_data:
+        render_data_tab(df, quality_report, station_index, precomputed, loader.governor, loader.station_dimension)
 
 
 # ---------------------------------------------------
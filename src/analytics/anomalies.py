@@ -0,0 +1,162 @@
+from typing import List, Optional
+
+import numpy as np
+import pandas as pd
+
+from src.config import (
+    START_TIME_COL, START_STATION_COL,
+    ANOMALY_WINDOW_PERIODS, ANOMALY_THRESHOLD, ANOMALY_BLOCK_BUCKETS
+)
+
+# Buckets per seasonal period: hourly series repeat weekly (hour of week), daily series by day of week.
+PERIODS = {"h": 168, "D": 7}
+MAD_TO_STD = 1.4826
+
+
+def _elementwise_median(layers: List[np.ndarray]) -> np.ndarray:
+    """
+    Element-wise median of a few equally shaped arrays.
+
+    An odd-even transposition sort of the layers with np.minimum/np.maximum:
+    for windows of a handful of weeks this is far cheaper than np.median
+    along a short axis of a huge array.
+    """
+    layers = list(layers)
+    n = len(layers)
+    for round_ in range(n):
+        for i in range(round_ % 2, n - 1, 2):
+            layers[i], layers[i + 1] = np.minimum(layers[i], layers[i + 1]), np.maximum(layers[i], layers[i + 1])
+    return (layers[(n - 1) // 2] + layers[n // 2]) / 2
+
+
+class StationAnomalyDetector:
+    """
+    Departure anomalies for every station at once, on a stations x time-bucket count matrix.
+
+    The baseline for bucket t is the median of the same hour-of-week (or
+    day-of-week) over the previous `window` weeks, with the median absolute
+    deviation as spread. Scores are (observed - median) / scale where
+    scale = max(1.4826 * MAD, sqrt(median), 1): the Poisson-style floor
+    keeps quiet stations, whose MAD is often 0, from flagging every extra trip.
+
+    Scores are computed in blocks of time buckets with array operations
+    across all stations. update() appends trips and re-scores only the
+    buckets from the earliest one that changed; scores before it are
+    untouched because they depend on earlier buckets only.
+    """
+
+    def __init__(self, freq: str = "h", window: int = ANOMALY_WINDOW_PERIODS,
+                 threshold: float = ANOMALY_THRESHOLD, station_col: str = START_STATION_COL):
+        if freq not in PERIODS:
+            raise ValueError(f"freq must be one of {list(PERIODS)}.")
+        if window < 1:
+            raise ValueError("window must be at least 1.")
+
+        self.freq = freq
+        self.period = PERIODS[freq]
+        self.window = window
+        self.threshold = threshold
+        self.station_col = station_col
+
+        self.stations = pd.Index([], dtype="object")
+        self.origin: Optional[pd.Timestamp] = None
+        self.counts = np.zeros((0, 0), dtype=np.float32)
+        self.expected = np.zeros((0, 0), dtype=np.float32)
+        self.scores = np.zeros((0, 0), dtype=np.float32)
+        self.rescored_buckets = 0  # buckets re-scored by the last update()
+
+    @property
+    def times(self) -> pd.DatetimeIndex:
+        if self.origin is None:
+            return pd.DatetimeIndex([])
+        return pd.date_range(self.origin, periods=self.counts.shape[1], freq=self.freq)
+
+    def _grow(self, n_stations: int, n_buckets: int, prepend: int = 0) -> None:
+        """Resizes the matrices; new cells hold zero counts and (for scores) NaN until scored."""
+        old_s, old_t = self.counts.shape
+        for name, fill in (("counts", 0.0), ("expected", np.nan), ("scores", np.nan)):
+            grown = np.full((n_stations, n_buckets), fill, dtype=np.float32)
+            grown[:old_s, prepend:prepend + old_t] = getattr(self, name)
+            setattr(self, name, grown)
+
+    def update(self, df: pd.DataFrame) -> "StationAnomalyDetector":
+        """
+        Adds the departures in df to the matrix and re-scores the affected buckets.
+        """
+        for col in (START_TIME_COL, self.station_col):
+            if col not in df.columns:
+                raise KeyError(f"DataFrame must contain '{col}' column.")
+        if df.empty:
+            self.rescored_buckets = 0
+            return self
+
+        # Factorize once, then map the (few) distinct names onto the detector's station rows.
+        codes, names = pd.factorize(df[self.station_col], use_na_sentinel=False)
+        names = pd.Index(names).fillna("Unknown")
+        new_stations = names.difference(self.stations)
+        self.stations = self.stations.append(new_stations)
+        s_index = self.stations.get_indexer(names)[codes]
+
+        step = pd.Timedelta(1, unit=self.freq)
+        first_new = df[START_TIME_COL].min().floor(self.freq)
+        prepend = 0
+        if self.origin is None:
+            self.origin = first_new
+        elif first_new < self.origin:
+            prepend = int((self.origin - first_new) // step)
+            self.origin = first_new
+
+        # Integer bucket offsets straight from the datetime64 values (same as floor(freq) - origin).
+        offsets = df[START_TIME_COL].to_numpy("datetime64[ns]") - self.origin.to_datetime64()
+        t_index = offsets.astype("int64") // step.value
+        n_buckets = max(self.counts.shape[1] + prepend, int(t_index.max()) + 1)
+        self._grow(len(self.stations), n_buckets, prepend)
+
+        added = np.bincount(s_index * n_buckets + t_index, minlength=len(self.stations) * n_buckets)
+        self.counts += added.reshape(len(self.stations), n_buckets).astype(np.float32)
+
+        # Prepending shifts every column, so everything is re-scored; otherwise only from the first touched bucket.
+        self._score(0 if prepend else int(t_index.min()))
+        return self
+
+    def _score(self, start: int) -> None:
+        n_buckets = self.counts.shape[1]
+        lags = self.period * np.arange(1, self.window + 1)
+        first_scorable = max(start, int(lags[-1]))
+        self.rescored_buckets = n_buckets - start
+
+        for first in range(first_scorable, n_buckets, ANOMALY_BLOCK_BUCKETS):
+            last = min(first + ANOMALY_BLOCK_BUCKETS, n_buckets)
+            # The same block shifted back 1..window periods: stations x block views, no copies.
+            history = [self.counts[:, first - lag:last - lag] for lag in lags]
+
+            median = _elementwise_median(history)
+            mad = _elementwise_median([np.abs(layer - median) for layer in history])
+            scale = np.maximum(np.maximum(MAD_TO_STD * mad, np.sqrt(median)), 1.0)
+
+            self.expected[:, first:last] = median
+            self.scores[:, first:last] = (self.counts[:, first:last] - median) / scale
+
+    def anomalies(self, top_n: Optional[int] = 20, threshold: Optional[float] = None) -> pd.DataFrame:
+        """
+        Buckets whose |score| reaches the threshold, strongest first.
+        Returns station, time, observed, expected, score, direction ("spike" or "drop").
+        """
+        threshold = self.threshold if threshold is None else threshold
+        scores = np.nan_to_num(self.scores, nan=0.0)
+        s_idx, t_idx = np.nonzero(np.abs(scores) >= threshold)
+
+        order = np.argsort(-np.abs(scores[s_idx, t_idx]), kind="stable")
+        if top_n is not None:
+            order = order[:top_n]
+        s_idx, t_idx = s_idx[order], t_idx[order]
+
+        score = scores[s_idx, t_idx]
+        return pd.DataFrame({
+            self.station_col: self.stations[s_idx],
+            "time": self.times[t_idx],
+            "observed": self.counts[s_idx, t_idx].astype("int64"),
+            "expected": self.expected[s_idx, t_idx].astype("float64"),
+            "score": score.astype("float64"),
+            "direction": np.where(score > 0, "spike", "drop"),
+        })
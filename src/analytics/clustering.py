@@ -0,0 +1,212 @@
+from typing import NamedTuple, Optional
+
+import numpy as np
+import pandas as pd
+
+from src.config import (
+    START_TIME_COL, END_TIME_COL, START_STATION_COL, END_STATION_COL,
+    CLUSTER_COUNT, CLUSTER_RESTARTS, CLUSTER_MAX_ITER, CLUSTER_MIN_TRIPS, KMEANS_BATCH_ROWS
+)
+
+HOURS_PER_WEEK = 168
+NS_PER_HOUR = 3_600 * 10 ** 9
+EPOCH_HOUR_OF_WEEK = 3 * 24  # 1970-01-01 was a Thursday; hour 0 of the week is Monday 00:00
+
+# Hour-of-week windows used to describe (and name) cluster centroids.
+WEEKDAY_AM = [day * 24 + hour for day in range(5) for hour in range(7, 10)]
+WEEKEND = list(range(5 * 24, HOURS_PER_WEEK))
+
+
+class StationProfiles(NamedTuple):
+    """
+    Hour-of-week departure and arrival counts per station (rows follow `stations`).
+    features is both profiles side by side, divided by the station's total trips.
+    """
+    stations: pd.Index
+    departures: np.ndarray
+    arrivals: np.ndarray
+    features: np.ndarray
+
+    @property
+    def trips(self) -> np.ndarray:
+        return self.departures.sum(axis=1) + self.arrivals.sum(axis=1)
+
+
+class KMeansResult(NamedTuple):
+    labels: np.ndarray
+    centroids: np.ndarray
+    inertia: float
+    n_iter: int
+
+
+class StationClusters(NamedTuple):
+    """
+    assignments: station, cluster, trips. centroids: one row per cluster, departure (dep_0..167) and
+    arrival (arr_0..167) shares. summary: size, peak shares and a descriptive name per cluster.
+    """
+    assignments: pd.DataFrame
+    centroids: pd.DataFrame
+    summary: pd.DataFrame
+    inertia: float
+
+
+def _hour_of_week(times: pd.Series) -> np.ndarray:
+    """Monday 00:00 = 0 ... Sunday 23:00 = 167, straight from the datetime64 values."""
+    hours = times.to_numpy("datetime64[ns]").astype("int64") // NS_PER_HOUR
+    return (hours + EPOCH_HOUR_OF_WEEK) % HOURS_PER_WEEK
+
+
+def hour_of_week_profiles(df: pd.DataFrame, start_station_col: str = START_STATION_COL,
+                          end_station_col: str = END_STATION_COL,
+                          min_trips: int = CLUSTER_MIN_TRIPS) -> StationProfiles:
+    """
+    168-hour departure and arrival profiles for every station in one pass over the trips.
+
+    Integer station code columns (from the station dimension) work as well as names and factorize faster.
+    """
+    for col in (START_TIME_COL, END_TIME_COL, start_station_col, end_station_col):
+        if col not in df.columns:
+            raise KeyError(f"DataFrame must contain '{col}' column.")
+
+    columns = [START_TIME_COL, END_TIME_COL, start_station_col, end_station_col]
+    trips = df if not df[columns].isna().any().any() else df.dropna(subset=columns)
+    n = len(trips)
+
+    # One shared station numbering for both trip ends. Non-negative integer codes index the
+    # profile rows directly; anything else (e.g. names) is factorized.
+    ends = [trips[start_station_col].to_numpy(), trips[end_station_col].to_numpy()]
+    if all(np.issubdtype(end.dtype, np.integer) for end in ends) and n and min(end.min() for end in ends) >= 0:
+        codes = np.concatenate(ends).astype("int64")
+        stations = np.arange(int(codes.max()) + 1)
+    else:
+        codes, stations = pd.factorize(np.concatenate(ends))
+    n_stations = len(stations)
+
+    cells = n_stations * HOURS_PER_WEEK
+    departures = np.bincount(codes[:n] * HOURS_PER_WEEK + _hour_of_week(trips[START_TIME_COL]), minlength=cells)
+    arrivals = np.bincount(codes[n:] * HOURS_PER_WEEK + _hour_of_week(trips[END_TIME_COL]), minlength=cells)
+    departures = departures.reshape(n_stations, HOURS_PER_WEEK).astype("float64")
+    arrivals = arrivals.reshape(n_stations, HOURS_PER_WEEK).astype("float64")
+
+    totals = departures.sum(axis=1) + arrivals.sum(axis=1)
+    keep = totals >= max(min_trips, 1)
+    departures, arrivals, totals = departures[keep], arrivals[keep], totals[keep]
+    # Shares of each station's own trips: clusters follow the shape of usage, not its volume.
+    features = np.hstack([departures, arrivals]) / totals[:, None]
+    return StationProfiles(pd.Index(stations[keep]), departures, arrivals, features)
+
+
+def _squared_distances(X: np.ndarray, centroids: np.ndarray, batch_rows: int = KMEANS_BATCH_ROWS) -> np.ndarray:
+    """n x k squared Euclidean distances as |x|^2 - 2 x.c + |c|^2, one block of rows at a time."""
+    c_norms = (centroids ** 2).sum(axis=1)
+    out = np.empty((len(X), len(centroids)))
+    for first in range(0, len(X), batch_rows):
+        block = X[first:first + batch_rows]
+        out[first:first + batch_rows] = (block ** 2).sum(axis=1)[:, None] - 2 * block @ centroids.T + c_norms
+    return np.maximum(out, 0.0)
+
+
+def _kmeans_plus_plus(X: np.ndarray, k: int, rng: np.random.Generator) -> np.ndarray:
+    centroids = [X[rng.integers(len(X))]]
+    closest = _squared_distances(X, np.array(centroids))[:, 0]
+    for _ in range(1, k):
+        total = closest.sum()
+        index = rng.choice(len(X), p=closest / total) if total > 0 else rng.integers(len(X))
+        centroids.append(X[index])
+        closest = np.minimum(closest, _squared_distances(X, X[index][None, :])[:, 0])
+    return np.array(centroids)
+
+
+def kmeans(X: np.ndarray, k: int = CLUSTER_COUNT, n_init: int = CLUSTER_RESTARTS,
+           max_iter: int = CLUSTER_MAX_ITER, tol: float = 1e-8, seed: int = 0) -> KMeansResult:
+    """
+    Lloyd's k-means with k-means++ seeding, restarted n_init times; returns the lowest-inertia run.
+
+    Each iteration is two array operations over all points: batched
+    distances to the centroids, and centroid sums as a one-hot matrix product.
+    """
+    X = np.asarray(X, dtype="float64")
+    if len(X) < k:
+        raise ValueError(f"Need at least k={k} rows to cluster, got {len(X)}.")
+
+    rng = np.random.default_rng(seed)
+    best: Optional[KMeansResult] = None
+    for _ in range(n_init):
+        centroids = _kmeans_plus_plus(X, k, rng)
+        for iteration in range(1, max_iter + 1):
+            distances = _squared_distances(X, centroids)
+            labels = distances.argmin(axis=1)
+
+            # Per-cluster sums as one matrix product with the one-hot assignment matrix.
+            one_hot = (labels[:, None] == np.arange(k)).astype("float64")
+            sums = one_hot.T @ X
+            counts = np.bincount(labels, minlength=k)
+            updated = np.where(counts[:, None] > 0, sums / np.maximum(counts, 1)[:, None], centroids)
+
+            # An empty cluster takes the point farthest from its centroid.
+            own_distance = distances[np.arange(len(X)), labels]
+            for empty in np.flatnonzero(counts == 0):
+                far = own_distance.argmax()
+                updated[empty], own_distance[far] = X[far], -1.0
+
+            shift = ((updated - centroids) ** 2).sum()
+            centroids = updated
+            if shift <= tol:
+                break
+
+        distances = _squared_distances(X, centroids)
+        labels = distances.argmin(axis=1)
+        inertia = float(distances[np.arange(len(X)), labels].sum())
+        if best is None or inertia < best.inertia:
+            best = KMeansResult(labels, centroids, inertia, iteration)
+    return best
+
+
+def describe_centroids(centroids: np.ndarray) -> pd.DataFrame:
+    """
+    Share of a cluster's trips that are weekday-AM departures, weekday-AM arrivals and weekend trips,
+    and a name from those shares: commuter origin / destination, leisure / weekend, or mixed.
+    """
+    departures, arrivals = centroids[:, :HOURS_PER_WEEK], centroids[:, HOURS_PER_WEEK:]
+    summary = pd.DataFrame({
+        "am_departure_share": departures[:, WEEKDAY_AM].sum(axis=1),
+        "am_arrival_share": arrivals[:, WEEKDAY_AM].sum(axis=1),
+        "weekend_share": departures[:, WEEKEND].sum(axis=1) + arrivals[:, WEEKEND].sum(axis=1),
+    })
+    # A uniform profile puts 2/7 of trips on the weekend and 15/168 of each side in weekday mornings.
+    am_gap = summary["am_departure_share"] - summary["am_arrival_share"]
+    summary["name"] = np.select(
+        [summary["weekend_share"] > 0.4, am_gap > 0.05, am_gap < -0.05],
+        ["Leisure / weekend", "Commuter origin", "Commuter destination"],
+        default="Mixed",
+    )
+    return summary
+
+
+def cluster_stations(df: pd.DataFrame, k: int = CLUSTER_COUNT, n_init: int = CLUSTER_RESTARTS,
+                     seed: int = 0, start_station_col: str = START_STATION_COL,
+                     end_station_col: str = END_STATION_COL, min_trips: int = CLUSTER_MIN_TRIPS) -> StationClusters:
+    """
+    Groups stations by the shape of their hour-of-week departure/arrival profile.
+    Clusters are numbered by size (0 = largest).
+    """
+    profiles = hour_of_week_profiles(df, start_station_col, end_station_col, min_trips)
+    result = kmeans(profiles.features, k=k, n_init=n_init, seed=seed)
+
+    # Renumber by size so cluster ids are stable across seeds when the grouping is.
+    sizes = np.bincount(result.labels, minlength=k)
+    order = np.argsort(-sizes, kind="stable")
+    relabel = np.empty(k, dtype="int64")
+    relabel[order] = np.arange(k)
+    labels, centroids = relabel[result.labels], result.centroids[order]
+
+    columns = [f"dep_{h}" for h in range(HOURS_PER_WEEK)] + [f"arr_{h}" for h in range(HOURS_PER_WEEK)]
+    summary = describe_centroids(centroids)
+    summary.insert(0, "stations", sizes[order])
+    return StationClusters(
+        assignments=pd.DataFrame({start_station_col: profiles.stations, "cluster": labels,
+                                  "trips": profiles.trips.astype("int64")}),
+        centroids=pd.DataFrame(centroids, columns=columns).rename_axis("cluster"),
+        summary=summary.rename_axis("cluster"),
+        inertia=result.inertia,
+    )
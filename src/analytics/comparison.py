@@ -0,0 +1,168 @@
+from datetime import date
+from typing import Dict, NamedTuple, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.config import START_TIME_COL, START_STATION_COL, DURATION_MIN_COL
+from src.data_processor.utils import fill_unknown
+
+GROUPINGS = ("weekday_weekend", "month", "weekday")
+DURATION_BIN_EDGES = [0, 5, 10, 15, 20, 30, 45, 60, np.inf]
+DURATION_BIN_LABELS = ["0-5", "5-10", "10-15", "15-20", "20-30", "30-45", "45-60", "60+"]
+WEEKDAY_NAMES = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+
+
+class PeriodComparison(NamedTuple):
+    """
+    Wide tables with one column per period/group.
+    kpis: metrics x groups; stations: start station x groups (trip counts);
+    hourly: hour of day x groups (share of the group's trips);
+    durations: duration bin (min) x groups (share of the group's trips).
+    """
+    kpis: pd.DataFrame
+    stations: pd.DataFrame
+    hourly: pd.DataFrame
+    durations: pd.DataFrame
+
+
+def assign_periods(
+        df: pd.DataFrame,
+        periods: Optional[Dict[str, Tuple[date, date]]] = None,
+        grouping: Optional[str] = None
+) -> pd.Series:
+    """
+    Labels every trip with its comparison group as an ordered categorical (NaN = outside every group).
+
+    Either pass `periods` (label -> inclusive (start_date, end_date); the first
+    matching range wins when ranges overlap) or a built-in `grouping`:
+    'weekday_weekend', 'month' or 'weekday'.
+    """
+    if (periods is None) == (grouping is None):
+        raise ValueError("Pass exactly one of 'periods' or 'grouping'.")
+    if START_TIME_COL not in df.columns:
+        raise KeyError(f"DataFrame must contain '{START_TIME_COL}' column.")
+
+    start = df[START_TIME_COL]
+
+    if periods is not None:
+        days = start.dt.normalize()
+        conditions = [
+            ((days >= pd.Timestamp(first)) & (days <= pd.Timestamp(last))).to_numpy()
+            for first, last in periods.values()
+        ]
+        labels = list(periods)
+        codes = np.select(conditions, range(len(labels)), default=-1)
+        return pd.Series(pd.Categorical.from_codes(codes, categories=labels, ordered=True),
+                         index=df.index, name="period")
+
+    if grouping not in GROUPINGS:
+        raise ValueError(f"Invalid grouping: {grouping}. Expected one of {GROUPINGS}.")
+
+    if grouping == "weekday_weekend":
+        codes = (start.dt.dayofweek >= 5).astype("int8").to_numpy()
+        categories = ["Weekday", "Weekend"]
+    elif grouping == "weekday":
+        codes = start.dt.dayofweek.to_numpy()
+        categories = WEEKDAY_NAMES
+    else:
+        months = start.dt.to_period("M")
+        categories = [str(p) for p in sorted(months.dropna().unique())]
+        codes = pd.Categorical(months.astype(str), categories=categories).codes
+
+    return pd.Series(pd.Categorical.from_codes(codes, categories=categories, ordered=True),
+                     index=df.index, name="period")
+
+
+def _crosstab(keys: np.ndarray, groups: np.ndarray, n_keys: int, n_groups: int) -> np.ndarray:
+    """Counts of (key, group) pairs as an (n_keys, n_groups) array in one bincount."""
+    return np.bincount(keys * n_groups + groups, minlength=n_keys * n_groups).reshape(n_keys, n_groups)
+
+
+def _shares(counts: np.ndarray) -> np.ndarray:
+    totals = counts.sum(axis=0, keepdims=True)
+    return np.divide(counts, totals, out=np.zeros(counts.shape), where=totals > 0)
+
+
+def compare_periods(df: pd.DataFrame, periods: pd.Series, station_col: str = START_STATION_COL) -> PeriodComparison:
+    """
+    Computes KPIs, per-station counts, hour-of-day profiles and duration distributions for every group at once.
+
+    `periods` is the output of assign_periods (aligned with df). Every table is
+    built from one grouped pass over the trips instead of one pass per group.
+    The station table is indexed by station_col (e.g. the station codes).
+    """
+    required_cols = [START_TIME_COL, station_col, DURATION_MIN_COL, "rider_type"]
+    for col in required_cols:
+        if col not in df.columns:
+            raise KeyError(f"DataFrame must contain '{col}' column.")
+
+    groups = periods.cat.categories
+    n_groups = len(groups)
+    group_codes = periods.cat.codes.to_numpy()
+    in_scope = group_codes >= 0
+
+    data = df[in_scope]
+    g = group_codes[in_scope].astype(np.int64)
+    start = data[START_TIME_COL]
+    duration = data[DURATION_MIN_COL].to_numpy(dtype="float64")
+
+    # --- KPIs ---
+    rides = np.bincount(g, minlength=n_groups)
+    duration_sum = np.bincount(g, weights=duration, minlength=n_groups)
+    members = np.bincount(g, weights=(data["rider_type"] == "Annual member").to_numpy(), minlength=n_groups)
+    day_codes, _ = pd.factorize(start.dt.normalize())
+    active_days = (_crosstab(day_codes, g, day_codes.max() + 1, n_groups) > 0).sum(axis=0) if len(g) else rides
+    median_duration = pd.Series(duration).groupby(g).median().reindex(range(n_groups))
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        kpis = pd.DataFrame({
+            "total_rides": rides,
+            "rides_per_day": rides / active_days,
+            "avg_duration": duration_sum / rides,
+            "median_duration": median_duration.to_numpy(),
+            "subscriber_rate": members / rides * 100,
+        }, index=groups).T
+    kpis.index.name = "metric"
+
+    # --- Station counts ---
+    station_codes, station_names = pd.factorize(fill_unknown(data[station_col]))
+    stations = pd.DataFrame(
+        _crosstab(station_codes, g, len(station_names), n_groups),
+        index=pd.Index(station_names, name=station_col), columns=groups
+    )
+
+    # --- Hour-of-day profile ---
+    hourly = pd.DataFrame(
+        _shares(_crosstab(start.dt.hour.to_numpy(), g, 24, n_groups)),
+        index=pd.RangeIndex(24, name="hour"), columns=groups
+    )
+
+    # --- Duration distribution ---
+    bins = np.searchsorted(DURATION_BIN_EDGES, duration, side="right") - 1
+    bins = np.clip(bins, 0, len(DURATION_BIN_LABELS) - 1)
+    durations = pd.DataFrame(
+        _shares(_crosstab(bins, g, len(DURATION_BIN_LABELS), n_groups)),
+        index=pd.Index(DURATION_BIN_LABELS, name="duration_bin"), columns=groups
+    )
+
+    return PeriodComparison(kpis, stations, hourly, durations)
+
+
+def compute_deltas(table: pd.DataFrame, baseline: Optional[str] = None) -> pd.DataFrame:
+    """
+    Absolute and percent change of every group column against the baseline column (default: the first one).
+    """
+    baseline = table.columns[0] if baseline is None else baseline
+    if baseline not in table.columns:
+        raise KeyError(f"Baseline '{baseline}' is not one of the compared groups.")
+
+    base = table[baseline]
+    result = {}
+    for group in table.columns:
+        if group == baseline:
+            continue
+        delta = table[group] - base
+        result[f"{group} Δ"] = delta
+        result[f"{group} %Δ"] = (delta / base.where(base != 0)) * 100
+    return pd.DataFrame(result, index=table.index)
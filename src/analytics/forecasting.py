@@ -0,0 +1,249 @@
+from typing import NamedTuple
+
+import numpy as np
+import pandas as pd
+
+from src.config import (
+    START_TIME_COL, START_STATION_COL,
+    FORECAST_BACKTEST_DAYS, FORECAST_LEVEL_ALPHA, FORECAST_TREND_BETA, FORECAST_TREND_DAMPING,
+    FORECAST_PROFILE_PRIOR_TRIPS
+)
+from src.data_processor.utils import fill_unknown
+
+HOURS_PER_DAY = 24
+DAYS_PER_WEEK = 7
+NS_PER_HOUR = 3_600 * 10 ** 9
+
+
+class DemandHistory(NamedTuple):
+    """
+    Hourly departures per station: counts[s, t] is station s in hour t after start
+    (midnight of the first day), over whole days.
+    """
+    stations: pd.Index
+    start: pd.Timestamp
+    counts: np.ndarray
+
+    @property
+    def n_days(self) -> int:
+        return self.counts.shape[1] // HOURS_PER_DAY
+
+    @property
+    def daily(self) -> np.ndarray:
+        """The counts as stations x days x 24 hours (a view)."""
+        return self.counts.reshape(len(self.stations), self.n_days, HOURS_PER_DAY)
+
+    @property
+    def weekdays(self) -> np.ndarray:
+        """Day of week (Monday = 0) of each day."""
+        return (self.start.dayofweek + np.arange(self.n_days)) % DAYS_PER_WEEK
+
+    @property
+    def times(self) -> pd.DatetimeIndex:
+        return pd.date_range(self.start, periods=self.counts.shape[1], freq="h")
+
+
+class StationForecast(NamedTuple):
+    """
+    Next-day hourly departure forecasts for every station, with the backtest behind them.
+
+    backtest holds the one-day-ahead forecasts of the last backtest days
+    (stations x hours, aligned with history.counts from backtest_start);
+    forecast is stations x 24 hours from forecast_start. metrics has one row
+    per station: trips, mae, rmse, wape and the same-hour-last-week baseline's
+    naive_mae; skill = 1 - mae / naive_mae.
+    """
+    history: DemandHistory
+    backtest_start: pd.Timestamp
+    backtest: np.ndarray
+    forecast_start: pd.Timestamp
+    forecast: np.ndarray
+    metrics: pd.DataFrame
+
+    @property
+    def summary(self) -> dict:
+        """Backtest errors over all stations and hours (WAPE in %, next to the naive baseline's)."""
+        offset = int((self.backtest_start - self.history.start) // pd.Timedelta(hours=1))
+        actual = self.history.counts[:, offset:]
+        naive = self.history.counts[:, offset - DAYS_PER_WEEK * HOURS_PER_DAY:-DAYS_PER_WEEK * HOURS_PER_DAY]
+        total = float(actual.sum())
+        return {
+            "mae": float(np.abs(self.backtest - actual).mean()),
+            "rmse": float(np.sqrt(((self.backtest - actual) ** 2).mean())),
+            "wape": float(np.abs(self.backtest - actual).sum() / total * 100) if total else float("nan"),
+            "naive_wape": float(np.abs(naive - actual).sum() / total * 100) if total else float("nan"),
+        }
+
+    def next_day(self) -> pd.DataFrame:
+        """Forecast departures per station (rows) and hour of the next day (columns 0-23)."""
+        return pd.DataFrame(self.forecast, index=self.history.stations, columns=range(HOURS_PER_DAY))
+
+    def station_series(self, station) -> pd.DataFrame:
+        """
+        Hourly actual and forecast departures of one station over the backtest
+        window and the forecast day (actual is NaN there).
+        """
+        position = self.history.stations.get_indexer([station])[0]
+        if position < 0:
+            raise KeyError(f"Unknown station '{station}'.")
+        offset = self.backtest.shape[1]
+        actual = np.concatenate([self.history.counts[position, -offset:], np.full(HOURS_PER_DAY, np.nan)])
+        forecast = np.concatenate([self.backtest[position], self.forecast[position]])
+        times = pd.date_range(self.backtest_start, periods=len(forecast), freq="h", name="time")
+        return pd.DataFrame({"actual": actual, "forecast": forecast.astype("float64")}, index=times)
+
+
+def station_hour_matrix(df: pd.DataFrame, station_col: str = START_STATION_COL) -> DemandHistory:
+    """
+    Stations x hours departure counts over whole days, in one bincount over the trips.
+    Stations are sorted; hours with no departures are zero.
+    """
+    for col in (START_TIME_COL, station_col):
+        if col not in df.columns:
+            raise KeyError(f"DataFrame must contain '{col}' column.")
+    trips = df if not df[START_TIME_COL].isna().any() else df.dropna(subset=[START_TIME_COL])
+    if trips.empty:
+        raise ValueError("No trips to build a demand history from.")
+
+    # Factorize first, then name the missing station (filling the few uniques, not every trip).
+    codes, stations = pd.factorize(trips[station_col], sort=True, use_na_sentinel=False)
+    stations = fill_unknown(pd.Series(stations)).to_numpy()
+    start = trips[START_TIME_COL].min().floor("D")
+    hours = (trips[START_TIME_COL].to_numpy("datetime64[ns]") - start.to_datetime64()).astype("int64") // NS_PER_HOUR
+    n_hours = (int(hours.max()) // HOURS_PER_DAY + 1) * HOURS_PER_DAY
+
+    counts = np.bincount(codes * n_hours + hours, minlength=len(stations) * n_hours)
+    return DemandHistory(pd.Index(stations, name=station_col), start,
+                         counts.reshape(len(stations), n_hours).astype(np.float32))
+
+
+def hour_of_week_profile(daily: np.ndarray, weekdays: np.ndarray,
+                         prior_trips: float = FORECAST_PROFILE_PRIOR_TRIPS) -> np.ndarray:
+    """
+    Expected share of an average day's departures in each weekday and hour, stations x 7 x 24.
+
+    A station's profile sums to 7 over the week (1 per average day). Stations
+    with few trips lean on the network-wide profile: their own shape is
+    weighted trips / (trips + prior_trips).
+    """
+    if np.bincount(weekdays, minlength=DAYS_PER_WEEK).min() == 0:
+        raise ValueError("The profile needs at least one full week of history.")
+
+    # Mean count per weekday and hour: the one-hot weekday of each day (7 x days) times every
+    # station's days x 24 block, as one batched matrix product.
+    one_hot = np.eye(DAYS_PER_WEEK, dtype=np.float32)[weekdays].T
+    means = (one_hot @ daily) / one_hot.sum(axis=1)[None, :, None]
+
+    day_mean = means.sum(axis=2).mean(axis=1)
+    own = np.divide(means, day_mean[:, None, None], out=np.zeros_like(means), where=day_mean[:, None, None] > 0)
+    network = means.sum(axis=0)
+    network = network / max(float(network.sum(axis=1).mean()), 1e-9)
+
+    trips = daily.sum(axis=(1, 2))
+    weight = (trips / (trips + prior_trips))[:, None, None]
+    return weight * own + (1 - weight) * network[None]
+
+
+def _damped_holt(totals: np.ndarray, factors: np.ndarray, alpha: float, beta: float, phi: float) -> np.ndarray:
+    """
+    One-day-ahead deseasonalised levels for every station, stations x (days + 1).
+
+    Column d is the level expected for day d from days before it (the last
+    column is the day after the history). Each step updates all stations at
+    once; days whose weekday factor is 0 (no departures expected) carry the
+    level and trend forward.
+    """
+    informative = factors > 0
+    deseasonalised = np.divide(totals, factors, out=np.zeros_like(totals), where=informative)
+
+    first_week = informative[:, :DAYS_PER_WEEK]
+    level = np.where(first_week, deseasonalised[:, :DAYS_PER_WEEK], 0).sum(axis=1) \
+        / np.maximum(first_week.sum(axis=1), 1)
+    trend = np.zeros_like(level)
+
+    predicted = np.empty((totals.shape[0], totals.shape[1] + 1), dtype=np.float64)
+    for day in range(totals.shape[1]):
+        predicted[:, day] = level + phi * trend
+        updated = alpha * deseasonalised[:, day] + (1 - alpha) * predicted[:, day]
+        updated = np.where(informative[:, day], updated, predicted[:, day])
+        trend = np.where(informative[:, day], beta * (updated - level) + (1 - beta) * phi * trend, phi * trend)
+        level = updated
+    predicted[:, -1] = level + phi * trend
+    return np.maximum(predicted, 0)
+
+
+def _fit(daily: np.ndarray, weekdays: np.ndarray, fit_days: int,
+         alpha: float, beta: float, phi: float, prior_trips: float) -> np.ndarray:
+    """
+    Hourly one-day-ahead forecasts, stations x (days + 1) x 24, with the
+    profile fit on the first fit_days days only.
+    """
+    profile = hour_of_week_profile(daily[:, :fit_days], weekdays[:fit_days], prior_trips)
+    all_weekdays = np.append(weekdays, (weekdays[-1] + 1) % DAYS_PER_WEEK)
+    factors = profile.sum(axis=2)[:, all_weekdays]
+    levels = _damped_holt(daily.sum(axis=2).astype(np.float64), factors[:, :-1], alpha, beta, phi)
+    # Level of each day spread over its hours by the station's weekday profile.
+    return (levels[:, :, None] * profile[:, all_weekdays, :]).astype(np.float32)
+
+
+def _station_metrics(stations: pd.Index, actual: np.ndarray, predicted: np.ndarray,
+                     naive: np.ndarray) -> pd.DataFrame:
+    errors = predicted - actual
+    trips = actual.sum(axis=1)
+    mae = np.abs(errors).mean(axis=1)
+    naive_mae = np.abs(naive - actual).mean(axis=1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        wape = np.where(trips > 0, np.abs(errors).sum(axis=1) / trips * 100, np.nan)
+        skill = np.where(naive_mae > 0, 1 - mae / naive_mae, np.nan)
+    return pd.DataFrame({
+        "trips": trips.astype("int64"),
+        "mae": mae.astype("float64"),
+        "rmse": np.sqrt((errors ** 2).mean(axis=1)).astype("float64"),
+        "wape": wape.astype("float64"),
+        "naive_mae": naive_mae.astype("float64"),
+        "skill": skill.astype("float64"),
+    }, index=stations)
+
+
+def forecast_station_demand(df: pd.DataFrame, backtest_days: int = FORECAST_BACKTEST_DAYS,
+                            station_col: str = START_STATION_COL, alpha: float = FORECAST_LEVEL_ALPHA,
+                            beta: float = FORECAST_TREND_BETA,
+                            phi: float = FORECAST_TREND_DAMPING,
+                            prior_trips: float = FORECAST_PROFILE_PRIOR_TRIPS) -> StationForecast:
+    """
+    Next-day hourly departures for all stations from an hour-of-week profile
+    times a damped-trend EWMA (Holt) level of the deseasonalised daily totals.
+
+    The backtest refits nothing per day: one pass with the profile fit before
+    the last backtest_days days gives every one-day-ahead forecast in that
+    window, scored against the actual counts and a same-hour-last-week
+    baseline. The next-day forecast uses the profile fit on all days.
+    """
+    if backtest_days < 1:
+        raise ValueError("backtest_days must be at least 1.")
+    if not (0 < alpha <= 1 and 0 <= beta <= 1 and 0 <= phi <= 1):
+        raise ValueError("alpha must be in (0, 1], beta and phi in [0, 1].")
+
+    history = station_hour_matrix(df, station_col)
+    fit_days = history.n_days - backtest_days
+    if fit_days < DAYS_PER_WEEK:
+        raise ValueError(f"Need at least {DAYS_PER_WEEK + backtest_days} days of trips "
+                         f"({history.n_days} found) for a {backtest_days}-day backtest.")
+
+    daily, weekdays = history.daily, history.weekdays
+    backtest = _fit(daily, weekdays, fit_days, alpha, beta, phi, prior_trips)[:, fit_days:-1]
+    forecast = _fit(daily, weekdays, history.n_days, alpha, beta, phi, prior_trips)[:, -1]
+
+    n_stations = len(history.stations)
+    actual = daily[:, fit_days:]
+    naive = daily[:, fit_days - DAYS_PER_WEEK:-DAYS_PER_WEEK]
+    metrics = _station_metrics(history.stations, actual.reshape(n_stations, -1),
+                               backtest.reshape(n_stations, -1), naive.reshape(n_stations, -1))
+    return StationForecast(
+        history=history,
+        backtest_start=history.start + pd.Timedelta(days=fit_days),
+        backtest=backtest.reshape(n_stations, -1),
+        forecast_start=history.start + pd.Timedelta(days=history.n_days),
+        forecast=forecast,
+        metrics=metrics,
+    )
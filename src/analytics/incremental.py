@@ -0,0 +1,119 @@
+import copy
+from typing import Optional
+
+import pandas as pd
+
+from src.analytics.sketches import DistinctCountSketch, DurationQuantileSketch
+from src.config import START_TIME_COL, START_STATION_COL, DURATION_MIN_COL, BIKE_ID_COL
+from src.data_processor.utils import fill_unknown
+
+
+def _accumulate(total: Optional[pd.Series], part: pd.Series) -> pd.Series:
+    if total is None:
+        return part.astype("int64")
+    return total.add(part, fill_value=0).astype("int64")
+
+
+class PartialAggregates:
+    """
+    Running totals behind the KPI cards, the daily timeline, the top stations chart
+    and the sketched duration percentiles and distinct bike counts.
+
+    Chunks are folded in with update(); the accessors return the same structures
+    as the full-frame analytics functions, so the final snapshot matches a
+    synchronous run exactly.
+
+    Stations are keyed by station_col: the start station name by default, or
+    the start station code for frames encoded by a StationDimension.
+    """
+
+    def __init__(self, station_col: str = START_STATION_COL):
+        self.station_col = station_col
+        self.total_rides = 0
+        self.duration_sum = 0.0
+        self.annual_rides = 0
+        self.daily_counts: Optional[pd.Series] = None    # (day, rider_type) -> rides
+        self.station_counts: Optional[pd.Series] = None  # start station -> rides
+        # Duration percentiles per station, hour, rider type; distinct bikes per station, day, rider type.
+        self.duration_sketch = DurationQuantileSketch(keys=[station_col, "hour", "rider_type"])
+        self.bike_sketch = DistinctCountSketch(keys=[station_col, "day", "rider_type"])
+
+    def update(self, chunk: pd.DataFrame) -> None:
+        """
+        Folds one processed chunk (after categorize_riders and calculate_trip_metrics) into the totals.
+        """
+        if chunk.empty:
+            return
+
+        self.total_rides += len(chunk)
+        self.duration_sum += float(chunk[DURATION_MIN_COL].sum())
+        self.annual_rides += int((chunk["rider_type"] == "Annual member").sum())
+
+        days = chunk[START_TIME_COL].dt.floor("D")
+        daily = chunk.groupby([days, chunk["rider_type"]]).size()
+        self.daily_counts = _accumulate(self.daily_counts, daily)
+
+        stations = fill_unknown(chunk[self.station_col]).value_counts()
+        self.station_counts = _accumulate(self.station_counts, stations)
+
+        self.duration_sketch.update(chunk)
+        if BIKE_ID_COL in chunk.columns:
+            self.bike_sketch.update(chunk)
+
+    def copy(self) -> "PartialAggregates":
+        """
+        A snapshot that later updates leave unchanged. Cheap: update() replaces the count
+        Series instead of modifying them, so they are shared, and the sketches copy
+        only their lists of parts.
+        """
+        clone = copy.copy(self)
+        clone.duration_sketch = self.duration_sketch.copy()
+        clone.bike_sketch = self.bike_sketch.copy()
+        return clone
+
+    def kpis(self) -> dict:
+        """
+        Total rides, mean trip duration (min) and annual member trip share (%).
+        """
+        if not self.total_rides:
+            return {"total_rides": 0, "avg_duration": float("nan"), "subscriber_rate": float("nan")}
+
+        return {
+            "total_rides": self.total_rides,
+            "avg_duration": self.duration_sum / self.total_rides,
+            "subscriber_rate": self.annual_rides / self.total_rides * 100,
+        }
+
+    def daily_rides(self, rider_type: Optional[str] = None) -> pd.DataFrame:
+        """
+        Same output as calculate_daily_rides, optionally restricted to one normalized rider_type.
+        """
+        counts = self.daily_counts
+        if counts is not None and rider_type is not None:
+            counts = counts[counts.index.get_level_values(1) == rider_type]
+
+        if counts is None or counts.empty:
+            daily = pd.Series(dtype="int64", index=pd.DatetimeIndex([], name="Date"))
+        else:
+            daily = counts.groupby(level=0).sum()
+            full_range = pd.date_range(daily.index.min(), daily.index.max(), freq="D", name="Date")
+            daily = daily.reindex(full_range, fill_value=0).astype("int64")
+
+        return daily.to_frame(name="total_rides")
+
+    def top_stations(self, top_n: int = 10) -> pd.DataFrame:
+        """
+        Same output as get_top_starting_stations.
+        """
+        if self.station_counts is None:
+            return pd.DataFrame({self.station_col: pd.Series(dtype="object"),
+                                 "trip_count": pd.Series(dtype="int64")})
+
+        counts = self.station_counts.sort_index()
+        counts.index.name = self.station_col
+
+        return (
+            counts.reset_index(name="trip_count")
+                  .sort_values("trip_count", ascending=False)
+                  .head(top_n)
+        )
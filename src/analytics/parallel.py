@@ -0,0 +1,85 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, NamedTuple, Optional
+
+import pandas as pd
+
+from src.config import VIEW_WORKERS
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+class TaskOutcome(NamedTuple):
+    """
+    Result of one task: its value, or the exception it raised, and how long it ran.
+    """
+    value: Any
+    error: Optional[BaseException]
+    seconds: float
+
+
+class ConcurrentRun(NamedTuple):
+    """
+    Outcomes of a batch of tasks run together, plus the wall-clock time of the batch.
+    """
+    outcomes: Dict[str, TaskOutcome]
+    wall_seconds: float
+
+    @property
+    def sequential_seconds(self) -> float:
+        """What the same tasks cost back to back."""
+        return sum(outcome.seconds for outcome in self.outcomes.values())
+
+    @property
+    def speedup(self) -> float:
+        return self.sequential_seconds / self.wall_seconds if self.wall_seconds else float("nan")
+
+    def timings(self) -> pd.DataFrame:
+        """
+        Per-task seconds, sorted slowest first; the slowest task bounds the batch (critical path).
+        """
+        return pd.DataFrame(
+            {"seconds": [outcome.seconds for outcome in self.outcomes.values()],
+             "ok": [outcome.error is None for outcome in self.outcomes.values()]},
+            index=pd.Index(list(self.outcomes), name="task"),
+        ).sort_values("seconds", ascending=False)
+
+
+def shared_executor() -> ThreadPoolExecutor:
+    """
+    The process-wide pool for view computations, created on first use.
+    """
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=VIEW_WORKERS, thread_name_prefix="view-worker")
+        return _executor
+
+
+def run_task(fn: Callable[[], Any]) -> TaskOutcome:
+    """
+    Runs fn in the calling thread, capturing its exception instead of raising it.
+    """
+    started = time.perf_counter()
+    try:
+        return TaskOutcome(fn(), None, time.perf_counter() - started)
+    except Exception as error:
+        return TaskOutcome(None, error, time.perf_counter() - started)
+
+
+def run_concurrently(tasks: Dict[str, Callable[[], Any]],
+                     executor: Optional[ThreadPoolExecutor] = None) -> ConcurrentRun:
+    """
+    Runs independent, read-only tasks at once and waits for all of them.
+
+    A failing task only marks its own outcome; the others still complete.
+    pandas/NumPy kernels release the GIL for much of their work, so threads
+    overlap the heavy parts without copying the shared frame into processes.
+    """
+    executor = executor or shared_executor()
+    started = time.perf_counter()
+    futures = {name: executor.submit(run_task, fn) for name, fn in tasks.items()}
+    outcomes = {name: future.result() for name, future in futures.items()}
+    return ConcurrentRun(outcomes, time.perf_counter() - started)
@@ -1,7 +1,11 @@
 import pandas as pd
-import altair as alt
+from typing import TYPE_CHECKING
 
-def plot_top_stations(top_stations_df: pd.DataFrame, title: str) -> alt.Chart:
+# Altair is imported on first call; importing this module stays cheap.
+if TYPE_CHECKING:
+    import altair as alt
+
+def plot_top_stations(top_stations_df: pd.DataFrame, title: str) -> "alt.Chart":
     """
     Plots the top starting stations as a horizontal bar chart and returns the Altair chart object.
     
@@ -12,6 +16,7 @@ def plot_top_stations(top_stations_df: pd.DataFrame, title: str) -> alt.Chart:
     Returns:
         An Altair Chart object (the figure).
     """
+    import altair as alt
     
     # Assuming the station column name is consistent with the earlier context
     station_col_name = top_stations_df.columns[0] 
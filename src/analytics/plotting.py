@@ -1,12 +1,16 @@
-import plotly.express as px
 import pandas as pd
-from plotly.graph_objects import Figure
+from typing import Optional, TYPE_CHECKING
+
+# Plotly Express is imported inside each function: it is only paid for when a chart is drawn.
+if TYPE_CHECKING:
+    from plotly.graph_objects import Figure
 
 
 def plot_daily_rides(df_daily: pd.DataFrame):
     """
     Produces a Plotly line chart showing total rides per day.
     """
+    import plotly.express as px
 
     fig = px.line(
         df_daily,
@@ -22,15 +26,19 @@ def plot_daily_rides(df_daily: pd.DataFrame):
     return fig
 
 
-def plot_duration_histogram(df: pd.DataFrame) -> Figure:  # <- updated type hint
+def plot_duration_histogram(df: pd.DataFrame, weight_col: Optional[str] = None) -> "Figure":  # <- updated type hint
     """
     Generates a Plotly histogram of trip duration, comparing Subscribers and Casual riders.
     Fulfills US-8.
+
+    When weight_col is given (e.g. sample weights in approximate mode), bars sum the weights instead of counting rows.
     """
     # Defensive check for required columns
     if 'trip_duration_min' not in df.columns or 'User Type' not in df.columns:
         raise KeyError("DataFrame must contain 'trip_duration_min' and 'User Type' columns.")
 
+    import plotly.express as px
+
     # Apply data filtering (Refactor step for better visualization, clipping long trips)
     MAX_DURATION = 60
     df_filtered = df[df['trip_duration_min'] <= MAX_DURATION]
@@ -38,6 +46,8 @@ def plot_duration_histogram(df: pd.DataFrame) -> Figure:  # <- updated type hint
     fig = px.histogram(
         df_filtered,
         x='trip_duration_min',
+        y=weight_col,
+        histfunc='sum' if weight_col else 'count',
         color='User Type',
         barmode='overlay',  # Overlays the two distributions
         nbins=30,
@@ -0,0 +1,63 @@
+import importlib
+from types import ModuleType
+from typing import Any, Callable, Dict
+
+# Public name -> "module:attribute". Nothing is imported until a name is first looked up.
+VIEWS: Dict[str, str] = {
+    "calculate_kpis": "src.analytics.usage_patterns:calculate_kpis",
+    "calculate_daily_rides": "src.analytics.usage_patterns:calculate_daily_rides",
+    "get_top_starting_stations": "src.analytics.stations:get_top_starting_stations",
+    "assign_periods": "src.analytics.comparison:assign_periods",
+    "compare_periods": "src.analytics.comparison:compare_periods",
+    "compute_deltas": "src.analytics.comparison:compute_deltas",
+    "StationAnomalyDetector": "src.analytics.anomalies:StationAnomalyDetector",
+    "cluster_stations": "src.analytics.clustering:cluster_stations",
+    "forecast_station_demand": "src.analytics.forecasting:forecast_station_demand",
+    "load_weather": "src.analytics.weather:load_weather",
+    "kpis_by_weather": "src.analytics.weather:kpis_by_weather",
+    "join_daily_weather": "src.analytics.weather:join_daily_weather",
+    "plot_daily_rides": "src.analytics.plotting:plot_daily_rides",
+    "plot_duration_histogram": "src.analytics.plotting:plot_duration_histogram",
+    "plot_top_stations": "src.analytics.plot_top_stations:plot_top_stations",
+}
+
+_resolved: Dict[str, Any] = {}
+
+
+def register_view(name: str, target: str) -> None:
+    """
+    Adds (or replaces) a lazily resolved entry; target is "package.module:attribute".
+    """
+    if ":" not in target:
+        raise ValueError("target must look like 'package.module:attribute'.")
+    VIEWS[name] = target
+    _resolved.pop(name, None)
+
+
+def get_view(name: str) -> Callable:
+    """
+    The registered function or class, importing its module on first use.
+    """
+    if name not in _resolved:
+        if name not in VIEWS:
+            raise KeyError(f"Unknown view: {name}")
+        module_name, attribute = VIEWS[name].split(":")
+        _resolved[name] = getattr(importlib.import_module(module_name), attribute)
+    return _resolved[name]
+
+
+class LazyModule(ModuleType):
+    """
+    Stand-in for a module that is imported on first attribute access, e.g. px = LazyModule("plotly.express").
+    """
+
+    def __init__(self, name: str):
+        super().__init__(name)
+        self._module = None
+
+    def __getattr__(self, attribute: str):
+        if attribute == "_module":
+            raise AttributeError(attribute)
+        if self._module is None:
+            self._module = importlib.import_module(self.__name__)
+        return getattr(self._module, attribute)
@@ -0,0 +1,192 @@
+from typing import NamedTuple
+
+import numpy as np
+import pandas as pd
+
+from src.config import (
+    START_TIME_COL, START_STATION_COL, DURATION_MIN_COL,
+    SAMPLE_WEIGHT_COL, APPROX_SAMPLE_ROWS, APPROX_MIN_PER_STRATUM, APPROX_Z
+)
+from src.data_processor.utils import fill_unknown
+
+STRATUM_COL = "_stratum"
+
+
+class StratifiedSample(NamedTuple):
+    """
+    sample: sampled trips with a stratum id and an expansion weight (N_h / n_h).
+    strata: population size N and sample size n per stratum id.
+    """
+    sample: pd.DataFrame
+    strata: pd.DataFrame
+
+
+def build_stratified_sample(
+        df: pd.DataFrame,
+        max_rows: int = APPROX_SAMPLE_ROWS,
+        min_per_stratum: int = APPROX_MIN_PER_STRATUM,
+        seed: int = 0
+) -> StratifiedSample:
+    """
+    Draws a random sample stratified by start date and rider_type, capped at roughly max_rows.
+
+    Every stratum keeps at least min_per_stratum trips (or all of them), so
+    per-day and per-rider-type totals are exact and the sample size does not
+    grow with the dataset.
+    """
+    if START_TIME_COL not in df.columns or "rider_type" not in df.columns:
+        raise KeyError(f"DataFrame must contain '{START_TIME_COL}' and 'rider_type' columns.")
+
+    stratum = df.groupby([df[START_TIME_COL].dt.floor("D"), df["rider_type"]], sort=False).ngroup().to_numpy()
+    population = np.bincount(stratum) if len(stratum) else np.zeros(0, dtype=np.int64)
+
+    fraction = min(1.0, max_rows / len(df)) if len(df) else 1.0
+    sample_sizes = np.clip(np.ceil(population * fraction), np.minimum(min_per_stratum, population), population)
+    sample_sizes = sample_sizes.astype(np.int64)
+
+    # Random rank of each row inside its stratum: sort by (stratum, uniform draw) once.
+    rng = np.random.default_rng(seed)
+    order = np.lexsort((rng.random(len(df)), stratum))
+    starts = np.cumsum(population) - population
+    rank = np.empty(len(df), dtype=np.int64)
+    rank[order] = np.arange(len(df)) - starts[stratum[order]]
+    keep = rank < sample_sizes[stratum]
+
+    sample = df[keep].copy()
+    sample[STRATUM_COL] = stratum[keep]
+    sample[SAMPLE_WEIGHT_COL] = (population / np.maximum(sample_sizes, 1))[stratum[keep]]
+
+    strata = pd.DataFrame({"N": population, "n": sample_sizes})
+    return StratifiedSample(sample, strata)
+
+
+def _estimate_totals(ss: StratifiedSample, by: pd.Series) -> pd.DataFrame:
+    """
+    Stratified estimate of the number of trips per value of `by`, with standard errors.
+
+    Var = sum_h N_h^2 (1 - n_h/N_h) p_h (1 - p_h) / (n_h - 1), with p_h the share
+    of the stratum's sampled trips that fall in the group.
+    """
+    sample = ss.sample
+    counts = sample.groupby([by, sample[STRATUM_COL]], observed=True).size().rename("y").reset_index()
+    group_col = counts.columns[0]
+
+    N = ss.strata["N"].to_numpy(dtype="float64")[counts[STRATUM_COL].to_numpy()]
+    n = ss.strata["n"].to_numpy(dtype="float64")[counts[STRATUM_COL].to_numpy()]
+    p = counts["y"].to_numpy() / n
+    variance = np.where(n > 1, N ** 2 * (1 - n / N) * p * (1 - p) / np.maximum(n - 1, 1), 0.0)
+
+    totals = pd.DataFrame({
+        group_col: counts[group_col],
+        "estimate": N * p,
+        "variance": variance,
+    }).groupby(group_col, observed=True).sum()
+
+    totals["std_error"] = np.sqrt(totals.pop("variance"))
+    return totals
+
+
+def _with_ci(estimate, std_error, z: float):
+    half_width = z * std_error
+    return np.maximum(estimate - half_width, 0), estimate + half_width
+
+
+def approximate_kpis(ss: StratifiedSample, z: float = APPROX_Z) -> dict:
+    """
+    KPI card values estimated from the sample, each with a confidence half-width ('<name>_ci').
+    """
+    sample = ss.sample
+    if sample.empty:
+        nan = float("nan")
+        return {"total_rides": 0, "avg_duration": nan, "subscriber_rate": nan,
+                "total_rides_ci": 0.0, "avg_duration_ci": nan, "subscriber_rate_ci": nan}
+
+    N = ss.strata["N"].to_numpy(dtype="float64")
+    n = ss.strata["n"].to_numpy(dtype="float64")
+    total = N.sum()
+
+    def stratified_mean(values: pd.Series):
+        grouped = values.groupby(sample[STRATUM_COL])
+        means = grouped.mean().reindex(range(len(N)), fill_value=0).to_numpy()
+        variances = grouped.var(ddof=1).reindex(range(len(N))).fillna(0).to_numpy()
+        weights = N / total
+        estimate = float((weights * means).sum())
+        variance = float((weights ** 2 * (1 - n / N) * variances / np.maximum(n, 1)).sum())
+        return estimate, z * np.sqrt(variance)
+
+    avg_duration, avg_duration_ci = stratified_mean(sample[DURATION_MIN_COL])
+    share, share_ci = stratified_mean((sample["rider_type"] == "Annual member").astype("float64"))
+
+    return {
+        # Strata partition the data, so the total is known exactly.
+        "total_rides": int(total),
+        "avg_duration": avg_duration,
+        "subscriber_rate": share * 100,
+        "total_rides_ci": 0.0,
+        "avg_duration_ci": avg_duration_ci,
+        "subscriber_rate_ci": share_ci * 100,
+    }
+
+
+def approximate_daily_rides(ss: StratifiedSample, z: float = APPROX_Z) -> pd.DataFrame:
+    """
+    Estimated version of calculate_daily_rides with 'ci_low'/'ci_high' columns.
+    """
+    sample = ss.sample
+    if sample.empty:
+        return pd.DataFrame(columns=["total_rides", "ci_low", "ci_high"],
+                            index=pd.DatetimeIndex([], name="Date"))
+
+    totals = _estimate_totals(ss, sample[START_TIME_COL].dt.floor("D").rename("Date"))
+    full_range = pd.date_range(totals.index.min(), totals.index.max(), freq="D", name="Date")
+    totals = totals.reindex(full_range, fill_value=0)
+
+    ci_low, ci_high = _with_ci(totals["estimate"], totals["std_error"], z)
+    return pd.DataFrame({
+        "total_rides": totals["estimate"].round().astype("int64"),
+        "ci_low": ci_low,
+        "ci_high": ci_high,
+    }, index=full_range)
+
+
+def approximate_top_stations(ss: StratifiedSample, top_n: int = 10, z: float = APPROX_Z,
+                             station_col: str = START_STATION_COL) -> pd.DataFrame:
+    """
+    Estimated version of get_top_starting_stations with 'ci_low'/'ci_high' columns.
+    """
+    sample = ss.sample
+    stations = fill_unknown(sample[station_col]).rename(station_col)
+    totals = _estimate_totals(ss, stations)
+
+    ci_low, ci_high = _with_ci(totals["estimate"], totals["std_error"], z)
+    result = pd.DataFrame({
+        station_col: totals.index,
+        "trip_count": totals["estimate"].round().astype("int64").to_numpy(),
+        "ci_low": ci_low.to_numpy(),
+        "ci_high": ci_high.to_numpy(),
+    })
+    return result.sort_values("trip_count", ascending=False).head(top_n)
+
+
+def approximate_duration_bins(
+        ss: StratifiedSample,
+        bin_width: float = 2.0,
+        max_duration: float = 60.0,
+        z: float = APPROX_Z
+) -> pd.DataFrame:
+    """
+    Estimated trip counts per duration bin (minutes) with confidence intervals, matching the histogram's cap.
+    """
+    sample = ss.sample[ss.sample[DURATION_MIN_COL] <= max_duration]
+
+    edges = np.arange(0, max_duration + bin_width, bin_width)
+    bins = pd.cut(sample[DURATION_MIN_COL], edges, include_lowest=True).rename("duration_bin")
+    totals = _estimate_totals(ss._replace(sample=sample), bins)
+
+    ci_low, ci_high = _with_ci(totals["estimate"], totals["std_error"], z)
+    return pd.DataFrame({
+        "duration_bin": totals.index.astype(str),
+        "trip_count": totals["estimate"].round().astype("int64").to_numpy(),
+        "ci_low": ci_low.to_numpy(),
+        "ci_high": ci_high.to_numpy(),
+    })
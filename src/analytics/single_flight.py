@@ -0,0 +1,118 @@
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, Dict, Hashable, Optional
+
+import pandas as pd
+
+from src.config import HEAVY_JOB_WORKERS
+
+_registry: Optional["ComputationRegistry"] = None
+_registry_lock = threading.Lock()
+
+
+def normalise(value: Any) -> Hashable:
+    """
+    Hashable, order-insensitive form of call arguments for use in a key.
+
+    Dicts and sets compare regardless of order, lists like tuples. Frames
+    and Series are keyed by identity (the same shared object across
+    sessions); pass a dataset_version to distinguish reloads.
+    """
+    if isinstance(value, dict):
+        return tuple(sorted((str(k), normalise(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(normalise(v) for v in value)
+    if isinstance(value, (set, frozenset)):
+        return frozenset(normalise(v) for v in value)
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        return (type(value).__name__, id(value), value.shape)
+    hash(value)  # Raises TypeError for anything else that cannot be part of a key.
+    return value
+
+
+class ComputationRegistry:
+    """
+    Single-flight execution of heavy computations shared by all sessions in the process.
+
+    The first caller for a key starts the computation on a bounded pool;
+    callers arriving while it is in flight wait on the same future instead
+    of starting their own. The entry is dropped when the computation ends
+    (results are not cached here; that is Streamlit's or the API's job), so
+    a failure is seen by every waiter and the next call retries.
+    """
+
+    def __init__(self, max_workers: int = HEAVY_JOB_WORKERS):
+        self.max_workers = max_workers
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="heavy-job")
+        self._lock = threading.Lock()
+        self._in_flight: Dict[Hashable, Future] = {}
+        self._local = threading.local()
+        self.started = 0    # computations actually run
+        self.coalesced = 0  # calls that joined one already in flight
+
+    def _run(self, fn: Callable, args: tuple, kwargs: dict) -> Any:
+        self._local.in_job = True
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            self._local.in_job = False
+
+    def _forget(self, key: Hashable, future: Future) -> None:
+        with self._lock:
+            if self._in_flight.get(key) is future:
+                del self._in_flight[key]
+
+    def submit(self, key: Hashable, fn: Callable, *args, **kwargs) -> Future:
+        """
+        The future for key, starting fn(*args, **kwargs) only if no computation for key is in flight.
+        """
+        with self._lock:
+            future = self._in_flight.get(key)
+            if future is not None:
+                self.coalesced += 1
+                return future
+
+            self.started += 1
+            # A job that needs another computation runs it in its own thread: waiting on the
+            # bounded pool from inside it could deadlock once every worker is waiting.
+            inline = getattr(self._local, "in_job", False)
+            future = Future() if inline else self._executor.submit(self._run, fn, args, kwargs)
+            self._in_flight[key] = future
+
+        future.add_done_callback(partial(self._forget, key))
+        if inline:
+            try:
+                future.set_result(fn(*args, **kwargs))
+            except Exception as error:
+                future.set_exception(error)
+        return future
+
+    def run(self, key: Hashable, fn: Callable, *args, timeout: Optional[float] = None, **kwargs) -> Any:
+        """Blocking form of submit(): the (possibly shared) result, or the exception it raised."""
+        return self.submit(key, fn, *args, **kwargs).result(timeout)
+
+    def call(self, fn: Callable, *args, dataset_version: Hashable = None, **kwargs) -> Any:
+        """
+        run() keyed by (dataset_version, function, normalised arguments).
+        """
+        key = (dataset_version, f"{fn.__module__}.{fn.__qualname__}", normalise(args), normalise(kwargs))
+        return self.run(key, fn, *args, **kwargs)
+
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._in_flight)
+
+    def shutdown(self, wait: bool = True) -> None:
+        self._executor.shutdown(wait=wait)
+
+
+def shared_registry() -> ComputationRegistry:
+    """
+    The process-wide registry (one per Streamlit server, shared by every session), created on first use.
+    """
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = ComputationRegistry()
+        return _registry
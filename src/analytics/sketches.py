@@ -0,0 +1,350 @@
+import copy
+from typing import Iterable, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from src.config import (
+    START_TIME_COL, START_STATION_COL, DURATION_MIN_COL, BIKE_ID_COL,
+    QUANTILE_SKETCH_ACCURACY, HLL_PRECISION
+)
+
+SKETCH_KEYS = [START_STATION_COL, "hour", "rider_type"]
+DISTINCT_KEYS = [START_STATION_COL, "day", "rider_type"]
+BUCKET_LEVEL = "bucket"
+REGISTER_LEVEL = "register"
+_ZERO_BUCKET = np.iinfo(np.int32).min  # Holds durations <= 0, which have no logarithm
+_COMPACT_EVERY = 8
+
+
+def _group_keys(chunk: pd.DataFrame, keys: Sequence[str]) -> List[pd.Series]:
+    """
+    Key columns for one chunk; "hour" and "day" are derived from the start time when the frame has no such column.
+    """
+    columns = []
+    for key in keys:
+        if key in chunk.columns:
+            column = chunk[key]
+        elif key == "hour" and START_TIME_COL in chunk.columns:
+            column = chunk[START_TIME_COL].dt.hour
+        elif key == "day" and START_TIME_COL in chunk.columns:
+            column = chunk[START_TIME_COL].dt.floor("D")
+        else:
+            raise KeyError(f"DataFrame must contain '{key}' column.")
+        if column.dtype == object:
+            column = column.fillna("Unknown")
+        columns.append(column.rename(key))
+    return columns
+
+
+class _GroupedSketch:
+    """
+    Sparse per-group sketch state: a Series indexed by (*keys, slot) that merges with `_reduce` ("sum" or "max").
+    """
+    _reduce = "sum"
+
+    def __init__(self, keys: Sequence[str]):
+        self.keys = list(keys)
+        self._parts: List[pd.Series] = []
+
+    def copy(self) -> "_GroupedSketch":
+        """
+        An independent copy that shares the (never modified) part Series; only the part list is copied.
+        """
+        clone = copy.copy(self)
+        clone._parts = list(self._parts)
+        return clone
+
+    def _add(self, part: pd.Series) -> None:
+        # Aligning MultiIndexes on every chunk is the slow part, so parts are combined in batches.
+        self._parts.append(part)
+        if len(self._parts) >= _COMPACT_EVERY:
+            self._compact()
+
+    def _compact(self) -> None:
+        if len(self._parts) > 1:
+            merged = pd.concat(self._parts)
+            grouped = merged.groupby(level=list(range(merged.index.nlevels)), sort=False)
+            self._parts = [getattr(grouped, self._reduce)()]
+
+    def _table(self) -> Optional[pd.Series]:
+        if not self._parts:
+            return None
+        self._compact()
+        return self._parts[0]
+
+    def _check_keys(self, by: Optional[Sequence[str]]) -> List[str]:
+        by = self.keys if by is None else list(by)
+        unknown = [key for key in by if key not in self.keys]
+        if unknown:
+            raise KeyError(f"Sketch is not keyed by {unknown}.")
+        return by
+
+
+class DurationQuantileSketch(_GroupedSketch):
+    """
+    Mergeable per-group quantile sketch over trip_duration_min (DDSketch-style log buckets).
+
+    Each duration v > 0 is counted in bucket ceil(log_gamma(v)) with
+    gamma = (1 + a) / (1 - a), where a is the relative accuracy. Every
+    reported quantile is within a relative error of a of the exact
+    lower quantile (np.quantile(..., method="lower")) of the group.
+
+    Memory is bounded by the value range rather than the row count: with
+    a = 1%, durations from one second to one day span under 600 buckets per
+    group. Merging two sketches only adds bucket counts, so chunks, files
+    and months combine in any order with the same result.
+    """
+
+    def __init__(self, keys: Sequence[str] = tuple(SKETCH_KEYS),
+                 relative_accuracy: float = QUANTILE_SKETCH_ACCURACY):
+        if not 0 < relative_accuracy < 1:
+            raise ValueError("relative_accuracy must be between 0 and 1.")
+        super().__init__(keys)
+        self.relative_accuracy = float(relative_accuracy)
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = float(np.log(self.gamma))
+
+    def _buckets(self, values: np.ndarray) -> np.ndarray:
+        buckets = np.full(len(values), _ZERO_BUCKET, dtype=np.int64)
+        positive = values > 0
+        buckets[positive] = np.ceil(np.log(values[positive]) / self._log_gamma)
+        return buckets
+
+    def _values(self, buckets: np.ndarray) -> np.ndarray:
+        # Midpoint (in relative terms) of (gamma^(i-1), gamma^i]: at most a away from anything in the bucket.
+        values = 2 * np.power(self.gamma, buckets.astype("float64")) / (self.gamma + 1)
+        return np.where(buckets == _ZERO_BUCKET, 0.0, values)
+
+    def update(self, chunk: pd.DataFrame) -> "DurationQuantileSketch":
+        """
+        Folds one processed chunk into the sketch in a single groupby; rows without a duration are skipped.
+        """
+        if DURATION_MIN_COL not in chunk.columns:
+            raise KeyError(f"DataFrame must contain '{DURATION_MIN_COL}' column.")
+
+        chunk = chunk[chunk[DURATION_MIN_COL].notna()]
+        if chunk.empty:
+            return self
+
+        buckets = pd.Series(self._buckets(chunk[DURATION_MIN_COL].to_numpy("float64")),
+                            index=chunk.index, name=BUCKET_LEVEL)
+        part = chunk.groupby(_group_keys(chunk, self.keys) + [buckets], sort=False).size()
+        self._add(part.astype("int64"))
+        return self
+
+    @property
+    def counts(self) -> Optional[pd.Series]:
+        """Bucket counts indexed by (*keys, bucket), or None before the first update."""
+        return self._table()
+
+    def merge(self, other: "DurationQuantileSketch") -> "DurationQuantileSketch":
+        """
+        Adds another sketch's counts into this one (same keys and accuracy required).
+        """
+        if other.keys != self.keys or other.relative_accuracy != self.relative_accuracy:
+            raise ValueError("Only sketches with the same keys and relative accuracy can be merged.")
+        if other.counts is not None:
+            self._add(other.counts)
+        return self
+
+    @property
+    def n_buckets(self) -> int:
+        return 0 if self.counts is None else len(self.counts)
+
+    def quantiles(self, qs: Iterable[float] = (0.5, 0.9, 0.99), by: Optional[Sequence[str]] = None) -> pd.DataFrame:
+        """
+        Duration quantiles (min) per group, with one column per quantile ("p50", "p90", ...) plus "trips".
+
+        `by` rolls the sketch up to a subset of its keys (e.g. ["hour"]); an empty list gives overall quantiles.
+        """
+        qs = list(qs)
+        if any(not 0 <= q <= 1 for q in qs):
+            raise ValueError("Quantiles must be between 0 and 1.")
+        by = self._check_keys(by)
+
+        columns = [f"p{q * 100:g}" for q in qs] + ["trips"]
+        if self.counts is None:
+            return pd.DataFrame(columns=columns)
+
+        counts = self.counts.groupby(level=by + [BUCKET_LEVEL]).sum().sort_index()
+        if by:
+            grouped = counts.groupby(level=by, sort=False)
+            cumulative, total = grouped.cumsum().to_numpy(), grouped.transform("sum").to_numpy()
+            group_index = counts.index.droplevel(BUCKET_LEVEL)
+        else:
+            cumulative = counts.cumsum().to_numpy()
+            total = np.full(len(counts), cumulative[-1])
+            group_index = pd.Index(np.zeros(len(counts), dtype=int))
+        previous = cumulative - counts.to_numpy()
+        buckets = counts.index.get_level_values(BUCKET_LEVEL).to_numpy()
+
+        result = {}
+        for q, column in zip(qs, columns):
+            # The bucket holding the element of rank floor(q * (n - 1)): exactly one per group.
+            rank = q * (total - 1)
+            hit = (cumulative > rank) & (previous <= rank)
+            result[column] = pd.Series(self._values(buckets[hit]), index=group_index[hit])
+
+        frame = pd.DataFrame(result)
+        if not by:
+            return frame.reset_index(drop=True).assign(trips=int(total[0]))
+        frame["trips"] = counts.groupby(level=by).sum()
+        return frame
+
+    def to_frame(self) -> pd.DataFrame:
+        """
+        Flat (keys..., bucket, count) table, e.g. for writing to Parquet.
+        """
+        if self.counts is None:
+            return pd.DataFrame(columns=self.keys + [BUCKET_LEVEL, "count"])
+        return self.counts.rename("count").reset_index()
+
+    @classmethod
+    def from_frame(cls, frame: pd.DataFrame, relative_accuracy: float = QUANTILE_SKETCH_ACCURACY
+                   ) -> "DurationQuantileSketch":
+        """
+        Rebuilds a sketch from to_frame() output; the relative accuracy must match the one it was built with.
+        """
+        keys = [col for col in frame.columns if col not in (BUCKET_LEVEL, "count")]
+        sketch = cls(keys, relative_accuracy)
+        if not frame.empty:
+            sketch._add(frame.set_index(keys + [BUCKET_LEVEL])["count"].astype("int64"))
+        return sketch
+
+
+def _bit_length(values: np.ndarray) -> np.ndarray:
+    """
+    Exact bit length of uint64 values; each 32-bit half fits a float64 mantissa, so frexp is exact.
+    """
+    high = (values >> np.uint64(32)).astype("float64")
+    low = (values & np.uint64(0xFFFFFFFF)).astype("float64")
+    return np.where(high > 0, 32 + np.frexp(high)[1], np.frexp(low)[1])
+
+
+def hash_values(values: pd.Series) -> np.ndarray:
+    """
+    64-bit hashes of a column. Numeric ids are hashed as int64, so "1234", 1234 and 1234.0
+    from differently-typed exports collide as intended; anything else is hashed as text.
+    """
+    numeric = pd.to_numeric(values, errors="coerce")
+    if numeric.notna().all() and (numeric % 1 == 0).all():
+        return pd.util.hash_array(numeric.to_numpy("int64"))
+    return pd.util.hash_array(values.astype(str).to_numpy(object))
+
+
+class DistinctCountSketch(_GroupedSketch):
+    """
+    Mergeable per-group HyperLogLog distinct counter, by default of Bike Id per start station, day and rider type.
+
+    Each value is hashed to 64 bits; the top `precision` bits pick one of
+    m = 2^precision registers and the register keeps the longest run of
+    leading zeros seen in the remaining bits. Only non-empty registers are
+    stored, so small groups stay small. The standard error of an estimate is
+    about 1.04 / sqrt(m) (1.6% at the default precision of 12); groups
+    with few distinct values switch to linear counting, which is much
+    tighter while most registers are still empty.
+
+    Merging (and rolling up to fewer keys) takes the register-wise maximum,
+    so a union over months equals a sketch built over all of them at once.
+    """
+    _reduce = "max"
+
+    def __init__(self, keys: Sequence[str] = tuple(DISTINCT_KEYS), value_col: str = BIKE_ID_COL,
+                 precision: int = HLL_PRECISION):
+        if not 4 <= precision <= 18:
+            raise ValueError("precision must be between 4 and 18.")
+        super().__init__(keys)
+        self.value_col = value_col
+        self.precision = int(precision)
+        self.n_registers = 1 << self.precision
+
+    def update(self, chunk: pd.DataFrame) -> "DistinctCountSketch":
+        """
+        Folds one chunk into the sketch: one vectorized hash and one groupby-max; rows without a value are skipped.
+        """
+        if self.value_col not in chunk.columns:
+            raise KeyError(f"DataFrame must contain '{self.value_col}' column.")
+
+        chunk = chunk[chunk[self.value_col].notna()]
+        if chunk.empty:
+            return self
+
+        hashes = hash_values(chunk[self.value_col])
+        tail_bits = 64 - self.precision
+        register = (hashes >> np.uint64(tail_bits)).astype("int32")
+        tail = hashes & np.uint64((1 << tail_bits) - 1)
+        rank = (tail_bits - _bit_length(tail) + 1).astype("uint8")
+
+        registers = pd.Series(register, index=chunk.index, name=REGISTER_LEVEL)
+        part = pd.Series(rank, index=chunk.index).groupby(
+            _group_keys(chunk, self.keys) + [registers], sort=False
+        ).max()
+        self._add(part)
+        return self
+
+    def merge(self, other: "DistinctCountSketch") -> "DistinctCountSketch":
+        """
+        Unions another sketch into this one (same keys, value column and precision required).
+        """
+        if (other.keys, other.value_col, other.precision) != (self.keys, self.value_col, self.precision):
+            raise ValueError("Only sketches with the same keys, value column and precision can be merged.")
+        if other.registers is not None:
+            self._add(other.registers)
+        return self
+
+    @property
+    def registers(self) -> Optional[pd.Series]:
+        """Non-empty register ranks indexed by (*keys, register), or None before the first update."""
+        return self._table()
+
+    def estimate(self, by: Optional[Sequence[str]] = None) -> pd.Series:
+        """
+        Estimated distinct values per group, named "distinct_count".
+
+        `by` rolls the sketch up to a subset of its keys (e.g. ["day"] for distinct bikes per day);
+        an empty list gives the overall estimate as a one-element Series.
+        """
+        by = self._check_keys(by)
+        if self.registers is None:
+            return pd.Series(dtype="float64", name="distinct_count")
+
+        registers = self.registers.groupby(level=by + [REGISTER_LEVEL], sort=False).max()
+        if not by:
+            registers.index = pd.MultiIndex.from_arrays(
+                [np.zeros(len(registers), dtype=int), registers.index], names=[None, REGISTER_LEVEL]
+            )
+        groups = registers.index.droplevel(REGISTER_LEVEL)
+        stats = pd.DataFrame({
+            "harmonic": np.exp2(-registers.to_numpy("float64")),
+            "filled": 1,
+        }, index=groups).groupby(level=list(range(groups.nlevels))).sum()
+
+        m = self.n_registers
+        alpha = 0.7213 / (1 + 1.079 / m)
+        empty = m - stats["filled"]
+        raw = alpha * m * m / (stats["harmonic"] + empty)
+        # Linear counting is more accurate while many registers are still empty.
+        linear = m * np.log(m / empty.where(empty > 0))
+        estimate = raw.where((raw > 2.5 * m) | (empty == 0), linear).rename("distinct_count")
+        return estimate.reset_index(drop=True) if not by else estimate
+
+    def to_frame(self) -> pd.DataFrame:
+        """
+        Flat (keys..., register, rank) table, e.g. for writing to Parquet.
+        """
+        if self.registers is None:
+            return pd.DataFrame(columns=self.keys + [REGISTER_LEVEL, "rank"])
+        return self.registers.rename("rank").reset_index()
+
+    @classmethod
+    def from_frame(cls, frame: pd.DataFrame, value_col: str = BIKE_ID_COL, precision: int = HLL_PRECISION
+                   ) -> "DistinctCountSketch":
+        """
+        Rebuilds a sketch from to_frame() output; the precision must match the one it was built with.
+        """
+        keys = [col for col in frame.columns if col not in (REGISTER_LEVEL, "rank")]
+        sketch = cls(keys, value_col, precision)
+        if not frame.empty:
+            sketch._add(frame.set_index(keys + [REGISTER_LEVEL])["rank"].astype("uint8"))
+        return sketch
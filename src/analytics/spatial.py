@@ -0,0 +1,173 @@
+import json
+from typing import Iterable, Union
+
+import numpy as np
+import pandas as pd
+
+from src.config import (
+    START_STATION_ID_COL, STATION_INFO_FILE_PATH, STATION_GRID_CELL_M, EARTH_RADIUS_M
+)
+
+STATION_COLUMNS = ["station_id", "name", "lat", "lon"]
+ArrayLike = Union[float, Iterable[float], np.ndarray]
+
+
+def load_station_coordinates(path: str = STATION_INFO_FILE_PATH) -> pd.DataFrame:
+    """
+    Reads station coordinates from a GBFS station_information.json or a CSV with station_id, name, lat, lon.
+    """
+    if path.lower().endswith(".json"):
+        with open(path) as fh:
+            stations = pd.DataFrame(json.load(fh)["data"]["stations"])
+    else:
+        stations = pd.read_csv(path)
+
+    missing = [col for col in STATION_COLUMNS if col not in stations.columns]
+    if missing:
+        raise KeyError(f"Station file must contain {missing} columns.")
+
+    stations = stations[STATION_COLUMNS].dropna(subset=["station_id", "lat", "lon"])
+    stations["station_id"] = pd.to_numeric(stations["station_id"], errors="coerce")
+    return stations.dropna(subset=["station_id"]).astype({"station_id": "int64"}).reset_index(drop=True)
+
+
+class StationIndex:
+    """
+    Uniform-grid spatial index over station coordinates, built once.
+
+    Coordinates are projected to local metres (equirectangular around the
+    network's mean latitude, accurate to well under 1% across a city), then
+    bucketed into square cells. Radius queries only measure distances to
+    stations in the cells that can intersect the circle; all queries in a
+    batch are answered together with array operations.
+    """
+
+    def __init__(self, stations: pd.DataFrame, cell_size_m: float = STATION_GRID_CELL_M):
+        if stations.empty:
+            raise ValueError("Cannot build a spatial index over an empty station table.")
+
+        self.cell_size_m = float(cell_size_m)
+        self._lat0 = float(np.radians(stations["lat"].mean()))
+        self._lon0 = float(np.radians(stations["lon"].mean()))
+
+        x, y = self.project(stations["lat"].to_numpy(), stations["lon"].to_numpy())
+        keys = self._cell_keys(*self._cells(x, y))
+
+        # Stations sorted by cell; each occupied cell maps to a contiguous [start, end) slice.
+        order = np.argsort(keys, kind="stable")
+        self.station_ids = stations["station_id"].to_numpy()[order]
+        self.names = stations["name"].to_numpy()[order]
+        self._x, self._y = x[order], y[order]
+        self._lat = stations["lat"].to_numpy()[order]
+        self._lon = stations["lon"].to_numpy()[order]
+        self._cell_keys_sorted, self._cell_starts, self._cell_counts = np.unique(
+            keys[order], return_index=True, return_counts=True
+        )
+
+    def project(self, lat: ArrayLike, lon: ArrayLike):
+        lat_rad = np.radians(np.asarray(lat, dtype="float64"))
+        lon_rad = np.radians(np.asarray(lon, dtype="float64"))
+        x = EARTH_RADIUS_M * (lon_rad - self._lon0) * np.cos(self._lat0)
+        y = EARTH_RADIUS_M * (lat_rad - self._lat0)
+        return np.atleast_1d(x), np.atleast_1d(y)
+
+    def _cells(self, x: np.ndarray, y: np.ndarray):
+        return np.floor(x / self.cell_size_m).astype(np.int64), np.floor(y / self.cell_size_m).astype(np.int64)
+
+    @staticmethod
+    def _cell_keys(cx: np.ndarray, cy: np.ndarray) -> np.ndarray:
+        return cx * (1 << 32) + cy
+
+    def query_radius(self, lat: ArrayLike, lon: ArrayLike, radius_m: float) -> pd.DataFrame:
+        """
+        All stations within radius_m of each query point.
+        Returns one row per (query, station) match: query, station_id, name, distance_m; sorted by query then distance.
+        """
+        qx, qy = self.project(lat, lon)
+        cx, cy = self._cells(qx, qy)
+
+        # Every cell overlapping the circle's bounding box, for every query: shape (Q, M).
+        reach = int(np.ceil(radius_m / self.cell_size_m))
+        dx, dy = np.meshgrid(np.arange(-reach, reach + 1), np.arange(-reach, reach + 1))
+        neighbour_keys = self._cell_keys(cx[:, None] + dx.ravel(), cy[:, None] + dy.ravel())
+
+        pos = np.searchsorted(self._cell_keys_sorted, neighbour_keys)
+        pos = np.minimum(pos, len(self._cell_keys_sorted) - 1)
+        found = self._cell_keys_sorted[pos] == neighbour_keys
+
+        query_of_cell = np.broadcast_to(np.arange(len(qx))[:, None], neighbour_keys.shape)[found]
+        starts = self._cell_starts[pos[found]]
+        counts = self._cell_counts[pos[found]]
+
+        # Expand each occupied cell into its station slots without a Python loop.
+        query_idx = np.repeat(query_of_cell, counts)
+        offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+        station_pos = np.repeat(starts, counts) + offsets
+
+        distance = np.hypot(self._x[station_pos] - qx[query_idx], self._y[station_pos] - qy[query_idx])
+        inside = distance <= radius_m
+
+        result = pd.DataFrame({
+            "query": query_idx[inside],
+            "station_id": self.station_ids[station_pos[inside]],
+            "name": self.names[station_pos[inside]],
+            "distance_m": distance[inside],
+        })
+        return result.sort_values(["query", "distance_m"], kind="stable").reset_index(drop=True)
+
+    def query_knn(self, lat: ArrayLike, lon: ArrayLike, k: int = 5, block_size: int = 2048) -> pd.DataFrame:
+        """
+        The k nearest stations to each query point.
+        Returns query, rank (0 = nearest), station_id, name, distance_m.
+
+        A station table is small (~1k rows), so each block of queries is
+        measured against every station at once and reduced with argpartition.
+        """
+        qx, qy = self.project(lat, lon)
+        k = min(k, len(self.station_ids))
+
+        frames = []
+        for first in range(0, len(qx), block_size):
+            bx, by = qx[first:first + block_size], qy[first:first + block_size]
+            distance = np.hypot(bx[:, None] - self._x[None, :], by[:, None] - self._y[None, :])
+
+            nearest = np.argpartition(distance, k - 1, axis=1)[:, :k]
+            nearest_dist = np.take_along_axis(distance, nearest, axis=1)
+            order = np.argsort(nearest_dist, axis=1)
+            nearest = np.take_along_axis(nearest, order, axis=1)
+            nearest_dist = np.take_along_axis(nearest_dist, order, axis=1)
+
+            frames.append(pd.DataFrame({
+                "query": np.repeat(np.arange(first, first + len(bx)), k),
+                "rank": np.tile(np.arange(k), len(bx)),
+                "station_id": self.station_ids[nearest.ravel()],
+                "name": self.names[nearest.ravel()],
+                "distance_m": nearest_dist.ravel(),
+            }))
+
+        if not frames:
+            return pd.DataFrame({
+                "query": np.zeros(0, dtype=np.int64), "rank": np.zeros(0, dtype=np.int64),
+                "station_id": self.station_ids[:0], "name": self.names[:0], "distance_m": np.zeros(0),
+            })
+        return pd.concat(frames, ignore_index=True)
+
+    def coordinates_of(self, name: str):
+        """(lat, lon) of the station with the given name."""
+        matches = np.flatnonzero(self.names == name)
+        if not len(matches):
+            raise KeyError(f"Unknown station: {name}")
+        return float(self._lat[matches[0]]), float(self._lon[matches[0]])
+
+    def station_ids_within(self, lat: float, lon: float, radius_m: float) -> np.ndarray:
+        """Station ids within radius_m of a single point, e.g. for filter_data_advanced(station_ids=...)."""
+        return self.query_radius(lat, lon, radius_m)["station_id"].to_numpy()
+
+
+def station_mask(df: pd.DataFrame, station_ids: Iterable, station_col: str = START_STATION_ID_COL) -> np.ndarray:
+    """
+    Boolean row mask for trips whose station (start by default) is one of station_ids.
+    """
+    if station_col not in df.columns:
+        raise KeyError(f"DataFrame must contain '{station_col}' column.")
+    return df[station_col].isin(np.asarray(list(station_ids))).to_numpy()
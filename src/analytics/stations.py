@@ -1,19 +1,25 @@
 import pandas as pd
 
 from src.config import START_STATION_COL
+from src.data_processor.utils import fill_unknown
 
-def get_top_starting_stations(df: pd.DataFrame, top_n: int = 10) -> pd.DataFrame:
+def get_top_starting_stations(df: pd.DataFrame, top_n: int = 10, station_col: str = START_STATION_COL) -> pd.DataFrame:
     """
     Return top N busiest starting stations.
+
+    station_col can be the integer start station code column, so counts follow
+    station ids rather than exported names; join the names back with
+    StationDimension.decode when rendering.
     """
-    df = df.copy()
+    if station_col not in df.columns:
+        raise KeyError(f"DataFrame must contain '{station_col}' column.")
 
-    # Handle missing names
-    df[START_STATION_COL] = df[START_STATION_COL].fillna("Unknown")
+    # Handle missing names (on the one column needed, not a copy of the whole frame)
+    stations = fill_unknown(df[station_col])
 
     # Group + count
     station_counts = (
-        df.groupby(START_STATION_COL)
+        stations.groupby(stations, observed=True)
           .size()
           .reset_index(name="trip_count")
           .sort_values("trip_count", ascending=False)
@@ -1,5 +1,6 @@
+import numpy as np
 import pandas as pd
-from src.config import START_TIME_COL
+from src.config import START_TIME_COL, DURATION_MIN_COL, DAY_ORDINAL_COL
 
 def calculate_daily_rides(df: pd.DataFrame) -> pd.DataFrame:
     """
@@ -11,17 +12,43 @@ def calculate_daily_rides(df: pd.DataFrame) -> pd.DataFrame:
     if START_TIME_COL not in df.columns:
         raise KeyError("start_time column is required in the DataFrame.")
 
-    df = df.copy()
-    df[START_TIME_COL] = pd.to_datetime(df[START_TIME_COL])
+    # With calendar features: one bincount over the int32 day ordinals.
+    if DAY_ORDINAL_COL in df.columns and len(df):
+        days = df[DAY_ORDINAL_COL].to_numpy()
+        first = int(days.min())
+        counts = np.bincount(days - first).astype("int64")
+        index = pd.date_range(pd.Timestamp(first, unit="D"), periods=len(counts), freq="D", name="Date")
+        return pd.DataFrame({"total_rides": counts}, index=index)
 
-    # Set datetime index for resampling
-    df = df.set_index(START_TIME_COL)
+    start_times = pd.to_datetime(df[START_TIME_COL])
 
-    # Count rides per day using resample
-    daily_counts = df.resample("D").size()
+    # Count rides per day: hash the day stamps instead of sorting the whole frame for resample,
+    # then fill the gaps so every calendar day in range appears (as resample would).
+    days = start_times.dt.floor("D")
+    if days.notna().any():
+        full_range = pd.date_range(days.min(), days.max(), freq="D")
+        daily_counts = days.value_counts(sort=False).reindex(full_range, fill_value=0).astype("int64")
+    else:
+        daily_counts = pd.Series(1, index=pd.DatetimeIndex(start_times)).resample("D").size()
 
     # Return DataFrame with the required structure
     result = daily_counts.to_frame(name="total_rides")
     result.index.name = "Date"  # AC 7: index consistency
 
     return result
+
+
+def calculate_kpis(df: pd.DataFrame) -> dict:
+    """
+    Headline KPIs shown on the dashboard cards: total rides, mean trip duration (min)
+    and the share of trips taken by annual members (%).
+    """
+    for col in (DURATION_MIN_COL, "rider_type"):
+        if col not in df.columns:
+            raise KeyError(f"DataFrame must contain '{col}' column.")
+
+    return {
+        "total_rides": int(len(df)),
+        "avg_duration": float(df[DURATION_MIN_COL].mean()),
+        "subscriber_rate": float((df["rider_type"] == "Annual member").mean() * 100),
+    }
@@ -0,0 +1,178 @@
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from src.config import (
+    START_TIME_COL, DURATION_MIN_COL, WEATHER_FILE_PATH, WEATHER_TIME_COL, TEMP_C_COL, PRECIP_MM_COL,
+    WEATHER_MAX_GAP_HOURS, WEATHER_TEMP_BINS, WEATHER_PRECIP_BINS, WEATHER_PRECIP_LABELS
+)
+
+WEATHER_COLUMNS = [TEMP_C_COL, PRECIP_MM_COL]
+
+# Accepted headers for each normalised column (Environment Canada's hourly export first).
+WEATHER_ALIASES: Dict[str, List[str]] = {
+    WEATHER_TIME_COL: ["Date/Time (LST)", "Date/Time", "time", "timestamp", WEATHER_TIME_COL],
+    TEMP_C_COL: ["Temp (°C)", "Temp (C)", "temperature", TEMP_C_COL],
+    PRECIP_MM_COL: ["Precip. Amount (mm)", "Precip (mm)", "precipitation", PRECIP_MM_COL],
+}
+BUCKETS = ("temperature", "precipitation")
+
+
+def load_weather(path: str = WEATHER_FILE_PATH) -> pd.DataFrame:
+    """
+    Reads an hourly weather CSV into weather_time, temp_c, precip_mm, sorted by time (one row per timestamp).
+    Only the three recognised columns are parsed; a missing precipitation column reads as dry.
+    """
+    header = pd.read_csv(path, nrows=0).columns
+    found = {}
+    for target, aliases in WEATHER_ALIASES.items():
+        source = next((col for col in aliases if col in header), None)
+        if source is not None:
+            found[source] = target
+    for required in (WEATHER_TIME_COL, TEMP_C_COL):
+        if required not in found.values():
+            raise KeyError(f"Weather file must contain one of {WEATHER_ALIASES[required]} columns.")
+
+    weather = pd.read_csv(path, usecols=list(found)).rename(columns=found)
+    weather[WEATHER_TIME_COL] = pd.to_datetime(weather[WEATHER_TIME_COL], errors="coerce")
+    for col in WEATHER_COLUMNS:
+        weather[col] = pd.to_numeric(weather[col], errors="coerce") if col in weather else 0.0
+
+    weather = weather.dropna(subset=[WEATHER_TIME_COL]).sort_values(WEATHER_TIME_COL, kind="stable")
+    weather = weather.drop_duplicates(WEATHER_TIME_COL, keep="last")
+    return weather[[WEATHER_TIME_COL] + WEATHER_COLUMNS].reset_index(drop=True)
+
+
+def _asof_positions(times: pd.Series, weather: pd.DataFrame, max_gap_hours: float) -> np.ndarray:
+    """
+    Row in weather of the latest observation at or before each time (-1 if none within max_gap_hours).
+
+    One binary search per trip against the (small, sorted) observation times: the
+    same result as merge_asof(direction="backward", tolerance=...) without sorting the trips.
+    """
+    obs = weather[WEATHER_TIME_COL].to_numpy("datetime64[ns]")
+    if len(obs) and (np.diff(obs) <= np.timedelta64(0)).any():
+        raise ValueError("Weather observations must be sorted by time with unique timestamps (see load_weather).")
+
+    values = times.to_numpy("datetime64[ns]")
+    positions = np.searchsorted(obs, values, side="right") - 1
+    matched = positions >= 0
+    gap = values - obs[np.maximum(positions, 0)] if len(obs) else np.zeros(len(values), "timedelta64[ns]")
+    positions[~matched | np.isnat(values) | (gap > np.timedelta64(int(max_gap_hours * 3600), "s"))] = -1
+    return positions
+
+
+def weather_at(times: pd.Series, weather: pd.DataFrame,
+               max_gap_hours: float = WEATHER_MAX_GAP_HOURS) -> pd.DataFrame:
+    """
+    The nearest-preceding observation for each timestamp, aligned to times.index (NaN where none applies).
+    """
+    positions = _asof_positions(times, weather, max_gap_hours)
+    found = positions >= 0
+    out = {}
+    for col in [WEATHER_TIME_COL] + WEATHER_COLUMNS:
+        values = weather[col].to_numpy()
+        column = values[np.maximum(positions, 0)] if len(values) else np.empty(len(positions), values.dtype)
+        out[col] = pd.Series(column, index=times.index).where(found)
+    return pd.DataFrame(out)
+
+
+def attach_weather(df: pd.DataFrame, weather: pd.DataFrame, columns: Optional[List[str]] = None,
+                   max_gap_hours: float = WEATHER_MAX_GAP_HOURS) -> pd.DataFrame:
+    """
+    Trips (only `columns`, if given) with the weather observation in effect at their start time.
+
+    Row order and index are kept; trips with no observation within max_gap_hours get NaN.
+    """
+    if START_TIME_COL not in df.columns:
+        raise KeyError(f"DataFrame must contain '{START_TIME_COL}' column.")
+
+    trips = df if columns is None else df[list(dict.fromkeys(columns))]
+    return pd.concat([trips, weather_at(df[START_TIME_COL], weather, max_gap_hours)], axis=1)
+
+
+def daily_weather(weather: pd.DataFrame) -> pd.DataFrame:
+    """
+    Calendar-day summary of hourly observations, indexed like calculate_daily_rides:
+    temp_mean, temp_min, temp_max, precip_total and the number of observed hours.
+    """
+    days = weather[WEATHER_TIME_COL].dt.floor("D").rename("Date")
+    daily = weather.groupby(days).agg(
+        temp_mean=(TEMP_C_COL, "mean"), temp_min=(TEMP_C_COL, "min"), temp_max=(TEMP_C_COL, "max"),
+        precip_total=(PRECIP_MM_COL, "sum"), hours=(WEATHER_TIME_COL, "size"),
+    )
+    return daily
+
+
+def join_daily_weather(daily_rides: pd.DataFrame, weather: pd.DataFrame) -> pd.DataFrame:
+    """
+    calculate_daily_rides output with each day's weather summary alongside (NaN for days without observations).
+    """
+    return daily_rides.join(daily_weather(weather), how="left")
+
+
+def weather_buckets(weather: pd.DataFrame, by: str = "temperature") -> pd.Categorical:
+    """Temperature or precipitation bucket of every observation (left-closed bins from config)."""
+    if by not in BUCKETS:
+        raise ValueError(f"by must be one of {list(BUCKETS)}.")
+    if by == "temperature":
+        labels = [_temperature_label(lo, hi) for lo, hi in zip(WEATHER_TEMP_BINS[:-1], WEATHER_TEMP_BINS[1:])]
+        return pd.cut(weather[TEMP_C_COL], WEATHER_TEMP_BINS, right=False, labels=labels).array
+    return pd.cut(weather[PRECIP_MM_COL].fillna(0.0), WEATHER_PRECIP_BINS, right=False,
+                  labels=WEATHER_PRECIP_LABELS).array
+
+
+def _temperature_label(lo: float, hi: float) -> str:
+    if np.isinf(lo):
+        return f"< {hi:g} °C"
+    if np.isinf(hi):
+        return f"≥ {lo:g} °C"
+    return f"{lo:g} to {hi:g} °C"
+
+
+def kpis_by_weather(df: pd.DataFrame, weather: pd.DataFrame, by: str = "temperature",
+                    max_gap_hours: float = WEATHER_MAX_GAP_HOURS) -> pd.DataFrame:
+    """
+    calculate_kpis per weather bucket, plus exposure: how many observed hours fell in the bucket
+    over the trips' time span, and rides per such hour (common conditions don't dominate).
+
+    Observations are bucketed once; each trip only carries the row number of its
+    observation, so the work touches the start time, duration and rider type columns and nothing else.
+    Trips without an observation within max_gap_hours are left out.
+    """
+    for col in (START_TIME_COL, DURATION_MIN_COL):
+        if col not in df.columns:
+            raise KeyError(f"DataFrame must contain '{col}' column.")
+
+    buckets = weather_buckets(weather, by)
+    n_buckets = len(buckets.categories)
+    codes = np.asarray(buckets.codes, dtype="int64")  # -1 where the observation is missing a value
+
+    positions = _asof_positions(df[START_TIME_COL], weather, max_gap_hours)
+    trip_codes = np.where(positions >= 0, codes[np.maximum(positions, 0)] if len(codes) else -1, -1)
+    keep = trip_codes >= 0
+    trip_codes = trip_codes[keep]
+
+    durations = df[DURATION_MIN_COL].to_numpy("float64")[keep]
+    valid = ~np.isnan(durations)
+    rides = np.bincount(trip_codes, minlength=n_buckets)
+    duration_sum = np.bincount(trip_codes[valid], weights=durations[valid], minlength=n_buckets)
+    duration_n = np.bincount(trip_codes[valid], minlength=n_buckets)
+
+    result = pd.DataFrame({"total_rides": rides}, index=pd.Index(buckets.categories, name=by))
+    result["avg_duration"] = np.where(duration_n > 0, duration_sum / np.maximum(duration_n, 1), np.nan)
+    if "rider_type" in df.columns:
+        members = (df["rider_type"].to_numpy() == "Annual member")[keep]
+        result["subscriber_rate"] = np.where(
+            rides > 0, np.bincount(trip_codes, weights=members, minlength=n_buckets) / np.maximum(rides, 1) * 100,
+            np.nan
+        )
+
+    # Exposure: observations in the trips' time span, by bucket.
+    starts = df[START_TIME_COL]
+    in_span = (weather[WEATHER_TIME_COL] >= starts.min().floor("h")) & (weather[WEATHER_TIME_COL] <= starts.max())
+    span_codes = codes[in_span.to_numpy() & (codes >= 0)]
+    result["hours"] = np.bincount(span_codes, minlength=n_buckets)
+    result["rides_per_hour"] = np.where(result["hours"] > 0, rides / np.maximum(result["hours"], 1), np.nan)
+    return result
@@ -0,0 +1,98 @@
+# src/api/load_test.py
+"""
+Closed-loop load generator for the analytics API.
+
+Usage:
+    python -m src.api.load_test --url http://127.0.0.1:8765 --concurrency 16 --requests 2000
+"""
+import argparse
+import asyncio
+import random
+import time
+from typing import List, Optional
+from urllib.parse import urlsplit
+
+import numpy as np
+
+DEFAULT_PATHS = [
+    "/kpis",
+    "/top-stations?top_n=10",
+    "/top-stations?top_n=20",
+    "/daily-rides",
+    "/daily-rides?rider_type=Casual",
+    "/trips?page=1&page_size=50",
+    "/trips?page=2&page_size=50&min_duration=5&max_duration=30",
+]
+
+
+async def _worker(host: str, port: int, paths: List[str], n_requests: int, latencies: List[float],
+                  errors: List[int], rng: random.Random) -> None:
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        for _ in range(n_requests):
+            path = rng.choice(paths)
+            started = time.perf_counter()
+            writer.write(f"GET {path} HTTP/1.1\r\nHost: {host}\r\n\r\n".encode())
+            await writer.drain()
+
+            status_line = await reader.readline()
+            length = 0
+            while True:
+                line = await reader.readline()
+                if line in (b"\r\n", b""):
+                    break
+                name, _, value = line.decode().partition(":")
+                if name.lower() == "content-length":
+                    length = int(value)
+            await reader.readexactly(length)
+            latencies.append(time.perf_counter() - started)
+
+            if b" 200 " not in status_line:
+                errors.append(1)
+    finally:
+        writer.close()
+
+
+async def run_load_test(base_url: str, concurrency: int = 16, total_requests: int = 2000,
+                        paths: Optional[List[str]] = None, seed: int = 0) -> dict:
+    """
+    Replays `total_requests` GETs over `concurrency` keep-alive connections and reports latency percentiles.
+    """
+    parts = urlsplit(base_url)
+    paths = paths or DEFAULT_PATHS
+    latencies: List[float] = []
+    errors: List[int] = []
+
+    per_worker = [total_requests // concurrency + (i < total_requests % concurrency) for i in range(concurrency)]
+    started = time.perf_counter()
+    await asyncio.gather(*(
+        _worker(parts.hostname, parts.port, paths, n, latencies, errors, random.Random(seed + i))
+        for i, n in enumerate(per_worker) if n
+    ))
+    elapsed = time.perf_counter() - started
+
+    latency_ms = np.array(latencies) * 1000
+    return {
+        "requests": len(latencies),
+        "errors": len(errors),
+        "p50_ms": float(np.percentile(latency_ms, 50)),
+        "p99_ms": float(np.percentile(latency_ms, 99)),
+        "requests_per_sec": len(latencies) / elapsed,
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Load-test the analytics API.")
+    parser.add_argument("--url", default="http://127.0.0.1:8765")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--requests", type=int, default=2000)
+    args = parser.parse_args(argv)
+
+    result = asyncio.run(run_load_test(args.url, args.concurrency, args.requests))
+    print(f"{result['requests']} requests ({result['errors']} errors): "
+          f"p50 {result['p50_ms']:.2f} ms, p99 {result['p99_ms']:.2f} ms, "
+          f"{result['requests_per_sec']:.0f} req/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,277 @@
+# src/api/server.py
+"""
+Local JSON API over the dashboard analytics.
+
+Usage:
+    python -m src.api.server --source data/bike_share_data.csv --port 8765
+
+Endpoints (GET):
+    /kpis
+    /top-stations?top_n=10
+    /daily-rides?rider_type=Casual
+    /trips?start_date=2024-08-01&end_date=2024-08-31&start_time=00:00&end_time=23:59
+           &min_duration=0&max_duration=60&page=1&page_size=100
+"""
+import argparse
+import asyncio
+import json
+import threading
+from collections import OrderedDict
+from datetime import date, time
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlsplit
+
+import pandas as pd
+
+from src.analytics.single_flight import ComputationRegistry
+from src.analytics.stations import get_top_starting_stations
+from src.analytics.usage_patterns import calculate_daily_rides, calculate_kpis
+from src.config import (
+    URL, START_TIME_COL,
+    API_HOST, API_PORT, API_CACHE_SIZE, API_WORKERS, API_MAX_PAGE_SIZE
+)
+from src.data_processor.rider_categorization import filter_by_rider_type
+from src.data_processor.utils import filter_data_advanced
+
+REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed", 500: "Internal Server Error"}
+
+
+class LRUCache:
+    """
+    Thread-safe least-recently-used cache of serialised responses.
+    """
+
+    def __init__(self, capacity: int = API_CACHE_SIZE):
+        self.capacity = capacity
+        self._items: "OrderedDict[tuple, bytes]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: tuple) -> Optional[bytes]:
+        with self._lock:
+            if key not in self._items:
+                self.misses += 1
+                return None
+            self._items.move_to_end(key)
+            self.hits += 1
+            return self._items[key]
+
+    def put(self, key: tuple, value: bytes) -> None:
+        with self._lock:
+            self._items[key] = value
+            self._items.move_to_end(key)
+            while len(self._items) > self.capacity:
+                self._items.popitem(last=False)
+
+
+def _int_param(params: dict, name: str, default: int, low: int, high: int) -> int:
+    value = int(params.get(name, default))
+    if not low <= value <= high:
+        raise ValueError(f"'{name}' must be between {low} and {high}.")
+    return value
+
+
+def _records(df: pd.DataFrame) -> List[dict]:
+    # to_json handles timestamps and NaN consistently; round-trip it into plain Python objects.
+    return json.loads(df.to_json(orient="records", date_format="iso"))
+
+
+class AnalyticsService:
+    """
+    Normalises query parameters and runs the analytics functions over a loaded trip frame.
+    """
+
+    def __init__(self, df: pd.DataFrame):
+        self.df = df
+        self._min_date = df[START_TIME_COL].min().date() if len(df) else date.today()
+        self._max_date = df[START_TIME_COL].max().date() if len(df) else date.today()
+        self.routes: Dict[str, Tuple[Callable[[dict], dict], Callable[[dict], object]]] = {
+            "/kpis": (self._no_params, self.kpis),
+            "/top-stations": (self._top_stations_params, self.top_stations),
+            "/daily-rides": (self._daily_rides_params, self.daily_rides),
+            "/trips": (self._trips_params, self.trips),
+        }
+
+    # --- Parameter normalisation (also forms the cache key) ---
+    @staticmethod
+    def _no_params(params: dict) -> dict:
+        return {}
+
+    @staticmethod
+    def _top_stations_params(params: dict) -> dict:
+        return {"top_n": _int_param(params, "top_n", 10, 1, 1000)}
+
+    @staticmethod
+    def _daily_rides_params(params: dict) -> dict:
+        rider_type = params.get("rider_type", "All").strip()
+        return {"rider_type": "All" if rider_type.lower() == "all" else rider_type.lower()}
+
+    def _trips_params(self, params: dict) -> dict:
+        return {
+            "start_date": date.fromisoformat(params.get("start_date", self._min_date.isoformat())),
+            "end_date": date.fromisoformat(params.get("end_date", self._max_date.isoformat())),
+            "start_time": time.fromisoformat(params.get("start_time", "00:00")),
+            "end_time": time.fromisoformat(params.get("end_time", "23:59:59")),
+            "min_duration": float(params.get("min_duration", 0)),
+            "max_duration": float(params.get("max_duration", float("inf"))),
+            "page": _int_param(params, "page", 1, 1, 10 ** 9),
+            "page_size": _int_param(params, "page_size", 100, 1, API_MAX_PAGE_SIZE),
+        }
+
+    # --- Endpoint bodies (run on the worker pool) ---
+    def kpis(self, params: dict) -> dict:
+        return calculate_kpis(self.df)
+
+    def top_stations(self, params: dict) -> list:
+        return _records(get_top_starting_stations(self.df, params["top_n"]))
+
+    def daily_rides(self, params: dict) -> list:
+        df = self.df
+        if params["rider_type"] != "All":
+            df = filter_by_rider_type(df, params["rider_type"])
+        daily = calculate_daily_rides(df).reset_index()
+        daily["Date"] = daily["Date"].dt.strftime("%Y-%m-%d")
+        return _records(daily)
+
+    def trips(self, params: dict) -> dict:
+        filtered = filter_data_advanced(
+            df=self.df,
+            start_time_range=(params["start_time"], params["end_time"]),
+            min_duration=params["min_duration"],
+            max_duration=params["max_duration"],
+            start_date=params["start_date"],
+            end_date=params["end_date"],
+        )
+        first = (params["page"] - 1) * params["page_size"]
+        page = filtered.iloc[first:first + params["page_size"]]
+        return {
+            "total": int(len(filtered)),
+            "page": params["page"],
+            "page_size": params["page_size"],
+            "rows": _records(page),
+        }
+
+
+class AnalyticsAPI:
+    """
+    Minimal HTTP/1.1 server on an asyncio event loop.
+
+    Requests are parsed on the loop; the pandas work runs on a bounded thread
+    pool so slow queries do not block other connections. Responses are cached
+    per (path, normalised parameters), and identical requests that miss the
+    cache at the same time share one computation.
+    """
+
+    def __init__(self, service: AnalyticsService, max_workers: int = API_WORKERS,
+                 cache_size: int = API_CACHE_SIZE):
+        self.service = service
+        self.cache = LRUCache(cache_size)
+        self.registry = ComputationRegistry(max_workers)
+        self.server: Optional[asyncio.base_events.Server] = None
+
+    async def start(self, host: str = API_HOST, port: int = API_PORT) -> int:
+        """Starts listening and returns the bound port (useful with port=0)."""
+        self.server = await asyncio.start_server(self._handle_connection, host, port)
+        return self.server.sockets[0].getsockname()[1]
+
+    async def close(self) -> None:
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+        self.registry.shutdown(wait=False)
+
+    async def respond(self, method: str, target: str) -> Tuple[int, bytes]:
+        if method != "GET":
+            return 405, json.dumps({"error": "Only GET is supported."}).encode()
+
+        parts = urlsplit(target)
+        route = self.service.routes.get(parts.path.rstrip("/") or "/")
+        if route is None:
+            return 404, json.dumps({"error": f"Unknown endpoint: {parts.path}"}).encode()
+
+        normalise, handler = route
+        try:
+            params = normalise(dict(parse_qsl(parts.query)))
+        except ValueError as error:
+            return 400, json.dumps({"error": str(error)}).encode()
+
+        key = (parts.path.rstrip("/"), tuple(sorted((k, str(v)) for k, v in params.items())))
+        body = self.cache.get(key)
+        if body is not None:
+            return 200, body
+
+        try:
+            payload = await asyncio.wrap_future(self.registry.submit(key, handler, params))
+        except (ValueError, KeyError) as error:
+            return 400, json.dumps({"error": str(error)}).encode()
+
+        body = json.dumps(payload).encode()
+        self.cache.put(key, body)
+        return 200, body
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                try:
+                    method, target, version = request_line.decode("latin-1").split()
+                except ValueError:
+                    break
+
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+
+                try:
+                    status, body = await self.respond(method, target)
+                except Exception as error:  # Never let one bad request kill the connection loop.
+                    status, body = 500, json.dumps({"error": str(error)}).encode()
+
+                keep_alive = version == "HTTP/1.1" and headers.get("connection", "").lower() != "close"
+                writer.write(
+                    f"HTTP/1.1 {status} {REASONS.get(status, '')}\r\n"
+                    f"Content-Type: application/json\r\n"
+                    f"Content-Length: {len(body)}\r\n"
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode("latin-1") + body
+                )
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    from src.data_processor.background_loader import run_feature_pipeline
+    from src.data_processor.loading_cleaning import prepare_data
+
+    parser = argparse.ArgumentParser(description="Serve the dashboard analytics as a JSON API.")
+    parser.add_argument("--source", default=URL, help="CSV path or URL of the ridership data.")
+    parser.add_argument("--host", default=API_HOST)
+    parser.add_argument("--port", type=int, default=API_PORT)
+    parser.add_argument("--workers", type=int, default=API_WORKERS, help="Threads for the pandas work.")
+    args = parser.parse_args(argv)
+
+    df, _ = run_feature_pipeline(prepare_data(args.source))
+    api = AnalyticsAPI(AnalyticsService(df), max_workers=args.workers)
+
+    async def serve():
+        port = await api.start(args.host, args.port)
+        print(f"Serving {len(df):,} trips on http://{args.host}:{port}")
+        async with api.server:
+            await api.server.serve_forever()
+
+    asyncio.run(serve())
+
+
+if __name__ == "__main__":
+    main()
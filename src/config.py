@@ -5,6 +5,14 @@ from datetime import time
 # --- FILE PATHS ---
 PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 DATA_FILE_PATH = os.path.join(PROJECT_ROOT, 'data', 'bike_share_data.csv')
+REPORTS_DIR = os.path.join(PROJECT_ROOT, 'reports')
+DOWNLOAD_CACHE_DIR = os.path.join(PROJECT_ROOT, 'data', 'cache')
+STATION_INFO_FILE_PATH = os.path.join(PROJECT_ROOT, 'data', 'station_information.json')  # GBFS export
+STATION_DIM_FILE_PATH = os.path.join(PROJECT_ROOT, 'data', 'station_dimension.parquet')  # Station ids, names, codes
+TRIP_DATASET_DIR = os.path.join(PROJECT_ROOT, 'data', 'trips')  # year=/month= partitioned Parquet store
+SPILL_DIR = os.path.join(PROJECT_ROOT, 'data', 'spill')  # Cold columns spilled under memory pressure (per run)
+WEATHER_FILE_PATH = os.path.join(PROJECT_ROOT, 'data', 'weather_hourly.csv')  # Hourly observations (Environment Canada export)
+HANDOFF_DIR = os.path.join(PROJECT_ROOT, 'data', 'handoff')  # Processed trips + result tables as Arrow IPC files
 URL = "https://github.com/NelsonMontoya/Toronto-Bike-Analytics-Tool/releases/download/v1.0/Bike.share.ridership.2024-08.csv"
 
 # --- DATA SCHEMA (Column Names) ---
@@ -25,6 +33,15 @@ MODEL_COL = 'Model'
 DURATION_MIN_COL = 'trip_duration_min'
 IS_RUSH_HOUR_COL = 'is_rush_hour'
 DISTANCE_KM_COL = 'distance_km'
+START_STATION_CODE_COL = 'start_station_code'  # Stable integer codes from the station dimension
+END_STATION_CODE_COL = 'end_station_code'
+# Compact calendar parts of the start time, computed once at load (see add_calendar_features)
+HOUR_COL = 'start_hour'                  # int8, 0-23
+DOW_COL = 'start_dow'                    # int8, Monday = 0
+MINUTE_OF_DAY_COL = 'start_minute'       # int16, 0-1439 (seconds floored)
+DAY_ORDINAL_COL = 'start_day'            # int32, days since 1970-01-01
+IS_HOLIDAY_COL = 'is_holiday'            # bool, Ontario public holiday (or its observed substitute)
+CALENDAR_COLS = [HOUR_COL, DOW_COL, MINUTE_OF_DAY_COL, DAY_ORDINAL_COL, IS_HOLIDAY_COL]
 
 # --- RUSH HOUR CONSTANTS (Used in US-3 and US-13) ---
 AM_RUSH_START = time(7, 0, 0)   # 7:00 AM
@@ -35,3 +52,88 @@ PM_RUSH_END = time(17, 59, 59)    # 6:00 PM
 # --- DATA CLEANING CONSTANTS ---
 DATETIME_COLS = [START_TIME_COL, END_TIME_COL]
 
+
+# --- DATA QUALITY CONSTANTS (Validation stage) ---
+DURATION_TOLERANCE_SEC = 60           # Allowed gap between reported and computed duration
+MAX_TRIP_DURATION_SEC = 24 * 60 * 60  # Trips longer than a day are treated as outliers
+MIN_STATION_ID = 1
+MAX_STATION_ID = 99999
+QUALITY_FLAGS_COL = 'quality_flags'
+
+# --- PROGRESSIVE LOADING ---
+LOAD_CHUNK_ROWS = 250_000             # Rows parsed per chunk by the background loader
+LOADER_REFRESH_SEC = 0.5              # Dashboard refresh interval while chunks are still arriving
+
+# --- APPROXIMATE QUERY MODE ---
+SAMPLE_WEIGHT_COL = 'sample_weight'
+APPROX_SAMPLE_ROWS = 50_000           # Target sample size; independent of the dataset size
+APPROX_MIN_PER_STRATUM = 2            # Minimum trips kept per (date, rider_type) stratum
+APPROX_Z = 1.96                       # 95% confidence intervals
+
+# --- DOWNLOAD CACHE ---
+DOWNLOAD_CHUNK_BYTES = 1 << 20        # Stream remote files to disk 1 MiB at a time
+DOWNLOAD_RETRIES = 3
+DOWNLOAD_TIMEOUT_SEC = 30
+
+# --- ANALYTICS HTTP API ---
+API_HOST = '127.0.0.1'
+API_PORT = 8765
+API_WORKERS = 4                       # Threads running the pandas work behind the event loop
+API_CACHE_SIZE = 256                  # Cached responses (LRU)
+API_MAX_PAGE_SIZE = 1000
+
+# --- STATION SPATIAL INDEX ---
+STATION_GRID_CELL_M = 250             # Grid cell edge in metres
+EARTH_RADIUS_M = 6_371_008.8
+
+# --- SKETCHES (PERCENTILES, DISTINCT COUNTS) ---
+QUANTILE_SKETCH_ACCURACY = 0.01       # Relative error bound of sketched duration percentiles
+HLL_PRECISION = 12                    # 4096 registers per group: ~1.6% standard error on distinct counts
+
+# --- STATION ANOMALY DETECTION ---
+ANOMALY_WINDOW_PERIODS = 4            # Baseline from the same hour-of-week (or weekday) over the previous 4 weeks
+ANOMALY_THRESHOLD = 4.0               # |robust z-score| at which a bucket is flagged
+ANOMALY_BLOCK_BUCKETS = 1024          # Time buckets scored per vectorized block (bounds temporary memory)
+
+# --- CONCURRENT VIEW COMPUTATION ---
+VIEW_WORKERS = 4                      # Threads computing the tabs' views in parallel on a full rerun
+
+# --- PARTITIONED PARQUET STORE ---
+PARQUET_ROW_GROUP_ROWS = 65_536       # Rows per row group; each group's min/max start time allows skipping it
+PARTITION_MANIFEST = '_manifest.parquet'  # Per-file row counts and start-time ranges at the dataset root
+
+# --- SINGLE-FLIGHT COMPUTATIONS ---
+HEAVY_JOB_WORKERS = 2                 # Heavy computations running at once across all sessions
+
+# --- STATION CLUSTERING ---
+CLUSTER_COUNT = 4                     # Behaviour groups (e.g. commuter origin/destination, leisure, mixed)
+CLUSTER_RESTARTS = 10                 # k-means runs from different seeds; the lowest inertia wins
+CLUSTER_MAX_ITER = 100
+CLUSTER_MIN_TRIPS = 50                # Stations with fewer departures + arrivals are left out (noisy profiles)
+KMEANS_BATCH_ROWS = 4096              # Rows per block in the distance computation (bounds temporary memory)
+
+# --- WEATHER JOIN ---
+WEATHER_TIME_COL = 'weather_time'
+TEMP_C_COL = 'temp_c'
+PRECIP_MM_COL = 'precip_mm'
+WEATHER_MAX_GAP_HOURS = 3             # Observations older than this are not attached to a trip
+WEATHER_TEMP_BINS = [float('-inf'), 0, 10, 20, 30, float('inf')]  # °C, left-closed buckets
+WEATHER_PRECIP_BINS = [0, 0.2, 2.5, float('inf')]                 # mm/h: dry, light, heavy
+WEATHER_PRECIP_LABELS = ['Dry', 'Light rain', 'Heavy rain']
+
+# --- MEMORY BUDGET ---
+MEMORY_BUDGET_MB = 6144               # Process budget on the 8 GB dashboard host
+MEMORY_HIGH_WATER = 0.8               # Past this share of the budget: spill cold columns, then map hot ones
+COLD_COLUMNS = [TRIP_ID_COL, END_STATION_ID_COL, BIKE_ID_COL, MODEL_COL, DISTANCE_KM_COL, QUALITY_FLAGS_COL]  # No view reads them
+SPILL_RESTORE_ROWS = 1000             # Rows of the data table that get their spilled columns read back
+
+# --- ARROW HANDOFF ---
+HANDOFF_TRIPS = 'trips'               # File stem of the processed trip frame in a handoff directory
+HANDOFF_DICTIONARY_COLUMNS = [START_STATION_COL, END_STATION_COL, USER_TYPE_COL, MODEL_COL, 'rider_type']  # Stored dictionary-encoded
+
+# --- STATION DEMAND FORECAST ---
+FORECAST_BACKTEST_DAYS = 14           # Final days scored with one-day-ahead forecasts (the profile is fit before them)
+FORECAST_LEVEL_ALPHA = 0.2            # EWMA weight of each new day in the deseasonalised daily level
+FORECAST_TREND_BETA = 0.05            # EWMA weight of each new day-to-day level change in the trend
+FORECAST_TREND_DAMPING = 0.9          # Share of the trend carried into the next day (damped trend)
+FORECAST_PROFILE_PRIOR_TRIPS = 200    # Trips at which a station's own hour-of-week shape and the network's weigh equally
@@ -0,0 +1,145 @@
+# src/data_processor/arrow_handoff.py
+"""
+Arrow IPC (Feather v2) handoff of the processed trips and the analytics result tables.
+
+Files are written uncompressed, so a reader memory-maps them and gets
+Arrow columns that point straight into the page cache: opening costs a
+file map, not a CSV re-parse and re-run of the cleaning pipeline. Low-
+cardinality text columns (station names, user type, model, rider type)
+are stored dictionary-encoded and come back as pandas categoricals;
+timestamps keep their type and unit.
+
+A handoff directory holds trips.arrow plus one <name>.arrow per result table.
+
+Usage:
+    python -m src.data_processor.arrow_handoff --source data/bike_share_data.csv --output data/handoff
+"""
+import argparse
+import os
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import pandas as pd
+import pyarrow as pa
+
+from src.config import URL, HANDOFF_DIR, HANDOFF_TRIPS, HANDOFF_DICTIONARY_COLUMNS
+
+HANDOFF_VERSION = 1  # Bump when the layout of the files changes
+EXTENSION = ".arrow"
+_VERSION_KEY = b"handoff_version"
+
+
+def _dictionary_encode(df: pd.DataFrame, dictionary_columns: Sequence[str]) -> pd.DataFrame:
+    """Text columns among dictionary_columns as categoricals (other columns are not copied)."""
+    encode = {col: df[col].astype("category") for col in dictionary_columns
+              if col in df.columns and not isinstance(df[col].dtype, pd.CategoricalDtype)
+              and (pd.api.types.is_object_dtype(df[col]) or pd.api.types.is_string_dtype(df[col]))}
+    return df.assign(**encode) if encode else df
+
+
+def write_arrow(df: pd.DataFrame, path: str,
+                dictionary_columns: Sequence[str] = tuple(HANDOFF_DICTIONARY_COLUMNS)) -> int:
+    """
+    Writes df to an uncompressed Arrow IPC file and returns its size in bytes.
+
+    The file is written next to path and renamed into place, so readers that
+    still map the previous version keep a consistent view.
+    """
+    table = pa.Table.from_pandas(_dictionary_encode(df, dictionary_columns))
+    table = table.replace_schema_metadata({**(table.schema.metadata or {}),
+                                           _VERSION_KEY: str(HANDOFF_VERSION).encode()})
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    partial = f"{path}.partial"
+    with pa.OSFile(partial, "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+        writer.write_table(table)
+    os.replace(partial, path)
+    return os.path.getsize(path)
+
+
+def open_arrow(path: str, columns: Optional[Sequence[str]] = None) -> pa.Table:
+    """
+    Memory-maps an Arrow IPC file; the returned columns reference the mapped
+    pages (no copy, nothing read until touched). The pandas index columns are
+    kept with a column subset.
+    """
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"No Arrow handoff file at '{path}'.")
+    table = pa.ipc.open_file(pa.memory_map(path, "r")).read_all()
+    version = (table.schema.metadata or {}).get(_VERSION_KEY)
+    if version != str(HANDOFF_VERSION).encode():
+        raise ValueError(f"'{path}' was written by handoff version {version!r}, expected {HANDOFF_VERSION}.")
+    if columns is None:
+        return table
+
+    for col in columns:
+        if col not in table.column_names:
+            raise KeyError(f"DataFrame must contain '{col}' column.")
+    index_columns = [col for col in (table.schema.pandas_metadata or {}).get("index_columns", [])
+                     if isinstance(col, str) and col not in columns]
+    return table.select(list(columns) + index_columns)
+
+
+def read_arrow(path: str, columns: Optional[Sequence[str]] = None) -> pd.DataFrame:
+    """
+    A memory-mapped file as a DataFrame. Numeric and timestamp columns without
+    nulls are views of the mapped pages; categoricals keep their categories.
+    """
+    return open_arrow(path, columns).to_pandas(split_blocks=True)
+
+
+def standard_tables(df: pd.DataFrame, top_n: int = 10) -> Dict[str, pd.DataFrame]:
+    """The dashboard's headline result tables: daily rides, top start stations and the KPIs (one row)."""
+    from src.analytics.stations import get_top_starting_stations
+    from src.analytics.usage_patterns import calculate_daily_rides, calculate_kpis
+
+    return {
+        "daily_rides": calculate_daily_rides(df),
+        "top_stations": get_top_starting_stations(df, top_n),
+        "kpis": pd.DataFrame([calculate_kpis(df)]),
+    }
+
+
+def export_handoff(df: pd.DataFrame, tables: Optional[Dict[str, pd.DataFrame]] = None,
+                   directory: str = HANDOFF_DIR) -> List[str]:
+    """Writes the processed trips and each result table to the directory; returns the written paths."""
+    tables = tables or {}
+    if HANDOFF_TRIPS in tables:
+        raise ValueError(f"'{HANDOFF_TRIPS}' is reserved for the trip frame.")
+
+    paths = []
+    for name, frame in [(HANDOFF_TRIPS, df)] + list(tables.items()):
+        path = os.path.join(directory, name + EXTENSION)
+        write_arrow(frame, path)
+        paths.append(path)
+    return paths
+
+
+def load_handoff(directory: str = HANDOFF_DIR,
+                 columns: Optional[Sequence[str]] = None) -> Tuple[pd.DataFrame, Dict[str, pd.DataFrame]]:
+    """The trips (optionally only some columns) and the result tables by name, all memory-mapped."""
+    trips = read_arrow(os.path.join(directory, HANDOFF_TRIPS + EXTENSION), columns)
+    tables = {
+        name[:-len(EXTENSION)]: read_arrow(os.path.join(directory, name))
+        for name in sorted(os.listdir(directory))
+        if name.endswith(EXTENSION) and name != HANDOFF_TRIPS + EXTENSION
+    }
+    return trips, tables
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    from src.data_processor.background_loader import run_feature_pipeline
+    from src.data_processor.loading_cleaning import prepare_data
+
+    parser = argparse.ArgumentParser(description="Export the processed trips and result tables as Arrow IPC files.")
+    parser.add_argument("--source", default=URL, help="CSV, .zip or .gz export (local path or URL).")
+    parser.add_argument("--output", default=HANDOFF_DIR)
+    parser.add_argument("--top-n", type=int, default=10)
+    args = parser.parse_args(argv)
+
+    df, _ = run_feature_pipeline(prepare_data(args.source))
+    paths = export_handoff(df, standard_tables(df, args.top_n), args.output)
+    size = sum(os.path.getsize(path) for path in paths)
+    print(f"Wrote {len(df):,} trips and {len(paths) - 1} table(s) to {args.output} ({size / (1 << 20):.1f} MB)")
+
+
+if __name__ == "__main__":
+    main()
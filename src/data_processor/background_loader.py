@@ -0,0 +1,256 @@
+# src/data_processor/background_loader.py
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List, Optional, Tuple
+
+import pandas as pd
+
+from src.analytics.incremental import PartialAggregates
+from src.config import TRIP_ID_COL, LOAD_CHUNK_ROWS, START_STATION_COL, START_STATION_CODE_COL
+from src.data_processor.fetch import fetch_cached, is_remote
+from src.data_processor.feature_engineering import add_calendar_features, label_rush_hour, calculate_trip_metrics
+from src.data_processor.loading_cleaning import iter_prepared_chunks
+from src.data_processor.memory_governor import MemoryGovernor, frame_bytes
+from src.data_processor.rider_categorization import categorize_riders
+from src.data_processor.station_dimension import StationDimension
+from src.data_processor.validation import validate_data
+
+
+def run_feature_pipeline(
+        df: pd.DataFrame,
+        prior_trip_ids: Optional[pd.Index] = None
+) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Validation + feature steps applied after prepare_data. Returns the processed frame and the quality report.
+    """
+    validation = validate_data(df, policy="drop", prior_trip_ids=prior_trip_ids)
+    out = categorize_riders(validation.data)
+    out = add_calendar_features(out)
+    out = label_rush_hour(out)
+    out = calculate_trip_metrics(out)
+    return out, validation.report
+
+
+def _column_blocks(df: pd.DataFrame) -> pd.DataFrame:
+    """A copy of df that holds each column in its own block, so removing a column releases its memory."""
+    return pd.DataFrame({col: df[col].copy() for col in df.columns}, index=df.index, copy=False)
+
+
+def source_fingerprint(source) -> tuple:
+    """
+    Cheap identity of a loaded file: its path, size and modification time. A re-downloaded or edited
+    file gets a new fingerprint; other sources (e.g. open file objects) are told apart by object.
+    """
+    if isinstance(source, str) and os.path.exists(source):
+        stat = os.stat(source)
+        return os.path.abspath(source), stat.st_size, stat.st_mtime_ns
+    return type(source).__name__, id(source)
+
+
+class BackgroundLoader:
+    """
+    Loads and processes the trip data chunk by chunk on a worker thread.
+
+    While loading, snapshot() exposes the aggregates of the chunks processed so
+    far; once done, result() returns the same frame as a synchronous
+    prepare_data + run_feature_pipeline run.
+
+    With a station_dimension, each chunk updates the dimension and carries the
+    stable start/end station codes in place of the station name columns; the
+    aggregates count stations by code, decode() joins the names back onto a
+    result, and the dimension is saved to its path once loading finishes.
+
+    With a governor, the held chunks are checked against its memory budget
+    after each chunk; once it is under pressure, the cold columns of every
+    held chunk and of every later one are spilled to disk (the result then
+    lacks them; governor.restore() reads them back for given rows). If the
+    footprint stays over the mark, their hot numeric columns are mapped to
+    disk as well and come back file-backed in the result.
+
+    result() joins the chunks one column at a time, releasing each column of
+    the chunks once it is copied, so the peak stays near the size of the data
+    rather than twice it.
+
+    Once done, version identifies the loaded data (the source's fingerprint
+    and the row count) for cache keys shared across reruns and sessions.
+    """
+
+    def __init__(self, data_source, chunksize: int = LOAD_CHUNK_ROWS,
+                 station_dimension: Optional[StationDimension] = None,
+                 governor: Optional[MemoryGovernor] = None):
+        self.data_source = data_source
+        self.chunksize = chunksize
+        self.station_dimension = station_dimension
+        self.governor = governor
+        self._held_bytes: List[int] = []
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="trip-loader")
+        self._future = None
+        self._frames: List[pd.DataFrame] = []
+        self._columns: List[str] = []  # Column order of the processed chunks
+        self._result: Optional[pd.DataFrame] = None
+        self._aggregates = PartialAggregates(
+            station_col=START_STATION_CODE_COL if station_dimension is not None else START_STATION_COL
+        )
+        self._report: Optional[pd.DataFrame] = None
+        self._progress: Optional[float] = None
+        self.phase = "pending"
+        self.rows_loaded = 0
+        self.version: Optional[tuple] = None
+        self._rows_checked = 0
+
+    def start(self) -> "BackgroundLoader":
+        if self._future is None:
+            self._future = self._executor.submit(self._run)
+        return self
+
+    def _on_download(self, done: int, total: Optional[int]) -> None:
+        with self._lock:
+            self._progress = done / total if total else None
+
+    def _run(self) -> None:
+        source = self.data_source
+        if is_remote(source):
+            # Remote files go through the local download cache; unchanged files cost one 304 round trip.
+            self.phase = "downloading"
+            source = fetch_cached(source, progress_callback=self._on_download)
+
+        self.phase = "processing"
+        fingerprint = source_fingerprint(source)
+        # Only plain local CSVs are read through our own handle; archives need pandas/zipfile to open them.
+        is_plain_csv = isinstance(source, str) and source.lower().endswith(".csv") and os.path.exists(source)
+        size = os.path.getsize(source) if is_plain_csv else None
+        with self._lock:
+            self._progress = 0.0 if size else None
+
+        # Open local files ourselves so the handle position can drive the progress bar.
+        handle = open(source, "rb") if size else None
+        try:
+            seen_ids: Optional[pd.Index] = None
+            for chunk in iter_prepared_chunks(handle or source, self.chunksize):
+                processed, report = run_feature_pipeline(chunk, prior_trip_ids=seen_ids)
+                if self.station_dimension is not None:
+                    # Under the lock, so decode() never sees a half-updated dimension.
+                    with self._lock:
+                        processed = self.station_dimension.update(processed).encode(processed, drop_names=True)
+                chunk_ids = pd.Index(chunk[TRIP_ID_COL].unique())
+                seen_ids = chunk_ids if seen_ids is None else seen_ids.append(chunk_ids)
+
+                with self._lock:
+                    self._columns = self._columns or list(processed.columns)
+                    self._frames.append(_column_blocks(processed))
+                    self._aggregates.update(processed)
+                    self._report = report if self._report is None else self._report.assign(
+                        violations=self._report["violations"] + report["violations"]
+                    )
+                    self.rows_loaded += len(processed)
+                    self._rows_checked += len(chunk)
+                    if size:
+                        self._progress = min(handle.tell() / size, 1.0)
+                if self.governor is not None:
+                    self._govern()
+        finally:
+            if handle is not None:
+                handle.close()
+
+        if self.station_dimension is not None and self.station_dimension.path is not None:
+            self.station_dimension.save()
+
+        with self._lock:
+            self.phase = "done"
+            self.version = (*fingerprint, self.rows_loaded)
+            self._progress = 1.0
+            if self._report is not None:
+                self._report["share"] = self._report["violations"] / max(self._rows_checked, 1)
+
+    def _govern(self) -> None:
+        """
+        Spills the held chunks' cold columns once the governor reports memory pressure (then keeps spilling);
+        maps their hot columns to disk too while the pressure lasts (then keeps mapping).
+        """
+        governor = self.governor
+        self._held_bytes.append(frame_bytes(self._frames[-1]))
+        if not governor.spilled_columns and not governor.under_pressure(sum(self._held_bytes)):
+            return
+
+        self._shrink_held(governor.spill)
+        if governor.mapped_columns or governor.under_pressure(sum(self._held_bytes)):
+            # Nothing cold is left to drop: the hot columns move to file-backed pages.
+            self._shrink_held(governor.map_hot)
+        governor.under_pressure(sum(self._held_bytes))
+
+    def _shrink_held(self, shrink: Callable[[pd.DataFrame], pd.DataFrame]) -> None:
+        # One chunk at a time and in row order, so only one chunk's kept columns are ever copied at once.
+        for position in range(len(self._frames)):
+            kept = shrink(self._frames[position])
+            if kept is not self._frames[position]:
+                with self._lock:
+                    self._frames[position] = kept
+                self._held_bytes[position] = frame_bytes(kept)
+
+    def _merge(self) -> pd.DataFrame:
+        """
+        The held chunks as one frame, built column by column: each column is taken out of the chunks
+        as it is copied, so at most one column exists twice. Mapped columns come back file-backed.
+        """
+        frames = self._frames
+        if not frames:
+            return pd.DataFrame()
+
+        index = frames[0].index.append([frame.index for frame in frames[1:]])
+        columns = self.governor.mapped() if self.governor is not None else {}
+        for col in list(frames[0].columns):
+            pieces = [frame.pop(col) for frame in frames]
+            columns[col] = pd.concat(pieces, ignore_index=True).array
+            del pieces
+        return pd.DataFrame({col: columns[col] for col in self._columns if col in columns}, index=index, copy=False)
+
+    @property
+    def done(self) -> bool:
+        return self._future is not None and self._future.done()
+
+    @property
+    def error(self) -> Optional[BaseException]:
+        return self._future.exception() if self.done else None
+
+    @property
+    def progress(self) -> Optional[float]:
+        """Fraction of the input consumed, or None when the source size is unknown (e.g. a URL)."""
+        with self._lock:
+            return self._progress
+
+    def snapshot(self) -> PartialAggregates:
+        """
+        The aggregates so far. Once loading is done they no longer change and are
+        returned as they are; before that, a copy that later chunks leave alone.
+        """
+        with self._lock:
+            return self._aggregates if self.phase == "done" else self._aggregates.copy()
+
+    def decode(self, df: pd.DataFrame, code_col: str = START_STATION_CODE_COL,
+               name_col: str = START_STATION_COL) -> pd.DataFrame:
+        """
+        A result keyed by station code with the canonical names in its place (see StationDimension.decode);
+        frames from a loader without a station dimension are returned unchanged.
+        """
+        if self.station_dimension is None or code_col not in df.columns:
+            return df
+        with self._lock:
+            return self.station_dimension.decode(df, code_col, name_col)
+
+    def quality_report(self) -> Optional[pd.DataFrame]:
+        with self._lock:
+            return None if self._report is None else self._report.copy()
+
+    def result(self) -> pd.DataFrame:
+        """
+        Blocks until loading finishes and returns the fully processed frame.
+        """
+        self.start()
+        self._future.result()
+        with self._lock:
+            if self._result is None:
+                self._result = self._merge()
+                self._frames = [self._result]
+            return self._result
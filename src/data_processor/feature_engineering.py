@@ -1,3 +1,4 @@
+import numpy as np
 import pandas as pd
 from datetime import time, timedelta
 
@@ -5,8 +6,51 @@ from datetime import time, timedelta
 # Note: You must ensure all these constants are correctly defined and imported in your environment
 from src.config import (
     START_TIME_COL, END_TIME_COL, IS_RUSH_HOUR_COL,
-    DURATION_MIN_COL, TRIP_DURATION_COL, AM_RUSH_START,AM_RUSH_END,PM_RUSH_START,PM_RUSH_END
+    DURATION_MIN_COL, TRIP_DURATION_COL, AM_RUSH_START,AM_RUSH_END,PM_RUSH_START,PM_RUSH_END,
+    HOUR_COL, DOW_COL, MINUTE_OF_DAY_COL, DAY_ORDINAL_COL, IS_HOLIDAY_COL
 )
+from src.data_processor.holiday_calendar import holiday_ordinals
+
+NS_PER_MINUTE = 60 * 10 ** 9
+MINUTES_PER_DAY = 24 * 60
+EPOCH_WEEKDAY = 3  # 1970-01-01 was a Thursday
+
+
+def first_minute_from(t: time) -> int:
+    """Smallest minute-of-day whose start is at or after t (minute-resolution stand-in for '>= t')."""
+    return -(-(t.hour * 3600 + t.minute * 60 + t.second + (t.microsecond > 0)) // 60)
+
+
+def last_minute_until(t: time) -> int:
+    """Largest minute-of-day whose start is at or before t (minute-resolution stand-in for '<= t')."""
+    return t.hour * 60 + t.minute
+
+
+def add_calendar_features(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Adds the start time's calendar parts as compact integer columns (9 bytes per trip):
+    hour (int8), day of week (int8, Monday = 0), minute of day (int16), day ordinal
+    (int32, days since 1970-01-01) and an Ontario holiday flag.
+
+    Filters and aggregations use these instead of re-deriving them from the
+    datetimes. They work at minute resolution, the resolution of the exports.
+    """
+    if START_TIME_COL not in df.columns:
+        raise KeyError(f"DataFrame must contain '{START_TIME_COL}' column.")
+    if df[START_TIME_COL].isna().any():
+        raise ValueError("Trips without a start time have no calendar features.")
+
+    minutes = df[START_TIME_COL].to_numpy("datetime64[ns]").astype("int64") // NS_PER_MINUTE
+    days = minutes // MINUTES_PER_DAY
+    minute_of_day = minutes - days * MINUTES_PER_DAY
+
+    df[HOUR_COL] = (minute_of_day // 60).astype("int8")
+    df[DOW_COL] = ((days + EPOCH_WEEKDAY) % 7).astype("int8")
+    df[MINUTE_OF_DAY_COL] = minute_of_day.astype("int16")
+    df[DAY_ORDINAL_COL] = days.astype("int32")
+    years = range(df[START_TIME_COL].min().year, df[START_TIME_COL].max().year + 1) if len(df) else []
+    df[IS_HOLIDAY_COL] = np.isin(df[DAY_ORDINAL_COL].to_numpy(), holiday_ordinals(years))
+    return df
 
 
 def label_rush_hour(df: pd.DataFrame) -> pd.DataFrame:
@@ -17,6 +61,14 @@ def label_rush_hour(df: pd.DataFrame) -> pd.DataFrame:
     if START_TIME_COL not in df.columns:
         raise KeyError(f"DataFrame must contain '{START_TIME_COL}' column.")
 
+    # With calendar features, compare the int16 minute of day against the bounds in minutes.
+    if MINUTE_OF_DAY_COL in df.columns:
+        minute = df[MINUTE_OF_DAY_COL].to_numpy()
+        is_am_rush = (minute >= first_minute_from(AM_RUSH_START)) & (minute < first_minute_from(AM_RUSH_END))
+        is_pm_rush = (minute >= first_minute_from(PM_RUSH_START)) & (minute < first_minute_from(PM_RUSH_END))
+        df[IS_RUSH_HOUR_COL] = is_am_rush | is_pm_rush
+        return df
+
     # Extract time component from datetime objects
     trip_time = df[START_TIME_COL].dt.time
 
@@ -0,0 +1,130 @@
+# src/data_processor/fetch.py
+import json
+import os
+import time
+from datetime import datetime, timezone
+from http.client import HTTPException
+from typing import Callable, Optional
+from urllib.error import HTTPError, URLError
+from urllib.parse import urlparse
+from urllib.request import Request, urlopen
+
+from src.config import DOWNLOAD_CACHE_DIR, DOWNLOAD_CHUNK_BYTES, DOWNLOAD_RETRIES, DOWNLOAD_TIMEOUT_SEC
+
+
+def is_remote(data_source) -> bool:
+    return isinstance(data_source, str) and urlparse(data_source).scheme in ("http", "https")
+
+
+def _read_meta(path: str) -> dict:
+    if not os.path.exists(path):
+        return {}
+    with open(path) as fh:
+        return json.load(fh)
+
+
+def _write_meta(path: str, meta: dict) -> None:
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w") as fh:
+        json.dump(meta, fh, indent=2)
+    os.replace(tmp_path, path)
+
+
+def fetch_cached(
+        url: str,
+        cache_dir: str = DOWNLOAD_CACHE_DIR,
+        filename: Optional[str] = None,
+        retries: int = DOWNLOAD_RETRIES,
+        timeout: float = DOWNLOAD_TIMEOUT_SEC,
+        chunk_size: int = DOWNLOAD_CHUNK_BYTES,
+        progress_callback: Optional[Callable[[int, Optional[int]], None]] = None
+) -> str:
+    """
+    Returns a local path for `url`, downloading it into cache_dir only when the remote file changed.
+
+    The body is streamed to '<file>.part' in chunks and ETag/Last-Modified are
+    stored in '<file>.meta.json'. Later calls send a conditional request and
+    reuse the local copy on 304 or when the server is unreachable. Interrupted
+    downloads are retried and resumed with a Range request.
+    """
+    os.makedirs(cache_dir, exist_ok=True)
+    local_path = os.path.join(cache_dir, filename or os.path.basename(urlparse(url).path) or "download")
+    part_path = local_path + ".part"
+    meta_path = local_path + ".meta.json"
+
+    last_error: Optional[BaseException] = None
+    for attempt in range(retries + 1):
+        if attempt:
+            time.sleep(min(2 ** (attempt - 1), 10) * 0.5)
+
+        meta = _read_meta(meta_path)
+        headers = {}
+        if os.path.exists(local_path):
+            if meta.get("etag"):
+                headers["If-None-Match"] = meta["etag"]
+            if meta.get("last_modified"):
+                headers["If-Modified-Since"] = meta["last_modified"]
+
+        partial = meta.get("partial", {})
+        resume_from = os.path.getsize(part_path) if os.path.exists(part_path) else 0
+        if resume_from and partial.get("etag"):
+            headers["Range"] = f"bytes={resume_from}-"
+            headers["If-Range"] = partial["etag"]
+        else:
+            resume_from = 0
+
+        try:
+            with urlopen(Request(url, headers=headers), timeout=timeout) as response:
+                if response.status == 206:
+                    mode = "ab"
+                else:
+                    mode, resume_from = "wb", 0
+
+                etag = response.headers.get("ETag")
+                last_modified = response.headers.get("Last-Modified")
+                length = response.headers.get("Content-Length")
+                total = resume_from + int(length) if length is not None else None
+
+                meta["partial"] = {"etag": etag, "last_modified": last_modified}
+                _write_meta(meta_path, meta)
+
+                written = resume_from
+                with open(part_path, mode) as fh:
+                    while True:
+                        block = response.read(chunk_size)
+                        if not block:
+                            break
+                        fh.write(block)
+                        written += len(block)
+                        if progress_callback is not None:
+                            progress_callback(written, total)
+
+                if total is not None and written != total:
+                    raise HTTPException(f"Incomplete download: {written} of {total} bytes")
+
+            os.replace(part_path, local_path)
+            _write_meta(meta_path, {
+                "url": url,
+                "etag": etag,
+                "last_modified": last_modified,
+                "size": written,
+                "fetched_at": datetime.now(timezone.utc).isoformat(),
+            })
+            return local_path
+
+        except HTTPError as error:
+            if error.code == 304 and os.path.exists(local_path):
+                return local_path
+            if error.code == 416 and os.path.exists(part_path):
+                # Stale partial file; start over on the next attempt.
+                os.remove(part_path)
+            elif error.code < 500:
+                raise
+            last_error = error
+        except (URLError, HTTPException, OSError) as error:
+            last_error = error
+
+    # Offline or the server kept failing: fall back to the last good copy.
+    if os.path.exists(local_path):
+        return local_path
+    raise ConnectionError(f"Could not download {url}") from last_error
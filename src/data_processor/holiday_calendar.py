@@ -0,0 +1,73 @@
+# src/data_processor/holiday_calendar.py
+"""
+Ontario public holidays, computed locally (no calendar service or package).
+
+Fixed-date holidays that fall on a weekend also mark their substitute
+weekday (the next weekday that is not already a holiday), e.g. Christmas
+on a Saturday -> Monday the 27th, Boxing Day on the Sunday -> Tuesday the 28th.
+"""
+from datetime import date, timedelta
+from functools import lru_cache
+from typing import Iterable, List, Tuple
+
+import numpy as np
+
+EPOCH = date(1970, 1, 1)
+
+
+def _easter(year: int) -> date:
+    """Gregorian Easter Sunday (anonymous Gregorian algorithm)."""
+    a, b, c = year % 19, year // 100, year % 100
+    d, e = b // 4, b % 4
+    g = (8 * b + 13) // 25
+    h = (19 * a + b - d - g + 15) % 30
+    i, k = c // 4, c % 4
+    l = (32 + 2 * e + 2 * i - h - k) % 7
+    m = (a + 11 * h + 19 * l) // 433
+    month = (h + l - 7 * m + 90) // 25
+    return date(year, month, (h + l - 7 * m + 33 * month + 19) % 32)
+
+
+def _nth_weekday(year: int, month: int, weekday: int, n: int) -> date:
+    """n-th given weekday (Monday = 0) of a month."""
+    first = date(year, month, 1)
+    return first + timedelta(days=(weekday - first.weekday()) % 7 + 7 * (n - 1))
+
+
+def ontario_holidays(year: int) -> List[Tuple[date, str]]:
+    """(date, name) of the year's holidays, including weekend substitutes, in date order."""
+    fixed = [
+        (date(year, 1, 1), "New Year's Day"),
+        (date(year, 7, 1), "Canada Day"),
+        (date(year, 12, 25), "Christmas Day"),
+        (date(year, 12, 26), "Boxing Day"),
+    ]
+    moving = [
+        (_nth_weekday(year, 2, 0, 3), "Family Day"),
+        (_easter(year) - timedelta(days=2), "Good Friday"),
+        (date(year, 5, 24) - timedelta(days=date(year, 5, 24).weekday()), "Victoria Day"),  # Monday before May 25
+        (_nth_weekday(year, 8, 0, 1), "Civic Holiday"),  # Not statutory, but a City of Toronto holiday
+        (_nth_weekday(year, 9, 0, 1), "Labour Day"),
+        (_nth_weekday(year, 10, 0, 2), "Thanksgiving"),
+    ]
+
+    holidays = fixed + moving
+    taken = {day for day, _ in holidays}
+    for day, name in fixed:
+        if day.weekday() >= 5:
+            substitute = day + timedelta(days=1)
+            while substitute.weekday() >= 5 or substitute in taken:
+                substitute += timedelta(days=1)
+            taken.add(substitute)
+            holidays.append((substitute, f"{name} (observed)"))
+    return sorted(holidays)
+
+
+@lru_cache(maxsize=None)
+def _year_ordinals(year: int) -> Tuple[int, ...]:
+    return tuple((day - EPOCH).days for day, _ in ontario_holidays(year))
+
+
+def holiday_ordinals(years: Iterable[int]) -> np.ndarray:
+    """Holidays of the given years as days since 1970-01-01 (the day ordinal of the calendar features)."""
+    return np.array(sorted(o for year in set(years) for o in _year_ordinals(int(year))), dtype="int32")
@@ -3,24 +3,180 @@
 # Taiga Task 1.4: Implement datetime conversion logic to pass the datetime test (GREEN).
 
 
+import gzip
+import os
+import zipfile
 import pandas as pd
-from typing import List
+from concurrent.futures import ThreadPoolExecutor
+from typing import IO, Iterator, List, Optional, Tuple
 from src.config import (TRIP_ID_COL,TRIP_DURATION_COL,START_TIME_COL, END_TIME_COL,USER_TYPE_COL,START_STATION_COL,
-                        END_STATION_COL,START_STATION_ID_COL,END_STATION_ID_COL,BIKE_ID_COL,MODEL_COL)
+                        END_STATION_COL,START_STATION_ID_COL,END_STATION_ID_COL,BIKE_ID_COL,MODEL_COL,
+                        LOAD_CHUNK_ROWS)
+from src.data_processor.fetch import fetch_cached, is_remote
+from src.data_processor.schema_profiles import FormatProfile, detect_profile, sniff_profile
 
 
 # Fulfills AC 5: Core logic contained in a dedicated function.
 def prepare_data(data_source: str) -> pd.DataFrame:
     """
     Loads the bike-share data and performs essential cleaning (US-1).
+    Exports from 2017 onwards are recognised by their header and normalised to the current schema.
+    A directory is read as a partitioned Parquet store of already cleaned trips.
+    A URL is read from the local download cache (fetched or revalidated once).
     """
+    if is_remote(data_source):
+        data_source = fetch_cached(data_source)
+
+    if _is_dataset(data_source):
+        from src.data_processor.partitioned_store import read_partitions
+        return read_partitions(data_source)
+
+    if _is_zip(data_source):
+        return prepare_archive(data_source)
+
     try:
         # Fulfills Functional AC 1: Load the file.
-        df = pd.read_csv(data_source)
+        profile, options = sniff_profile(data_source)
+        df = pd.read_csv(data_source, **options)
     except FileNotFoundError:
         # Error handling for robustness
         raise FileNotFoundError(f"Data file not found at: {data_source}")
 
+    return _clean_frame(df, profile)
+
+
+def iter_prepared_chunks(data_source, chunksize: int = LOAD_CHUNK_ROWS) -> Iterator[pd.DataFrame]:
+    """
+    Streams the bike-share data in chunks of `chunksize` rows, applying the same cleaning as prepare_data.
+    Concatenating every yielded chunk reproduces prepare_data(data_source).
+    """
+    if is_remote(data_source):
+        data_source = fetch_cached(data_source)
+
+    if _is_dataset(data_source):
+        # One chunk per stored file, renumbered like prepare_data's concatenation.
+        from src.data_processor.partitioned_store import iter_partitions
+        offset = 0
+        for chunk in iter_partitions(data_source):
+            chunk.index = pd.RangeIndex(offset, offset + len(chunk))
+            offset += len(chunk)
+            yield chunk
+        return
+
+    if _is_zip(data_source):
+        # Renumber rows across members so the chunks line up with prepare_archive's index.
+        offset = 0
+        for _, chunk in iter_prepared_archive(data_source, chunksize=chunksize):
+            chunk.index = pd.RangeIndex(offset, offset + len(chunk))
+            offset += len(chunk)
+            yield chunk
+        return
+
+    try:
+        # The format (including a day-first or month-first date order) is settled once for the whole source.
+        profile, options = sniff_profile(data_source)
+        reader = pd.read_csv(data_source, chunksize=chunksize, **options)
+    except FileNotFoundError:
+        raise FileNotFoundError(f"Data file not found at: {data_source}")
+
+    with reader:
+        for chunk in reader:
+            yield _clean_frame(chunk, profile)
+
+
+def _is_zip(data_source) -> bool:
+    return isinstance(data_source, str) and data_source.lower().endswith(".zip")
+
+
+def _is_dataset(data_source) -> bool:
+    return isinstance(data_source, str) and os.path.isdir(data_source)
+
+
+def iter_archive_members(archive_path: str) -> Iterator[Tuple[str, IO[bytes]]]:
+    """
+    Yields (member name, binary stream) for every CSV in a .zip bundle, or the single CSV in a .gz file.
+    Members are decompressed on the fly; nothing is extracted to disk.
+    """
+    if not os.path.exists(archive_path):
+        raise FileNotFoundError(f"Data file not found at: {archive_path}")
+
+    if _is_zip(archive_path):
+        with zipfile.ZipFile(archive_path) as bundle:
+            for name in _zip_csv_members(bundle):
+                with bundle.open(name) as stream:
+                    yield name, stream
+    elif archive_path.lower().endswith(".gz"):
+        with gzip.open(archive_path, "rb") as stream:
+            yield os.path.basename(archive_path)[:-3], stream
+    else:
+        with open(archive_path, "rb") as stream:
+            yield os.path.basename(archive_path), stream
+
+
+def _zip_csv_members(bundle: zipfile.ZipFile) -> List[str]:
+    # Skip folders and macOS resource forks that often ride along in exported bundles.
+    return sorted(
+        info.filename for info in bundle.infolist()
+        if not info.is_dir()
+        and info.filename.lower().endswith(".csv")
+        and not os.path.basename(info.filename).startswith("._")
+        and not info.filename.startswith("__MACOSX/")
+    )
+
+
+def iter_prepared_archive(archive_path: str, chunksize: Optional[int] = None) -> Iterator[Tuple[str, pd.DataFrame]]:
+    """
+    Cleans an archive member by member (and chunk by chunk when chunksize is set), keeping memory bounded.
+    """
+    for name, stream in iter_archive_members(archive_path):
+        # Members are sniffed one by one: a multi-year bundle can mix export formats.
+        profile, options = sniff_profile(stream)
+        frames = pd.read_csv(stream, chunksize=chunksize, **options) if chunksize else [pd.read_csv(stream, **options)]
+        for frame in frames:
+            yield name, _clean_frame(frame, profile)
+
+
+def _prepare_member(archive_path: str, name: str) -> pd.DataFrame:
+    # Each worker opens its own handle: ZipFile objects are not safe to share across threads.
+    with zipfile.ZipFile(archive_path) as bundle, bundle.open(name) as stream:
+        profile, options = sniff_profile(stream)
+        return _clean_frame(pd.read_csv(stream, **options), profile)
+
+
+def prepare_archive(archive_path: str, max_workers: int = 1) -> pd.DataFrame:
+    """
+    Loads every CSV in a .zip (or the CSV in a .gz) through the same cleaning rules as prepare_data.
+
+    Members are processed one at a time, or up to max_workers at a time in
+    parallel, and concatenated in member order with a fresh index.
+    """
+    if _is_zip(archive_path) and max_workers > 1:
+        if not os.path.exists(archive_path):
+            raise FileNotFoundError(f"Data file not found at: {archive_path}")
+        with zipfile.ZipFile(archive_path) as bundle:
+            names = _zip_csv_members(bundle)
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            frames = list(pool.map(lambda name: _prepare_member(archive_path, name), names))
+    else:
+        frames = [frame for _, frame in iter_prepared_archive(archive_path)]
+
+    if not frames:
+        raise ValueError(f"No CSV files found in archive: {archive_path}")
+
+    return pd.concat(frames, ignore_index=True)
+
+
+def _clean_frame(df: pd.DataFrame, profile: Optional[FormatProfile] = None) -> pd.DataFrame:
+    """
+    Cleaning rules shared by the full and the chunked loaders.
+    profile is the source's sniffed format; without one it is detected from the frame's columns.
+    """
+    # Known export formats are mapped onto the current schema first (datetimes parsed with the profile's format).
+    if profile is None:
+        profile = detect_profile(df.columns)
+    if profile is not None:
+        df = profile.normalise(df)
+
     # --- GREEN: Make TDD Test Case 2 Pass (Datetime Conversion) ---
     # Fulfills AC 2: Converts string columns to datetime objects.
     df[START_TIME_COL] = pd.to_datetime(df[START_TIME_COL])
@@ -31,10 +187,12 @@ def prepare_data(data_source: str) -> pd.DataFrame:
     critical_columns: List[str] = [TRIP_ID_COL,TRIP_DURATION_COL,START_TIME_COL, END_TIME_COL,USER_TYPE_COL,START_STATION_COL,
                                    END_STATION_COL,START_STATION_ID_COL,END_STATION_ID_COL,BIKE_ID_COL,MODEL_COL]
     # Fulfills AC 3: Drop rows where critical fields are null.
+    # Columns the source format never had (e.g. bike ids before 2019) are not grounds for dropping a trip.
+    if profile is not None:
+        critical_columns = [col for col in critical_columns if col not in profile.defaults]
     df.dropna(subset=critical_columns, inplace=True)
 
     # Fulfills AC 3: Filter out short/invalid trips (e.g., less than 0 seconds).
     df = df[df[TRIP_DURATION_COL] >= 0].copy()
 
-    # The code now runs successfully and returns the cleaned DataFrame.
-    return df
+    return profile.cast(df) if profile is not None else df
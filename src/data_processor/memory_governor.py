@@ -0,0 +1,286 @@
+# src/data_processor/memory_governor.py
+"""
+Memory budget for the loaded trip data, degrading in stages instead of running out of memory.
+
+The governor compares the process's resident memory with a configured
+budget. Past the high-water mark:
+
+1. The columns no view reads (ids, bike, model, ...) are written to Parquet
+   files under a per-run spill directory and dropped from the in-memory
+   chunks; they are read back by row label only when asked for (e.g. the
+   rows on screen in the data table).
+2. If that is not enough, the hot numeric, boolean and timestamp columns
+   are appended to one raw file per column and used memory-mapped. Their
+   pages are then backed by the file, so the OS can drop and re-read them
+   under pressure instead of killing the process; views get slower, not
+   wrong.
+3. Caches registered with on_pressure() (the dashboard's views and sample)
+   are released by relieve() while the footprint stays over the mark.
+"""
+import itertools
+import os
+import shutil
+import threading
+import weakref
+from typing import Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from src.config import MEMORY_BUDGET_MB, MEMORY_HIGH_WATER, SPILL_DIR, COLD_COLUMNS
+
+MB = 1 << 20
+ROW_LABEL = "__row__"  # Row label column in spill files
+_MAPPABLE_KINDS = "biufmM"  # Plain numpy columns that can live in a raw file (bool, numbers, timestamps)
+_REWRITE_ROWS = 1 << 20  # Rows converted at a time when a mapped column's dtype widens
+_run_ids = itertools.count()
+
+
+def resident_bytes() -> Optional[int]:
+    """Current resident set size of this process (Linux /proc), or None where it can't be read."""
+    try:
+        with open("/proc/self/statm") as fh:
+            return int(fh.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def frame_bytes(df: pd.DataFrame) -> int:
+    """In-memory size of a frame, strings included."""
+    return int(df.memory_usage(index=True, deep=True).sum())
+
+
+class MemoryStatus(NamedTuple):
+    """Footprint and spill state for display; resident_bytes is None where the OS doesn't report it."""
+    resident_bytes: Optional[int]
+    budget_bytes: int
+    held_bytes: int
+    spilled_bytes: int
+    spilled_rows: int
+    spilled_columns: Tuple[str, ...]
+    mapped_columns: Tuple[str, ...] = ()
+    mapped_rows: int = 0
+    released: Tuple[str, ...] = ()
+
+    @property
+    def spilling(self) -> bool:
+        return bool(self.spilled_columns)
+
+    @property
+    def usage(self) -> float:
+        """Footprint as a share of the budget (resident memory, or the held frames if unknown)."""
+        footprint = self.resident_bytes if self.resident_bytes is not None else self.held_bytes
+        return footprint / self.budget_bytes
+
+
+class SpillFile(NamedTuple):
+    path: str
+    first_label: int
+    last_label: int
+    rows: int
+    bytes: int
+
+
+class MappedColumn(NamedTuple):
+    path: str
+    dtype: np.dtype
+
+
+class MemoryGovernor:
+    """
+    Decides when the loaded data must shrink and keeps what was spilled or mapped readable.
+
+    measure returns the current footprint in bytes (the resident set size by
+    default; tests pass their own). When it returns None, the bytes of the
+    frames the caller holds stand in for it.
+    """
+
+    def __init__(self, budget_mb: float = MEMORY_BUDGET_MB, high_water: float = MEMORY_HIGH_WATER,
+                 spill_dir: str = SPILL_DIR, cold_columns: Sequence[str] = tuple(COLD_COLUMNS),
+                 measure: Callable[[], Optional[int]] = resident_bytes):
+        if budget_mb <= 0 or not 0 < high_water <= 1:
+            raise ValueError("budget_mb must be positive and high_water in (0, 1].")
+        self.budget_bytes = int(budget_mb * MB)
+        self.high_water = high_water
+        self.cold_columns = list(cold_columns)
+        self.measure = measure
+        self.spill_dir = os.path.join(spill_dir, f"run-{os.getpid()}-{next(_run_ids)}")
+        self._files: List[SpillFile] = []
+        self._spilled_columns: List[str] = []
+        self._mapped: Dict[str, MappedColumn] = {}
+        self._mapped_rows = 0
+        self._releasers: Dict[str, Callable[[], None]] = {}
+        self._released: List[str] = []
+        self._held_bytes = 0
+        self._lock = threading.Lock()
+        # Spill files only make sense for this process; remove them with the governor.
+        self._cleanup = weakref.finalize(self, shutil.rmtree, self.spill_dir, True)
+
+    def under_pressure(self, held_bytes: int = 0) -> bool:
+        """True once the footprint reaches the high-water share of the budget."""
+        self._held_bytes = held_bytes
+        footprint = self.measure()
+        return (footprint if footprint is not None else held_bytes) >= self.high_water * self.budget_bytes
+
+    def spill(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        The frame without its cold columns, which are written to a new spill file first.
+        Frames without cold columns (e.g. already spilled) come back unchanged.
+        """
+        cold = [col for col in self.cold_columns if col in df.columns]
+        if not cold or df.empty:
+            return df
+        if not pd.api.types.is_integer_dtype(df.index):
+            raise ValueError("Only frames with integer row labels can be spilled.")
+
+        with self._lock:
+            os.makedirs(self.spill_dir, exist_ok=True)
+            path = os.path.join(self.spill_dir, f"cold-{len(self._files):05d}.parquet")
+            pq.write_table(pa.Table.from_pandas(df[cold].rename_axis(ROW_LABEL).reset_index(), preserve_index=False),
+                           path)
+            self._files.append(SpillFile(path, int(df.index.min()), int(df.index.max()), len(df),
+                                         os.path.getsize(path)))
+            self._spilled_columns.extend(col for col in cold if col not in self._spilled_columns)
+        return df.drop(columns=cold)
+
+    @property
+    def spilled_columns(self) -> List[str]:
+        with self._lock:
+            return list(self._spilled_columns)
+
+    def map_hot(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        The frame without its numeric, boolean and timestamp columns, whose values are appended to the
+        column files that mapped() reads back. The first frame fixes the mapped columns; frames must then
+        come in row order, each once (a frame that no longer has them comes back unchanged).
+        """
+        with self._lock:
+            if not self._mapped:
+                hot = [col for col in df.columns if isinstance(df[col].dtype, np.dtype)
+                       and df[col].dtype.kind in _MAPPABLE_KINDS]
+                if not hot:
+                    return df
+                os.makedirs(self.spill_dir, exist_ok=True)
+                self._mapped = {col: MappedColumn(os.path.join(self.spill_dir, f"hot-{position:03d}.bin"),
+                                                  df[col].dtype) for position, col in enumerate(hot)}
+            present = [col for col in self._mapped if col in df.columns]
+            if not present:
+                return df
+            if len(present) < len(self._mapped):
+                raise ValueError(f"Frame lacks mapped columns {sorted(set(self._mapped) - set(present))}.")
+
+            for col, mapped in self._mapped.items():
+                values = df[col].to_numpy()
+                dtype = np.result_type(mapped.dtype, values.dtype)
+                if dtype != mapped.dtype:
+                    self._widen(col, dtype)
+                with open(self._mapped[col].path, "ab") as fh:
+                    values.astype(dtype, copy=False).tofile(fh)
+            self._mapped_rows += len(df)
+        return df.drop(columns=present)
+
+    def _widen(self, col: str, dtype: np.dtype) -> None:
+        """Rewrites a mapped column's file in a wider dtype (e.g. int16 station codes growing to int32)."""
+        mapped = self._mapped[col]
+        widened = mapped.path + ".widen"
+        if self._mapped_rows:
+            old = np.memmap(mapped.path, dtype=mapped.dtype, mode="r", shape=(self._mapped_rows,))
+            with open(widened, "wb") as fh:
+                for start in range(0, self._mapped_rows, _REWRITE_ROWS):
+                    old[start:start + _REWRITE_ROWS].astype(dtype).tofile(fh)
+            del old
+            os.replace(widened, mapped.path)
+        self._mapped[col] = MappedColumn(mapped.path, dtype)
+
+    @property
+    def mapped_columns(self) -> List[str]:
+        with self._lock:
+            return list(self._mapped)
+
+    def mapped(self) -> Dict[str, np.ndarray]:
+        """
+        The mapped columns as file-backed arrays over every row passed to map_hot(), in order.
+        Writes to them stay private to the process (copy-on-write) and never reach the files.
+        """
+        with self._lock:
+            if not self._mapped_rows:
+                return {col: np.empty(0, dtype=mapped.dtype) for col, mapped in self._mapped.items()}
+            # Plain ndarray views (pandas treats np.memmap as a distinct class); the map stays their base.
+            return {col: np.memmap(mapped.path, dtype=mapped.dtype, mode="c",
+                                   shape=(self._mapped_rows,)).view(np.ndarray)
+                    for col, mapped in self._mapped.items()}
+
+    def on_pressure(self, name: str, release: Callable[[], None]) -> None:
+        """Registers a cache that relieve() may drop; registering a name again replaces its callback."""
+        with self._lock:
+            self._releasers[name] = release
+
+    def relieve(self) -> List[str]:
+        """
+        Under pressure, drops the registered caches in registration order until the footprint is back
+        under the high-water mark; returns the names released by this call.
+        """
+        released = []
+        with self._lock:
+            releasers = list(self._releasers.items())
+        for name, release in releasers:
+            if not self.under_pressure(self._held_bytes):
+                break
+            release()
+            released.append(name)
+        with self._lock:
+            self._released.extend(name for name in released if name not in self._released)
+        return released
+
+    def read_spilled(self, index: pd.Index, columns: Optional[Sequence[str]] = None) -> pd.DataFrame:
+        """
+        Spilled columns for the given row labels, in that order (NaN for rows never spilled).
+        Only the files whose label range overlaps the request are opened.
+        """
+        with self._lock:
+            files, spilled = list(self._files), list(self._spilled_columns)
+        columns = spilled if columns is None else [col for col in columns if col in spilled]
+        if index.empty or not files or not columns:
+            return pd.DataFrame(index=index, columns=columns)
+
+        low, high = index.min(), index.max()
+        parts = []
+        for spill_file in files:
+            if spill_file.last_label < low or spill_file.first_label > high:
+                continue
+            names = pq.read_schema(spill_file.path).names
+            part = pq.read_table(spill_file.path, columns=[ROW_LABEL] + [col for col in columns if col in names])
+            part = part.to_pandas().set_index(ROW_LABEL)
+            parts.append(part[part.index.isin(index)])
+        found = pd.concat(parts) if parts else pd.DataFrame(columns=columns)
+        return found.reindex(index=index, columns=columns)
+
+    def restore(self, df: pd.DataFrame, columns: Optional[Sequence[str]] = None) -> pd.DataFrame:
+        """df with its spilled columns read back and appended (for the handful of rows being shown)."""
+        missing = [col for col in (columns or self.spilled_columns) if col not in df.columns]
+        if not missing:
+            return df
+        return df.join(self.read_spilled(df.index, missing))
+
+    def status(self) -> MemoryStatus:
+        with self._lock:
+            return MemoryStatus(
+                resident_bytes=self.measure(),
+                budget_bytes=self.budget_bytes,
+                held_bytes=self._held_bytes,
+                spilled_bytes=sum(spill_file.bytes for spill_file in self._files),
+                spilled_rows=sum(spill_file.rows for spill_file in self._files),
+                spilled_columns=tuple(self._spilled_columns),
+                mapped_columns=tuple(self._mapped),
+                mapped_rows=self._mapped_rows,
+                released=tuple(self._released),
+            )
+
+    def clear(self) -> None:
+        """Deletes the spill files (spilled columns can no longer be restored; arrays already mapped stay valid)."""
+        with self._lock:
+            shutil.rmtree(self.spill_dir, ignore_errors=True)
+            self._files, self._spilled_columns = [], []
+            self._mapped, self._mapped_rows = {}, 0
@@ -0,0 +1,230 @@
+# src/data_processor/partitioned_store.py
+"""
+Date-partitioned Parquet store for cleaned trips.
+
+Layout: <root>/year=YYYY/month=MM[/day=DD]/part-NNNNN.parquet, plus a
+manifest at the root with each file's row count and start-time range.
+Files are sorted by start time and written in row groups whose min/max
+statistics let a date-range read skip both files and row groups.
+
+Usage:
+    python -m src.data_processor.partitioned_store --source data/bike_share_data.csv --root data/trips
+"""
+import argparse
+import os
+from datetime import date, timedelta
+from typing import Iterator, List, Optional, Tuple
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from src.config import START_TIME_COL, TRIP_DATASET_DIR, PARQUET_ROW_GROUP_ROWS, PARTITION_MANIFEST
+
+GRANULARITIES = ("month", "day")
+WRITE_MODES = ("error", "append", "overwrite")
+MANIFEST_COLUMNS = ["path", "year", "month", "day", "rows", "row_groups", "min_start", "max_start"]
+
+
+def _partition_dir(year: int, month: int, day: int = 0) -> str:
+    parts = [f"year={year:04d}", f"month={month:02d}"] + ([f"day={day:02d}"] if day else [])
+    return os.path.join(*parts)
+
+
+def _bounds(start_date: Optional[date], end_date: Optional[date]) -> Tuple[pd.Timestamp, pd.Timestamp]:
+    """Inclusive calendar dates -> half-open [lo, hi) timestamps (same days as filter_data_advanced keeps)."""
+    lo = pd.Timestamp(start_date) if start_date is not None else pd.Timestamp.min
+    hi = pd.Timestamp(end_date + timedelta(days=1)) if end_date is not None else pd.Timestamp.max
+    return lo, hi
+
+
+def read_manifest(root: str = TRIP_DATASET_DIR) -> pd.DataFrame:
+    """
+    One row per data file: path (relative to root), year, month, day (0 for monthly partitions),
+    rows, row_groups, min_start, max_start.
+    """
+    path = os.path.join(root, PARTITION_MANIFEST)
+    if not os.path.exists(path):
+        return pd.DataFrame({
+            "path": pd.Series(dtype="object"), "year": pd.Series(dtype="int64"),
+            "month": pd.Series(dtype="int64"), "day": pd.Series(dtype="int64"),
+            "rows": pd.Series(dtype="int64"), "row_groups": pd.Series(dtype="int64"),
+            "min_start": pd.Series(dtype="datetime64[ns]"), "max_start": pd.Series(dtype="datetime64[ns]"),
+        })
+    return pd.read_parquet(path)
+
+
+def _next_part(manifest: pd.DataFrame, relative_dir: str) -> int:
+    """Number of the next part file in exactly this partition directory (not its day subdirectories)."""
+    in_dir = manifest["path"][manifest["path"].map(os.path.dirname) == relative_dir]
+    numbers = in_dir.map(lambda path: int(os.path.basename(path)[len("part-"):-len(".parquet")]))
+    return int(numbers.max()) + 1 if len(numbers) else 0
+
+
+def _covering(manifest: pd.DataFrame, year: int, month: int, day: int) -> pd.Series:
+    """
+    Manifest rows holding trips of the partition: the month's (or day's) own
+    files, plus day files inside a month or the month file around a day.
+    """
+    same_month = (manifest["year"] == year) & (manifest["month"] == month)
+    if day:
+        return same_month & manifest["day"].isin([0, day])
+    return same_month
+
+
+def write_partitions(df: pd.DataFrame, root: str = TRIP_DATASET_DIR, granularity: str = "month",
+                     row_group_rows: int = PARQUET_ROW_GROUP_ROWS, mode: str = "error") -> pd.DataFrame:
+    """
+    Adds trips to the store: one new file per partition the frame touches.
+
+    Only the touched partitions (plus the manifest) are written. When a
+    partition already holds trips, mode decides: "error" raises ValueError
+    (loading the same month twice would duplicate its trips), "append" adds
+    another file beside the existing ones, "overwrite" replaces them (they
+    are deleted once the new manifest is in place; a month replaces its day
+    files too, but a day cannot replace part of a monthly file). Returns the
+    manifest rows of the files written.
+    """
+    if granularity not in GRANULARITIES:
+        raise ValueError(f"granularity must be one of {list(GRANULARITIES)}.")
+    if mode not in WRITE_MODES:
+        raise ValueError(f"mode must be one of {list(WRITE_MODES)}.")
+    if START_TIME_COL not in df.columns:
+        raise KeyError(f"DataFrame must contain '{START_TIME_COL}' column.")
+    if df[START_TIME_COL].isna().any():
+        raise ValueError("Trips without a start time cannot be partitioned.")
+
+    manifest = read_manifest(root)
+    if df.empty:
+        return manifest.iloc[:0]
+
+    # Sorting by start time keeps each row group's min/max range narrow.
+    ordered = df.sort_values(START_TIME_COL, kind="stable")
+    starts = ordered[START_TIME_COL]
+    keys = [starts.dt.year.rename("year"), starts.dt.month.rename("month")]
+    if granularity == "day":
+        keys.append(starts.dt.day.rename("day"))
+
+    groups = []
+    replaced = pd.Series(False, index=manifest.index)
+    for key, part in ordered.groupby(keys, sort=True):
+        year, month, day = (tuple(int(k) for k in key) + (0,))[:3]
+        covering = _covering(manifest, year, month, day)
+        if covering.any() and mode == "error":
+            raise ValueError(f"Partition {_partition_dir(year, month, day)} already holds trips; "
+                             "pass mode='append' or mode='overwrite'.")
+        if mode == "overwrite":
+            if day and (covering & (manifest["day"] == 0)).any():
+                raise ValueError(f"Cannot overwrite {_partition_dir(year, month, day)}: its trips are in a "
+                                 "monthly file with the rest of the month; overwrite the month instead.")
+            replaced |= covering
+        groups.append((year, month, day, part))
+
+    written = []
+    for year, month, day, part in groups:
+        relative_dir = _partition_dir(year, month, day)
+        os.makedirs(os.path.join(root, relative_dir), exist_ok=True)
+
+        relative_path = os.path.join(relative_dir, f"part-{_next_part(manifest, relative_dir):05d}.parquet")
+        pq.write_table(pa.Table.from_pandas(part, preserve_index=False),
+                       os.path.join(root, relative_path), row_group_size=row_group_rows)
+
+        written.append({
+            "path": relative_path, "year": year, "month": month, "day": day,
+            "rows": len(part), "row_groups": -(-len(part) // row_group_rows),
+            "min_start": part[START_TIME_COL].iloc[0], "max_start": part[START_TIME_COL].iloc[-1],
+        })
+
+    added = pd.DataFrame(written, columns=MANIFEST_COLUMNS)
+    replaced_paths = list(manifest.loc[replaced, "path"])
+    kept = manifest[~replaced]
+    manifest = pd.concat([kept, added], ignore_index=True) if len(kept) else added
+
+    # Write the manifest under a temporary name first so readers never see a partial file.
+    manifest_path = os.path.join(root, PARTITION_MANIFEST)
+    manifest.to_parquet(manifest_path + ".tmp", index=False)
+    os.replace(manifest_path + ".tmp", manifest_path)
+
+    # Replaced files are no longer listed, so no reader plans to open them.
+    for relative_path in replaced_paths:
+        os.remove(os.path.join(root, relative_path))
+    return added
+
+
+def plan_scan(root: str = TRIP_DATASET_DIR, start_date: Optional[date] = None,
+              end_date: Optional[date] = None) -> pd.DataFrame:
+    """
+    The (path, row_group, rows) units a date-range read has to open, in partition order.
+
+    Files are pruned with the manifest, then row groups with their
+    start-time statistics from the Parquet footer.
+    """
+    lo, hi = _bounds(start_date, end_date)
+    manifest = read_manifest(root).sort_values(["year", "month", "day", "path"], kind="stable")
+    files = manifest[(manifest["max_start"] >= lo) & (manifest["min_start"] < hi)]
+
+    units = []
+    for relative_path in files["path"]:
+        metadata = pq.read_metadata(os.path.join(root, relative_path))
+        column = metadata.schema.to_arrow_schema().get_field_index(START_TIME_COL)
+        for group in range(metadata.num_row_groups):
+            row_group = metadata.row_group(group)
+            stats = row_group.column(column).statistics
+            if stats is None or not stats.has_min_max or (stats.max >= lo and stats.min < hi):
+                units.append((relative_path, group, row_group.num_rows))
+    return pd.DataFrame(units, columns=["path", "row_group", "rows"])
+
+
+def iter_partitions(root: str = TRIP_DATASET_DIR, start_date: Optional[date] = None,
+                    end_date: Optional[date] = None, columns: Optional[List[str]] = None) -> Iterator[pd.DataFrame]:
+    """
+    Yields the trips of each overlapping file (only its overlapping row groups), filtered to the exact date range.
+    """
+    lo, hi = _bounds(start_date, end_date)
+    read_columns = None if columns is None else list(dict.fromkeys(list(columns) + [START_TIME_COL]))
+
+    plan = plan_scan(root, start_date, end_date)
+    for relative_path, groups in plan.groupby("path", sort=False)["row_group"]:
+        frame = pq.ParquetFile(os.path.join(root, relative_path)).read_row_groups(
+            list(groups), columns=read_columns
+        ).to_pandas()
+        starts = frame[START_TIME_COL]
+        frame = frame[(starts >= lo) & (starts < hi)].reset_index(drop=True)
+        yield frame if columns is None else frame[list(columns)]
+
+
+def read_partitions(root: str = TRIP_DATASET_DIR, start_date: Optional[date] = None,
+                    end_date: Optional[date] = None, columns: Optional[List[str]] = None) -> pd.DataFrame:
+    """
+    Trips starting between start_date and end_date (inclusive; None = unbounded), reading only what overlaps.
+    """
+    frames = list(iter_partitions(root, start_date, end_date, columns))
+    if frames:
+        return pd.concat(frames, ignore_index=True)
+
+    # Nothing overlaps: an empty frame with the stored schema, if there is one.
+    manifest = read_manifest(root)
+    if manifest.empty:
+        return pd.DataFrame(columns=columns)
+    schema = pq.read_schema(os.path.join(root, manifest["path"].iloc[0]))
+    empty = schema.empty_table().to_pandas()
+    return empty if columns is None else empty[list(columns)]
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    from src.data_processor.loading_cleaning import prepare_data
+
+    parser = argparse.ArgumentParser(description="Append cleaned trips to the partitioned Parquet store.")
+    parser.add_argument("--source", required=True, help="CSV, .zip or .gz export to add.")
+    parser.add_argument("--root", default=TRIP_DATASET_DIR)
+    parser.add_argument("--granularity", choices=GRANULARITIES, default="month")
+    parser.add_argument("--mode", choices=WRITE_MODES, default="error",
+                        help="What to do when a partition already holds trips.")
+    args = parser.parse_args(argv)
+
+    added = write_partitions(prepare_data(args.source), args.root, args.granularity, mode=args.mode)
+    print(f"Wrote {added['rows'].sum():,} trips to {len(added)} partition file(s) under {args.root}")
+
+
+if __name__ == "__main__":
+    main()
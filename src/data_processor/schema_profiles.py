@@ -0,0 +1,293 @@
+# src/data_processor/schema_profiles.py
+"""
+Format profiles for Toronto Bike Share exports from 2017 onwards.
+
+Each profile maps one historical header layout to the current schema
+(src/config.py) with explicit parse dtypes and datetime formats, so every
+year parses without per-value type or date-format inference and loads of
+several years concatenate cleanly.
+"""
+import csv
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+from urllib.request import urlopen
+
+import numpy as np
+import pandas as pd
+
+from src.config import (
+    TRIP_ID_COL, TRIP_DURATION_COL, START_TIME_COL, END_TIME_COL, USER_TYPE_COL, START_STATION_COL,
+    END_STATION_COL, START_STATION_ID_COL, END_STATION_ID_COL, BIKE_ID_COL, MODEL_COL, DOWNLOAD_TIMEOUT_SEC
+)
+from src.data_processor.fetch import is_remote
+
+# Column order of the current export; every profile normalises to it.
+CURRENT_COLUMNS = [TRIP_ID_COL, TRIP_DURATION_COL, START_STATION_ID_COL, START_TIME_COL, START_STATION_COL,
+                   END_STATION_ID_COL, END_TIME_COL, END_STATION_COL, BIKE_ID_COL, USER_TYPE_COL, MODEL_COL]
+TEXT_COLUMNS = {START_STATION_COL, END_STATION_COL, USER_TYPE_COL, MODEL_COL}
+INTEGER_COLUMNS = [TRIP_ID_COL, TRIP_DURATION_COL, START_STATION_ID_COL, END_STATION_ID_COL, BIKE_ID_COL]
+UNKNOWN_MODEL = "Unknown"
+
+
+def header_key(name: object) -> str:
+    """Case-, BOM- and whitespace-insensitive form of a header ('Trip  Duration' == 'trip duration')."""
+    return " ".join(str(name).replace("\ufeff", "").split()).lower()
+
+
+class FormatProfile(NamedTuple):
+    """
+    One export layout: source header -> current column, datetime formats tried in order,
+    values for current columns the layout lacks, and User Type values to rewrite.
+    """
+    name: str
+    columns: Dict[str, str]
+    datetime_formats: Tuple[str, ...]
+    defaults: Dict[str, object] = {}
+    user_types: Dict[str, str] = {}
+
+    def source_columns(self, header: Sequence[str]) -> Optional[Dict[str, str]]:
+        """Actual header name -> current column, or None if the header lacks one of the profile's columns."""
+        present = {header_key(col): col for col in header}
+        wanted = {header_key(col): target for col, target in self.columns.items()}
+        if not set(wanted) <= set(present):
+            return None
+        return {present[key]: target for key, target in wanted.items()}
+
+    def read_options(self, header: Sequence[str]) -> dict:
+        """usecols/dtype for read_csv: unmapped columns are skipped and text columns are not type-inferred."""
+        mapping = self.source_columns(header) or {}
+        return {
+            "usecols": list(mapping),
+            "dtype": {col: str for col, target in mapping.items() if target in TEXT_COLUMNS},
+        }
+
+    @property
+    def ambiguous_dates(self) -> bool:
+        """True when the formats include both month-first and day-first dates (decided per source)."""
+        return len({_month_first(fmt) for fmt in self.datetime_formats if _month_first(fmt) is not None}) > 1
+
+    def with_date_order(self, fmt: str) -> "FormatProfile":
+        """The profile keeping only the formats with fmt's month/day order."""
+        order = _month_first(fmt)
+        return self._replace(datetime_formats=tuple(
+            candidate for candidate in self.datetime_formats if _month_first(candidate) in (order, None)
+        ))
+
+    def normalise(self, df: pd.DataFrame) -> pd.DataFrame:
+        """The frame in the current schema: renamed, reordered, defaults filled and datetimes parsed."""
+        mapping = self.source_columns(df.columns)
+        if mapping is None:
+            raise KeyError(f"DataFrame does not match the '{self.name}' export format.")
+
+        out = df[list(mapping)].rename(columns=mapping)
+        for col, value in self.defaults.items():
+            out[col] = pd.Series(value, index=out.index, dtype="Int64" if col in INTEGER_COLUMNS else "object")
+        if self.user_types:
+            out[USER_TYPE_COL] = out[USER_TYPE_COL].replace(self.user_types)
+        for col in (START_TIME_COL, END_TIME_COL):
+            out[col] = parse_datetimes(out[col], self.datetime_formats)
+        return out[CURRENT_COLUMNS]
+
+    def cast(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Integer columns as int64 once null rows are gone (a chunk with a blank id would otherwise be float64);
+        columns this format lacks stay nullable.
+        """
+        dtypes = {col: "int64" for col in INTEGER_COLUMNS if col in df.columns and col not in self.defaults}
+        return df.astype(dtypes)
+
+
+def _month_first(fmt: str) -> Optional[bool]:
+    if "%m" not in fmt or "%d" not in fmt:
+        return None
+    return fmt.index("%m") < fmt.index("%d")
+
+
+# Zero-padded fields the fixed-width parser understands, with their widths and valid ranges.
+FIXED_WIDTH_FIELDS = {"Y": (4, 1, 9999), "m": (2, 1, 12), "d": (2, 1, 31), "H": (2, 0, 23), "M": (2, 0, 59),
+                      "S": (2, 0, 59)}
+
+
+def _parse_fixed_width(values: pd.Series, fmt: str) -> Optional[pd.Series]:
+    """
+    Vectorized parse of zero-padded layouts such as '%m/%d/%Y %H:%M': digits are read straight from
+    the byte matrix of the strings. None if any value doesn't fit the layout exactly (the caller falls back).
+    """
+    layout, position, literal = [], 0, []
+    tokens = iter(fmt)
+    for char in tokens:
+        if char == "%":
+            field = next(tokens, "")
+            if field not in FIXED_WIDTH_FIELDS:
+                return None
+            layout.append((field, position))
+            position += FIXED_WIDTH_FIELDS[field][0]
+        else:
+            literal.append((position, ord(char)))
+            position += 1
+    width = position
+
+    present = values.notna().to_numpy()
+    if values.dtype != object or not present.any():
+        return None
+    strings = values.to_numpy()[present]
+    if not all(isinstance(value, str) for value in strings[:1]):
+        return None
+    raw = strings.astype(f"S{width + 1}")  # One extra byte exposes values longer than the layout.
+    if (np.char.str_len(raw) != width).any():
+        return None
+
+    chars = raw.view(np.uint8).reshape(len(raw), width + 1)[:, :width]
+    if any((chars[:, at] != code).any() for at, code in literal):
+        return None
+    digits = chars.astype(np.int64) - ord("0")
+    fields = {}
+    for field, start in layout:
+        size, low, high = FIXED_WIDTH_FIELDS[field]
+        block = digits[:, start:start + size]
+        if ((block < 0) | (block > 9)).any():
+            return None
+        number = block @ (10 ** np.arange(size - 1, -1, -1))
+        if ((number < low) | (number > high)).any():
+            return None
+        fields[field] = number
+    if not {"Y", "m", "d"} <= set(fields):
+        return None
+
+    months = np.array(fields["Y"] - 1970, dtype="datetime64[Y]").astype("datetime64[M]") + (fields["m"] - 1)
+    days = months.astype("datetime64[D]") + (fields["d"] - 1)
+    if (days.astype("datetime64[M]") != months).any():  # e.g. 02/30: the day ran into the next month
+        return None
+    seconds = fields.get("H", 0) * 3600 + fields.get("M", 0) * 60 + fields.get("S", 0)
+
+    parsed = np.full(len(values), np.datetime64("NaT"), dtype="datetime64[ns]")
+    parsed[present] = (days.astype("datetime64[s]") + seconds).astype("datetime64[ns]")
+    return pd.Series(parsed, index=values.index, name=values.name)
+
+
+def _parse_with(values: pd.Series, fmt: str) -> Optional[pd.Series]:
+    parsed = _parse_fixed_width(values, fmt)
+    if parsed is not None:
+        return parsed
+    try:
+        return pd.to_datetime(values, format=fmt)
+    except (ValueError, TypeError):
+        return None
+
+
+def parse_datetimes(values: pd.Series, formats: Sequence[str]) -> pd.Series:
+    """
+    Parses with the first format that fits every value, falling back to pandas' inference.
+
+    Zero-padded values are read by position (several times faster than strptime);
+    anything else in a format goes through pd.to_datetime(format=...). Day-first and
+    month-first layouts are told apart only by values that fit just one of them, so
+    chunked loads settle the order for the whole source first (see sniff_profile).
+    """
+    if pd.api.types.is_datetime64_any_dtype(values):
+        return values
+    for fmt in formats:
+        parsed = _parse_with(values, fmt)
+        if parsed is not None:
+            return parsed
+    return pd.to_datetime(values)
+
+
+def resolve_datetime_format(values: pd.Series, formats: Sequence[str]) -> Optional[str]:
+    """The first of formats that parses every value, or None."""
+    return next((fmt for fmt in formats if _parse_with(values, fmt) is not None), None)
+
+
+# Checked in order; the first profile whose columns are all present wins.
+PROFILES: List[FormatProfile] = [
+    # 2023 onwards: Title Case headers, double-spaced 'Trip  Duration', bike Model column.
+    FormatProfile(
+        name="current",
+        columns={col: col for col in CURRENT_COLUMNS},
+        datetime_formats=("%m/%d/%Y %H:%M", "%m/%d/%Y %H:%M:%S", "%Y-%m-%d %H:%M:%S"),
+    ),
+    # 2019-2022: same headers without Model (2019-2020 add a Subscription Id, which is dropped).
+    FormatProfile(
+        name="2019",
+        columns={col: col for col in CURRENT_COLUMNS if col != MODEL_COL},
+        datetime_formats=("%m/%d/%Y %H:%M", "%m/%d/%Y %H:%M:%S", "%Y-%m-%d %H:%M:%S"),
+        defaults={MODEL_COL: UNKNOWN_MODEL},
+    ),
+    # 2017-2018: snake_case headers, no bike ids, Member/Casual user types. Early 2017 quarters are day-first.
+    FormatProfile(
+        name="2017",
+        columns={
+            "trip_id": TRIP_ID_COL, "trip_duration_seconds": TRIP_DURATION_COL,
+            "from_station_id": START_STATION_ID_COL, "trip_start_time": START_TIME_COL,
+            "from_station_name": START_STATION_COL, "to_station_id": END_STATION_ID_COL,
+            "trip_stop_time": END_TIME_COL, "to_station_name": END_STATION_COL, "user_type": USER_TYPE_COL,
+        },
+        datetime_formats=("%m/%d/%Y %H:%M", "%m/%d/%Y %H:%M:%S", "%d/%m/%Y %H:%M", "%d/%m/%Y %H:%M:%S"),
+        defaults={BIKE_ID_COL: pd.NA, MODEL_COL: UNKNOWN_MODEL},
+        user_types={"Member": "Annual Member", "Casual": "Casual Member"},
+    ),
+]
+
+
+def detect_profile(header: Sequence[str]) -> Optional[FormatProfile]:
+    """The profile matching a header, or None for layouts we don't know (loaded as-is)."""
+    return next((profile for profile in PROFILES if profile.source_columns(header) is not None), None)
+
+
+def _is_seekable(source) -> bool:
+    return getattr(source, "seekable", lambda: False)()
+
+
+def _peek(source, read):
+    """read(source) for a path, or for a seekable stream put back where it was."""
+    if isinstance(source, str):
+        return read(source)
+    position = source.tell()
+    try:
+        return read(source)
+    finally:
+        source.seek(position)
+
+
+def sniff_header(source) -> Optional[List[str]]:
+    """
+    Column names of a CSV path, URL or seekable stream, leaving a stream where it was;
+    None if it can't be peeked. For a URL only the first line is read from the response.
+    """
+    if is_remote(source):
+        with urlopen(source, timeout=DOWNLOAD_TIMEOUT_SEC) as response:
+            return next(csv.reader([response.readline().decode("utf-8")]), None)
+    if isinstance(source, str) or _is_seekable(source):
+        return _peek(source, lambda handle: list(pd.read_csv(handle, nrows=0).columns))
+    return None
+
+
+def sniff_profile(source) -> Tuple[Optional[FormatProfile], dict]:
+    """
+    The source's format profile and read_csv keyword arguments ((None, {}) when unknown or not peekable).
+
+    When the profile allows both day-first and month-first dates, the start and
+    end times of the whole (local) source are checked once and the profile keeps
+    only the order that fits them, so every chunk of the source parses alike.
+    """
+    header = sniff_header(source)
+    profile = detect_profile(header) if header is not None else None
+    if profile is None:
+        return None, {}
+
+    options = profile.read_options(header)
+    if profile.ambiguous_dates and not is_remote(source) and (isinstance(source, str) or _is_seekable(source)):
+        time_columns = [col for col, target in profile.source_columns(header).items()
+                        if target in (START_TIME_COL, END_TIME_COL)]
+        times = _peek(source, lambda handle: pd.read_csv(handle, usecols=time_columns, dtype=str))
+        values = pd.concat([times[col] for col in time_columns], ignore_index=True).dropna()
+        fmt = resolve_datetime_format(values, profile.datetime_formats)
+        if fmt is not None:
+            profile = profile.with_date_order(fmt)
+    return profile, options
+
+
+def read_options(source) -> dict:
+    """read_csv keyword arguments for the source's format ({} when unknown or not peekable)."""
+    header = sniff_header(source)
+    profile = detect_profile(header) if header is not None else None
+    return profile.read_options(header) if profile is not None else {}
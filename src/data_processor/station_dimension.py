@@ -0,0 +1,168 @@
+# src/data_processor/station_dimension.py
+import os
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from src.config import (
+    START_TIME_COL, END_TIME_COL, START_STATION_COL, END_STATION_COL,
+    START_STATION_ID_COL, END_STATION_ID_COL, START_STATION_CODE_COL, END_STATION_CODE_COL,
+    STATION_DIM_FILE_PATH
+)
+
+UNKNOWN_CODE = -1
+
+# (id column, name column, time column, code column) for each end of a trip.
+TRIP_ENDS = [
+    (START_STATION_ID_COL, START_STATION_COL, START_TIME_COL, START_STATION_CODE_COL),
+    (END_STATION_ID_COL, END_STATION_COL, END_TIME_COL, END_STATION_CODE_COL),
+]
+
+
+class StationDimension:
+    """
+    Persistent station table keyed by station id, shared across monthly files.
+
+    Each station keeps a canonical name (the most recently seen one), first
+    and last seen timestamps, every alias it was exported under, and a small
+    integer code. Codes are assigned in order of first appearance and never
+    change, so trip frames encoded from different files (or sessions) can be
+    concatenated and grouped on the codes directly; names are joined back
+    with decode() when a result is rendered.
+    """
+
+    def __init__(self, path: Optional[str] = STATION_DIM_FILE_PATH):
+        self.path = path
+        # One row per (station_id, name) ever seen, with its first/last timestamps.
+        self._aliases = pd.DataFrame({
+            "station_id": pd.Series(dtype="int64"), "name": pd.Series(dtype="object"),
+            "first_seen": pd.Series(dtype="datetime64[ns]"), "last_seen": pd.Series(dtype="datetime64[ns]"),
+        })
+        self._codes = pd.Series(dtype="int32", index=pd.Index([], dtype="int64", name="station_id"), name="code")
+        self._table: Optional[pd.DataFrame] = None
+
+    @classmethod
+    def load(cls, path: str = STATION_DIM_FILE_PATH) -> "StationDimension":
+        """Reads a dimension saved with save(); a missing file gives an empty dimension at that path."""
+        dimension = cls(path)
+        if os.path.exists(path):
+            stored = pd.read_parquet(path)
+            dimension._aliases = stored.drop(columns="code")
+            codes = stored.drop_duplicates("station_id").set_index("station_id")["code"].sort_values()
+            dimension._codes = codes.astype("int32")
+        return dimension
+
+    def save(self, path: Optional[str] = None) -> None:
+        """Writes one row per (station_id, alias) with the station's code; table is derived from it on load."""
+        path = path or self.path
+        if path is None:
+            raise ValueError("No path to save the station dimension to.")
+        self._aliases.join(self._codes, on="station_id").to_parquet(path, index=False)
+
+    def __len__(self) -> int:
+        return len(self._codes)
+
+    @property
+    def code_dtype(self) -> str:
+        """int16 while the codes fit (about 32k stations), int32 beyond."""
+        return "int16" if len(self._codes) < np.iinfo(np.int16).max else "int32"
+
+    def update(self, df: pd.DataFrame) -> "StationDimension":
+        """
+        Folds the station ids and names of a trip frame into the dimension; new ids get the next free codes.
+        """
+        parts = []
+        for id_col, name_col, time_col, _ in TRIP_ENDS:
+            if id_col not in df.columns or name_col not in df.columns:
+                continue
+            times = df[time_col] if time_col in df.columns else pd.Series(pd.NaT, index=df.index)
+            parts.append(pd.DataFrame({"station_id": pd.to_numeric(df[id_col], errors="coerce"),
+                                       "name": df[name_col], "time": times}))
+        if not parts:
+            raise KeyError(f"DataFrame must contain '{START_STATION_ID_COL}' and '{START_STATION_COL}' columns.")
+
+        seen = pd.concat(parts, ignore_index=True).dropna(subset=["station_id", "name"])
+        seen["station_id"] = seen["station_id"].astype("int64")
+        observed = (
+            seen.groupby(["station_id", "name"], sort=False)["time"]
+                .agg(first_seen="min", last_seen="max")
+                .reset_index()
+        )
+
+        aliases = pd.concat([self._aliases, observed], ignore_index=True)
+        self._aliases = (
+            aliases.groupby(["station_id", "name"], sort=False)
+                   .agg(first_seen=("first_seen", "min"), last_seen=("last_seen", "max"))
+                   .reset_index()
+        )
+
+        # Stable codes: existing ids keep theirs, new ids are numbered in order of appearance.
+        new_ids = pd.Index(observed["station_id"].unique()).difference(self._codes.index, sort=False)
+        if len(new_ids):
+            start = len(self._codes)
+            new_codes = pd.Series(np.arange(start, start + len(new_ids), dtype="int32"),
+                                  index=pd.Index(new_ids, dtype="int64", name="station_id"), name="code")
+            self._codes = pd.concat([self._codes, new_codes])
+        self._table = None
+        return self
+
+    @property
+    def table(self) -> pd.DataFrame:
+        """
+        One row per station: code, station_id, name (canonical), first_seen, last_seen, aliases.
+        """
+        if self._table is None:
+            aliases = self._aliases.sort_values(["station_id", "last_seen"], kind="stable", na_position="first")
+            grouped = aliases.groupby("station_id", sort=False)
+            table = pd.DataFrame({
+                "name": grouped["name"].last(),
+                "first_seen": grouped["first_seen"].min(),
+                "last_seen": grouped["last_seen"].max(),
+                "aliases": grouped["name"].agg(lambda names: sorted(names)),
+            })
+            table = table.join(self._codes, how="right").rename_axis("station_id").reset_index()
+            self._table = table.sort_values("code").reset_index(drop=True)[
+                ["code", "station_id", "name", "first_seen", "last_seen", "aliases"]
+            ]
+        return self._table
+
+    def codes_for(self, station_ids: pd.Series) -> np.ndarray:
+        """Codes for a column of station ids; ids missing from the dimension map to UNKNOWN_CODE (-1)."""
+        ids = pd.to_numeric(station_ids, errors="coerce")
+        # Look up the few distinct ids once, then broadcast back to the rows.
+        uniques_pos, uniques = pd.factorize(ids)
+        position = self._codes.index.get_indexer(pd.Index(uniques).astype("int64"))
+        codes = np.where(position >= 0, self._codes.to_numpy()[position], UNKNOWN_CODE)
+        codes = np.append(codes, UNKNOWN_CODE)  # factorize marks missing ids with -1
+        return codes[uniques_pos].astype(self.code_dtype)
+
+    def encode(self, df: pd.DataFrame, drop_names: bool = False) -> pd.DataFrame:
+        """
+        Adds start/end station code columns; with drop_names=True the name columns are removed.
+        """
+        encoded = [end for end in TRIP_ENDS if end[0] in df.columns]
+        dropped = [name_col for _, name_col, _, _ in encoded if drop_names and name_col in df.columns]
+        out = df.drop(columns=dropped) if dropped else df.copy()
+        for id_col, _, _, code_col in encoded:
+            out[code_col] = self.codes_for(df[id_col])
+        return out
+
+    def names(self, codes) -> pd.Series:
+        """Canonical names for codes, in the same order; unknown codes give "Unknown"."""
+        # Codes are 0..n-1 and the table is sorted by code, so a code is its row position.
+        lookup = np.append(self.table["name"].to_numpy(dtype="object"), "Unknown")
+        codes = np.asarray(codes, dtype="int64")
+        codes = np.where((codes >= 0) & (codes < len(lookup) - 1), codes, len(lookup) - 1)
+        return pd.Series(lookup[codes], dtype="object")
+
+    def decode(self, df: pd.DataFrame, code_col: str = START_STATION_CODE_COL,
+               name_col: str = START_STATION_COL) -> pd.DataFrame:
+        """
+        Replaces a code column by the canonical station names, in the same position (e.g. for a top-N table).
+        """
+        if code_col not in df.columns:
+            raise KeyError(f"DataFrame must contain '{code_col}' column.")
+        out = df.copy()
+        out[code_col] = self.names(out[code_col]).to_numpy()
+        return out.rename(columns={code_col: name_col})
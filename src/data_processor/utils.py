@@ -1,8 +1,21 @@
 # src/data_processor/utils.py
 import pandas as pd
-from typing import Tuple
+from typing import Iterable, Optional, Tuple
 from datetime import time, date
-from src.config import START_TIME_COL,DURATION_MIN_COL
+from src.config import START_TIME_COL,DURATION_MIN_COL,START_STATION_ID_COL,MINUTE_OF_DAY_COL,DAY_ORDINAL_COL
+from src.data_processor.feature_engineering import first_minute_from, last_minute_until
+from src.data_processor.holiday_calendar import EPOCH
+
+
+def fill_unknown(values: pd.Series, label: str = "Unknown") -> pd.Series:
+    """values with missing entries as label; categoricals (e.g. read from an Arrow handoff) gain the category first."""
+    if isinstance(values.dtype, pd.CategoricalDtype) and label not in values.cat.categories:
+        values = values.cat.add_categories([label])
+    return values.fillna(label)
+
+
+def _since_midnight(t: time) -> pd.Timedelta:
+    return pd.Timedelta(hours=t.hour, minutes=t.minute, seconds=t.second, microseconds=t.microsecond)
 
 
 def filter_data_advanced(
@@ -11,35 +24,51 @@ def filter_data_advanced(
         min_duration: float,
         max_duration: float,
         start_date: date,  # <- NEW: Added start_date parameter
-        end_date: date     # <- NEW: Added end_date parameter
+        end_date: date,    # <- NEW: Added end_date parameter
+        station_ids: Optional[Iterable] = None
 ) -> pd.DataFrame:
     """
     Fulfills US-7 AC: Applies advanced filtering criteria to the DataFrame.
 
     Requires: 'start_time' as datetime object and 'trip_duration_min' as float.
+    Optionally keeps only trips starting at one of `station_ids` (e.g. from StationIndex.station_ids_within).
+    Uses the integer calendar columns when the frame has them (see add_calendar_features).
     """
+    start_time_min, start_time_max = start_time_range
+    if MINUTE_OF_DAY_COL in df.columns and DAY_ORDINAL_COL in df.columns:
+        minute = df[MINUTE_OF_DAY_COL].to_numpy()
+        day = df[DAY_ORDINAL_COL].to_numpy()
+        duration = df[DURATION_MIN_COL].to_numpy()
+        combined_mask = ((minute >= first_minute_from(start_time_min)) & (minute <= last_minute_until(start_time_max))
+                         & (duration >= min_duration) & (duration <= max_duration)
+                         & (day >= (start_date - EPOCH).days) & (day <= (end_date - EPOCH).days))
+        if station_ids is not None:
+            combined_mask &= df[START_STATION_ID_COL].isin(list(station_ids)).to_numpy()
+        return df[combined_mask].copy()
 
     # ----------------------------------------------------
     # TDD Task 7.2 & 7.4: Implement combined filtering logic (GREEN)
     # ----------------------------------------------------
 
-    # 1. TIME FILTER (Requires converting start_time datetime to a time object)
-    start_time_only = df[START_TIME_COL].dt.time
-    start_time_min, start_time_max = start_time_range
+    # 1. TIME FILTER (time of day as an offset from midnight; avoids building datetime.time objects)
+    start_times = df[START_TIME_COL]
+    start_days = start_times.dt.floor("D")
+    time_of_day = start_times - start_days
 
-    time_mask = (start_time_only >= start_time_min) & (start_time_only <= start_time_max)
+    time_mask = (time_of_day >= _since_midnight(start_time_min)) & (time_of_day <= _since_midnight(start_time_max))
 
     # 2. DURATION FILTER
     duration_mask = (df[DURATION_MIN_COL] >= min_duration) & (df[DURATION_MIN_COL] <= max_duration)
 
     # 3. DATE FILTER (NEW LOGIC)
-    # Extract the date component from the full datetime column for comparison
-    start_date_only = df[START_TIME_COL].dt.date
-
-
-    date_mask = (start_date_only >= start_date) & (start_date_only <= end_date)
+    # Compare the midnight of each trip's day with the bounds (same as comparing .dt.date)
+    date_mask = (start_days >= pd.Timestamp(start_date)) & (start_days <= pd.Timestamp(end_date))
 
     # 4. COMBINED MASK (Applies all three criteria simultaneously)
     combined_mask = time_mask & duration_mask & date_mask  # <- UPDATED TO INCLUDE DATE_MASK
 
+    # 5. STATION FILTER (optional, e.g. stations within a radius)
+    if station_ids is not None:
+        combined_mask &= df[START_STATION_ID_COL].isin(list(station_ids))
+
     return df[combined_mask].copy()
\ No newline at end of file
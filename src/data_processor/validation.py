@@ -0,0 +1,106 @@
+# src/data_processor/validation.py
+from typing import NamedTuple, Optional
+
+import numpy as np
+import pandas as pd
+
+from src.config import (
+    TRIP_ID_COL, TRIP_DURATION_COL, START_TIME_COL, END_TIME_COL,
+    START_STATION_ID_COL, END_STATION_ID_COL,
+    DURATION_TOLERANCE_SEC, MAX_TRIP_DURATION_SEC, MIN_STATION_ID, MAX_STATION_ID,
+    QUALITY_FLAGS_COL
+)
+
+# Each rule owns one bit of the quality_flags bitmask, so a row can report several problems at once.
+RULE_BITS = {
+    "duration_mismatch": 1,
+    "end_before_start": 2,
+    "duplicate_trip_id": 4,
+    "invalid_station_id": 8,
+    "duration_outlier": 16,
+}
+
+VALID_POLICIES = ("drop", "flag")
+
+
+class ValidationResult(NamedTuple):
+    data: pd.DataFrame
+    report: pd.DataFrame
+    quarantine: Optional[pd.DataFrame]
+
+
+def _station_id_mask(ids: pd.Series) -> np.ndarray:
+    """True where a station id is missing, non-numeric or outside the known id range."""
+    numeric = pd.to_numeric(ids, errors="coerce").to_numpy(dtype="float64", na_value=np.nan)
+    with np.errstate(invalid="ignore"):
+        return ~((numeric >= MIN_STATION_ID) & (numeric <= MAX_STATION_ID) & (numeric == np.floor(numeric)))
+
+
+def validate_data(
+        df: pd.DataFrame,
+        policy: str = "drop",
+        quarantine: bool = False,
+        prior_trip_ids: Optional[pd.Index] = None
+) -> ValidationResult:
+    """
+    Runs every data-quality rule over the frame as vectorized masks in a single pass.
+
+    policy="drop" removes violating rows, policy="flag" keeps them and adds a
+    'quality_flags' bitmask column (see RULE_BITS). When quarantine=True the
+    violating rows are also returned separately. prior_trip_ids lets chunked
+    loaders catch duplicate 'Trip Id's that span chunk boundaries.
+    """
+    if policy not in VALID_POLICIES:
+        raise ValueError(f"Invalid policy: {policy}. Expected one of {VALID_POLICIES}.")
+
+    required_cols = [TRIP_ID_COL, TRIP_DURATION_COL, START_TIME_COL, END_TIME_COL,
+                     START_STATION_ID_COL, END_STATION_ID_COL]
+    for col in required_cols:
+        if col not in df.columns:
+            raise KeyError(f"DataFrame must contain '{col}' column.")
+
+    # Work on raw int64 nanoseconds so the comparisons stay in NumPy.
+    start_ns = df[START_TIME_COL].to_numpy(dtype="datetime64[ns]").view("int64")
+    end_ns = df[END_TIME_COL].to_numpy(dtype="datetime64[ns]").view("int64")
+    computed_sec = (end_ns - start_ns) / 1e9
+    reported_sec = pd.to_numeric(df[TRIP_DURATION_COL], errors="coerce").to_numpy(dtype="float64", na_value=np.nan)
+
+    trip_ids = df[TRIP_ID_COL]
+    duplicated = trip_ids.duplicated(keep="first").to_numpy()
+    if prior_trip_ids is not None and len(prior_trip_ids):
+        duplicated |= trip_ids.isin(prior_trip_ids).to_numpy()
+
+    with np.errstate(invalid="ignore"):
+        masks = {
+            "duration_mismatch": ~(np.abs(reported_sec - computed_sec) <= DURATION_TOLERANCE_SEC),
+            "end_before_start": end_ns < start_ns,
+            "duplicate_trip_id": duplicated,
+            "invalid_station_id": (_station_id_mask(df[START_STATION_ID_COL])
+                                   | _station_id_mask(df[END_STATION_ID_COL])),
+            "duration_outlier": (reported_sec > MAX_TRIP_DURATION_SEC) | (computed_sec > MAX_TRIP_DURATION_SEC),
+        }
+
+    flags = np.zeros(len(df), dtype=np.uint8)
+    for rule, mask in masks.items():
+        flags |= mask.astype(np.uint8) * np.uint8(RULE_BITS[rule])
+
+    n_rows = len(df)
+    report = pd.DataFrame({
+        "rule": list(masks),
+        "violations": [int(mask.sum()) for mask in masks.values()],
+    })
+    report["share"] = report["violations"] / n_rows if n_rows else 0.0
+
+    bad = flags != 0
+    quarantined = None
+    if quarantine:
+        quarantined = df[bad].copy()
+        quarantined[QUALITY_FLAGS_COL] = flags[bad]
+
+    if policy == "drop":
+        clean = df[~bad].copy()
+    else:
+        clean = df.copy()
+        clean[QUALITY_FLAGS_COL] = flags
+
+    return ValidationResult(clean, report, quarantined)
@@ -0,0 +1,96 @@
+# src/import_benchmark.py
+"""
+Cold-import benchmark built on `python -X importtime`.
+
+Usage:
+    python -m src.import_benchmark --target dashboard --repeat 5 --output data/import_times.jsonl
+"""
+import argparse
+import json
+import re
+import subprocess
+import sys
+import time
+from typing import List, Optional
+
+import numpy as np
+import pandas as pd
+
+# Charting stacks that should only load when a chart is drawn.
+HEAVY_MODULES = ("plotly.express", "altair")
+
+_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)\s*$")
+
+
+def parse_importtime(stderr: str) -> pd.DataFrame:
+    """
+    One row per imported module from -X importtime output: module, self_ms, cumulative_ms, depth (0 = top level).
+    """
+    rows = []
+    for line in stderr.splitlines():
+        match = _LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, module = match.groups()
+            rows.append((module, int(self_us) / 1000, int(cumulative_us) / 1000, (len(indent) - 1) // 2))
+    return pd.DataFrame(rows, columns=["module", "self_ms", "cumulative_ms", "depth"])
+
+
+def measure_import(target: str, repeat: int = 3, top: int = 10) -> dict:
+    """
+    Imports `target` in `repeat` fresh interpreters and reports the median cost.
+
+    total_ms sums the top-level imports as reported by importtime; wall_ms
+    is the whole interpreter run, startup included.
+    """
+    totals, walls, last = [], [], None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {target}"],
+                                capture_output=True, text=True)
+        walls.append((time.perf_counter() - started) * 1000)
+        if result.returncode != 0:
+            raise RuntimeError(f"Importing {target} failed:\n{result.stderr[-2000:]}")
+
+        last = parse_importtime(result.stderr)
+        totals.append(last.loc[last["depth"] == 0, "cumulative_ms"].sum())
+
+    # Direct imports of the top-level modules: where the target's own cost goes.
+    heaviest = last[last["depth"] == 1].nlargest(top, "cumulative_ms")
+    return {
+        "target": target,
+        "total_ms": float(np.median(totals)),
+        "wall_ms": float(np.median(walls)),
+        "modules": len(last),
+        "heavy_loaded": [module for module in HEAVY_MODULES if module in set(last["module"])],
+        "heaviest": dict(zip(heaviest["module"], heaviest["cumulative_ms"].round(1))),
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Measure cold import time with -X importtime.")
+    parser.add_argument("--target", action="append", help="Module to import (repeatable); default: dashboard.")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--top", type=int, default=10)
+    parser.add_argument("--budget-ms", type=float, default=None, help="Exit non-zero if a target exceeds this.")
+    parser.add_argument("--output", default=None, help="Append results as JSON lines to this file.")
+    args = parser.parse_args(argv)
+
+    over_budget = False
+    for target in args.target or ["dashboard"]:
+        result = measure_import(target, args.repeat, args.top)
+        print(f"{target}: {result['total_ms']:.0f} ms in imports, {result['wall_ms']:.0f} ms wall, "
+              f"{result['modules']} modules, heavy stacks loaded: {result['heavy_loaded'] or 'none'}")
+        for module, ms in result["heaviest"].items():
+            print(f"  {ms:>8.1f} ms  {module}")
+
+        if args.output:
+            with open(args.output, "a") as fh:
+                fh.write(json.dumps({"recorded_at": pd.Timestamp.now().isoformat(), **result}) + "\n")
+        over_budget |= args.budget_ms is not None and result["total_ms"] > args.budget_ms
+
+    if over_budget:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
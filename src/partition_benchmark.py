@@ -0,0 +1,118 @@
+# src/partition_benchmark.py
+"""
+Date-range reads from the partitioned Parquet store vs. scanning the whole history.
+
+Synthetic history is appended one year at a time (append-only writes); after
+each year a fixed one-week query is timed against a full scan, then a range
+sweep shows read time following the selected range.
+
+Usage:
+    python -m src.partition_benchmark --years 3 --rows-per-month 100000
+"""
+import argparse
+import glob
+import os
+import tempfile
+import time
+from datetime import date, timedelta
+from typing import Callable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from src.config import (
+    TRIP_ID_COL, TRIP_DURATION_COL, START_TIME_COL, END_TIME_COL, USER_TYPE_COL,
+    START_STATION_COL, END_STATION_COL, START_STATION_ID_COL, END_STATION_ID_COL, BIKE_ID_COL, MODEL_COL
+)
+from src.data_processor.partitioned_store import plan_scan, read_partitions, write_partitions
+
+FIRST_YEAR = 2021
+RANGES = {"1 day": 1, "1 week": 7, "1 month": 30, "3 months": 91, "1 year": 365}
+
+
+def synthetic_year(year: int, rows_per_month: int, seed: int = 0) -> pd.DataFrame:
+    """Cleaned-looking trips spread uniformly over one year."""
+    rng = np.random.default_rng(seed + year)
+    n = rows_per_month * 12
+    start = pd.Timestamp(year=year, month=1, day=1)
+    seconds = rng.integers(0, int((pd.Timestamp(year=year + 1, month=1, day=1) - start).total_seconds()), n)
+    starts = start + pd.to_timedelta(np.sort(seconds), unit="s")
+    durations = rng.integers(60, 3600, n)
+    start_ids, end_ids = rng.integers(7000, 7800, n), rng.integers(7000, 7800, n)
+    return pd.DataFrame({
+        TRIP_ID_COL: np.arange(n) + year * 100_000_000,
+        TRIP_DURATION_COL: durations,
+        START_STATION_ID_COL: start_ids,
+        START_TIME_COL: starts,
+        START_STATION_COL: pd.Series(start_ids).map("Station {}".format),
+        END_STATION_ID_COL: end_ids,
+        END_TIME_COL: starts + pd.to_timedelta(durations, unit="s"),
+        END_STATION_COL: pd.Series(end_ids).map("Station {}".format),
+        BIKE_ID_COL: rng.integers(1, 8000, n),
+        USER_TYPE_COL: rng.choice(["Annual Member", "Casual Member"], n),
+        MODEL_COL: "ICONIC",
+    })
+
+
+def full_scan(root: str, start_date: date, end_date: date) -> pd.DataFrame:
+    """Baseline: read every file, then filter in memory."""
+    df = pd.read_parquet(sorted(glob.glob(os.path.join(root, "year=*", "**", "*.parquet"), recursive=True)))
+    days = df[START_TIME_COL].dt.floor("D")
+    return df[(days >= pd.Timestamp(start_date)) & (days <= pd.Timestamp(end_date))]
+
+
+def _median_seconds(fn: Callable[[], pd.DataFrame], repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - started)
+    return float(np.median(timings))
+
+
+def run_benchmark(root: str, years: int, rows_per_month: int, repeat: int = 3) -> dict:
+    week = (date(FIRST_YEAR, 6, 1), date(FIRST_YEAR, 6, 7))
+
+    history = []
+    for offset in range(years):
+        write_partitions(synthetic_year(FIRST_YEAR + offset, rows_per_month), root)
+        history.append({
+            "history_years": offset + 1,
+            "pruned_s": _median_seconds(lambda: read_partitions(root, *week), repeat),
+            "full_scan_s": _median_seconds(lambda: full_scan(root, *week), repeat),
+        })
+
+    last_day = date(FIRST_YEAR + years, 1, 1) - timedelta(days=1)
+    sweep = []
+    for label, days in RANGES.items():
+        start = max(date(FIRST_YEAR, 1, 1), last_day - timedelta(days=days - 1))
+        plan = plan_scan(root, start, last_day)
+        sweep.append({
+            "range": label,
+            "files": plan["path"].nunique(),
+            "row_groups": len(plan),
+            "rows_read": int(plan["rows"].sum()),
+            "seconds": _median_seconds(lambda: read_partitions(root, start, last_day), repeat),
+        })
+
+    return {"history": pd.DataFrame(history), "sweep": pd.DataFrame(sweep)}
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Benchmark date-range reads from the partitioned store.")
+    parser.add_argument("--years", type=int, default=3)
+    parser.add_argument("--rows-per-month", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as root:
+        result = run_benchmark(root, args.years, args.rows_per_month, args.repeat)
+
+    print("One-week query as history grows:")
+    print(result["history"].round(3).to_string(index=False))
+    print("\nRanges ending on the last day of history:")
+    print(result["sweep"].round(3).to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
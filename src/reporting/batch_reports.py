@@ -0,0 +1,202 @@
+# src/reporting/batch_reports.py
+"""
+Headless renderer for the standard dashboard views, one report per month x rider type.
+
+Usage:
+    python -m src.reporting.batch_reports --source data/bike_share_data.csv --output reports
+"""
+import argparse
+import hashlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, NamedTuple, Optional
+
+import pandas as pd
+
+from src.analytics.plot_top_stations import plot_top_stations
+from src.analytics.plotting import plot_daily_rides, plot_duration_histogram
+from src.analytics.stations import get_top_starting_stations
+from src.analytics.usage_patterns import calculate_daily_rides, calculate_kpis
+from src.config import (
+    URL, REPORTS_DIR, START_TIME_COL, START_STATION_COL, USER_TYPE_COL, DURATION_MIN_COL
+)
+from src.data_processor.rider_categorization import filter_by_rider_type
+
+# Bump when the rendering code changes so every artifact is rebuilt.
+REPORT_VERSION = 1
+RIDER_TYPES = ("All", "Annual member", "Casual")
+REPORT_COLUMNS = [START_TIME_COL, START_STATION_COL, USER_TYPE_COL, DURATION_MIN_COL, "rider_type"]
+MANIFEST_FILE = "manifest.json"
+
+
+class ReportJob(NamedTuple):
+    month: str
+    rider_type: str
+    data: pd.DataFrame
+    fingerprint: str
+    report_dir: str
+    top_n: int
+
+
+def _slug(rider_type: str) -> str:
+    return rider_type.lower().replace(" ", "_")
+
+
+def _fingerprint(df: pd.DataFrame, top_n: int) -> str:
+    digest = hashlib.sha256(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes())
+    digest.update(f"{top_n}:{REPORT_VERSION}".encode())
+    return digest.hexdigest()
+
+
+def build_report_jobs(df: pd.DataFrame, output_dir: str, top_n: int = 10) -> List[ReportJob]:
+    """
+    Splits the processed trips into one job per month x rider type, keeping only the columns the views use.
+    """
+    missing = [col for col in REPORT_COLUMNS if col not in df.columns]
+    if missing:
+        raise KeyError(f"DataFrame must contain {missing} columns.")
+
+    data = df[REPORT_COLUMNS]
+    months = data[START_TIME_COL].dt.strftime("%Y-%m")
+
+    jobs = []
+    for month, month_df in data.groupby(months, sort=True):
+        for rider_type in RIDER_TYPES:
+            subset = month_df if rider_type == "All" else filter_by_rider_type(month_df, rider_type)
+            if subset.empty:
+                continue
+            jobs.append(ReportJob(
+                month=month,
+                rider_type=rider_type,
+                data=subset,
+                fingerprint=_fingerprint(subset, top_n),
+                report_dir=os.path.join(output_dir, month, _slug(rider_type)),
+                top_n=top_n,
+            ))
+    return jobs
+
+
+def render_report(job: ReportJob) -> str:
+    """
+    Writes KPIs (JSON), tables (Parquet) and figures (HTML + JSON) for one job. Runs in a worker process.
+    """
+    os.makedirs(job.report_dir, exist_ok=True)
+    df = job.data
+
+    kpis = {"month": job.month, "rider_type": job.rider_type, **calculate_kpis(df)}
+    with open(os.path.join(job.report_dir, "kpis.json"), "w") as fh:
+        json.dump(kpis, fh, indent=2)
+
+    daily_rides = calculate_daily_rides(df)
+    daily_rides.to_parquet(os.path.join(job.report_dir, "daily_rides.parquet"))
+    _write_plotly(plot_daily_rides(daily_rides), job.report_dir, "daily_rides")
+
+    _write_plotly(plot_duration_histogram(df), job.report_dir, "duration_histogram")
+
+    top_df = get_top_starting_stations(df, job.top_n)
+    top_df.to_parquet(os.path.join(job.report_dir, "top_stations.parquet"), index=False)
+    chart = plot_top_stations(top_df, f"Top {job.top_n} Starting Stations")
+    chart.save(os.path.join(job.report_dir, "top_stations.html"))
+    with open(os.path.join(job.report_dir, "top_stations.json"), "w") as fh:
+        fh.write(chart.to_json())
+
+    return job.fingerprint
+
+
+def _write_plotly(fig, report_dir: str, name: str) -> None:
+    fig.write_html(os.path.join(report_dir, f"{name}.html"), include_plotlyjs="cdn")
+    with open(os.path.join(report_dir, f"{name}.json"), "w") as fh:
+        fh.write(fig.to_json())
+
+
+def _read_manifest(output_dir: str) -> dict:
+    path = os.path.join(output_dir, MANIFEST_FILE)
+    if not os.path.exists(path):
+        return {}
+    with open(path) as fh:
+        return json.load(fh)
+
+
+def render_reports(
+        df: pd.DataFrame,
+        output_dir: str = REPORTS_DIR,
+        top_n: int = 10,
+        max_workers: Optional[int] = None
+) -> pd.DataFrame:
+    """
+    Renders every month x rider type report across a process pool, skipping reports whose inputs are unchanged.
+    Returns one row per report with its status ('rendered' or 'skipped').
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    manifest = _read_manifest(output_dir)
+    jobs = build_report_jobs(df, output_dir, top_n)
+
+    def key(job: ReportJob) -> str:
+        return f"{job.month}/{_slug(job.rider_type)}"
+
+    pending = [
+        job for job in jobs
+        if manifest.get(key(job)) != job.fingerprint or not os.path.exists(os.path.join(job.report_dir, "kpis.json"))
+    ]
+
+    if pending:
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            for job, fingerprint in zip(pending, pool.map(render_report, pending)):
+                manifest[key(job)] = fingerprint
+
+        with open(os.path.join(output_dir, MANIFEST_FILE), "w") as fh:
+            json.dump(manifest, fh, indent=2, sort_keys=True)
+
+    rendered = {key(job) for job in pending}
+    return pd.DataFrame({
+        "month": [job.month for job in jobs],
+        "rider_type": [job.rider_type for job in jobs],
+        "status": ["rendered" if key(job) in rendered else "skipped" for job in jobs],
+    })
+
+
+def load_report(output_dir: str, month: str, rider_type: str = "All") -> dict:
+    """
+    Reads a precomputed report back: KPIs, tables and the figure JSON specs, ready to serve without recomputing.
+    """
+    report_dir = os.path.join(output_dir, month, _slug(rider_type))
+    if not os.path.exists(os.path.join(report_dir, "kpis.json")):
+        raise FileNotFoundError(f"No precomputed report at: {report_dir}")
+
+    def read_text(name: str) -> str:
+        with open(os.path.join(report_dir, name)) as fh:
+            return fh.read()
+
+    return {
+        "kpis": json.loads(read_text("kpis.json")),
+        "daily_rides": pd.read_parquet(os.path.join(report_dir, "daily_rides.parquet")),
+        "top_stations": pd.read_parquet(os.path.join(report_dir, "top_stations.parquet")),
+        "daily_rides_figure": read_text("daily_rides.json"),
+        "duration_histogram_figure": read_text("duration_histogram.json"),
+        "top_stations_chart": read_text("top_stations.json"),
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    # Imported here so `--help` stays fast.
+    from src.data_processor.background_loader import run_feature_pipeline
+    from src.data_processor.loading_cleaning import prepare_data
+
+    parser = argparse.ArgumentParser(description="Precompute dashboard reports per month and rider type.")
+    parser.add_argument("--source", default=URL, help="CSV path or URL of the ridership data.")
+    parser.add_argument("--output", default=REPORTS_DIR, help="Directory for the rendered artifacts.")
+    parser.add_argument("--top-n", type=int, default=10, help="Number of stations in the top stations view.")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count).")
+    args = parser.parse_args(argv)
+
+    df, _ = run_feature_pipeline(prepare_data(args.source))
+    summary = render_reports(df, args.output, top_n=args.top_n, max_workers=args.workers)
+
+    counts = summary["status"].value_counts()
+    print(f"Rendered {counts.get('rendered', 0)} report(s), skipped {counts.get('skipped', 0)} unchanged, "
+          f"in {os.path.abspath(args.output)}")
+
+
+if __name__ == "__main__":
+    main()
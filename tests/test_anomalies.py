@@ -0,0 +1,77 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.analytics.anomalies import StationAnomalyDetector
+from src.config import START_TIME_COL, START_STATION_COL
+
+
+@pytest.fixture
+def mock_trips():
+    """
+    6 weeks of hourly departures at 4 stations with a daily rhythm, plus a 60-trip event at station "A".
+    """
+    rng = np.random.default_rng(5)
+    hours = pd.date_range("2024-07-01", periods=6 * 168, freq="h")
+    frames = []
+    for station, level in zip("ABCD", [2, 5, 8, 3]):
+        counts = rng.poisson(level * (1 + np.sin(2 * np.pi * hours.hour / 24) ** 2))
+        if station == "A":
+            counts[hours == "2024-08-08 14:00"] += 60
+        starts = np.repeat(hours.values, counts) + np.timedelta64(17, "m")
+        frames.append(pd.DataFrame({START_TIME_COL: starts, START_STATION_COL: station}))
+    return pd.concat(frames, ignore_index=True)
+
+
+def test_injected_spike_is_the_top_anomaly(mock_trips):
+    detector = StationAnomalyDetector(freq="h").update(mock_trips)
+    top = detector.anomalies(top_n=5)
+
+    assert top.loc[0, START_STATION_COL] == "A"
+    assert top.loc[0, "time"] == pd.Timestamp("2024-08-08 14:00")
+    assert top.loc[0, "direction"] == "spike"
+    assert top["score"].abs().is_monotonic_decreasing
+
+
+def test_scores_match_a_per_station_reference(mock_trips):
+    detector = StationAnomalyDetector(freq="h", window=4).update(mock_trips)
+
+    station = list(detector.stations).index("C")
+    series = detector.counts[station].astype(float)
+    t = 5 * 168 + 30
+    history = series[[t - 168 * k for k in range(1, 5)]]
+    median = np.median(history)
+    scale = max(1.4826 * np.median(np.abs(history - median)), np.sqrt(median), 1.0)
+
+    assert detector.expected[station, t] == pytest.approx(median)
+    assert detector.scores[station, t] == pytest.approx((series[t] - median) / scale, rel=1e-5)
+    # Buckets without a full window of history are not scored.
+    assert np.isnan(detector.scores[:, :4 * 168]).all()
+
+
+def test_appending_rescores_only_new_buckets(mock_trips):
+    cutoff = pd.Timestamp("2024-08-10")
+    incremental = StationAnomalyDetector().update(mock_trips[mock_trips[START_TIME_COL] < cutoff])
+    incremental.update(mock_trips[mock_trips[START_TIME_COL] >= cutoff])
+    full = StationAnomalyDetector().update(mock_trips)
+
+    assert incremental.rescored_buckets == len(full.times) - full.times.get_loc(cutoff)
+    np.testing.assert_array_equal(incremental.counts, full.counts)
+    np.testing.assert_array_equal(incremental.scores, full.scores)
+
+
+def test_new_station_spike_is_flagged(mock_trips):
+    # A station that appears late is added as a new row with zero history.
+    late = pd.DataFrame({START_TIME_COL: pd.to_datetime(["2024-08-09 10:00"] * 30), START_STATION_COL: "E"})
+    detector = StationAnomalyDetector(freq="D").update(mock_trips).update(late)
+
+    flagged = detector.anomalies(top_n=None)
+    assert "E" in set(flagged[START_STATION_COL])
+    assert detector.counts.shape == (5, 42)
+
+
+def test_invalid_arguments_raise(mock_trips):
+    with pytest.raises(ValueError):
+        StationAnomalyDetector(freq="W")
+    with pytest.raises(KeyError):
+        StationAnomalyDetector().update(mock_trips.drop(columns=[START_STATION_COL]))
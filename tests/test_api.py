@@ -0,0 +1,117 @@
+import asyncio
+import json
+import threading
+import urllib.error
+import urllib.request
+
+import pandas as pd
+import pytest
+
+from src.api.load_test import run_load_test
+from src.api.server import AnalyticsAPI, AnalyticsService, LRUCache
+from src.config import START_TIME_COL, START_STATION_COL, DURATION_MIN_COL, USER_TYPE_COL
+
+
+@pytest.fixture
+def api_url():
+    """
+    Serves a small processed trip frame from an event loop on a background thread.
+    """
+    df = pd.DataFrame({
+        START_TIME_COL: pd.to_datetime([
+            "2024-08-01 08:00", "2024-08-01 09:00", "2024-08-02 17:30",
+            "2024-08-03 12:00", "2024-08-03 13:00",
+        ]),
+        START_STATION_COL: ["A", "B", "A", "C", "A"],
+        USER_TYPE_COL: ["Annual Member", "Casual Member", "Annual Member", "Casual Member", "Annual Member"],
+        "rider_type": ["Annual member", "Casual", "Annual member", "Casual", "Annual member"],
+        DURATION_MIN_COL: [10.0, 20.0, 30.0, 40.0, 50.0],
+    })
+    api = AnalyticsAPI(AnalyticsService(df), max_workers=2, cache_size=8)
+
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    port = asyncio.run_coroutine_threadsafe(api.start("127.0.0.1", 0), loop).result()
+
+    yield f"http://127.0.0.1:{port}", api
+
+    asyncio.run_coroutine_threadsafe(api.close(), loop).result()
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join()
+
+
+def _get(url: str):
+    with urllib.request.urlopen(url) as response:
+        return json.loads(response.read())
+
+
+def test_kpis_and_top_stations(api_url):
+    base, _ = api_url
+
+    assert _get(f"{base}/kpis") == {"total_rides": 5, "avg_duration": 30.0, "subscriber_rate": 60.0}
+    assert _get(f"{base}/top-stations?top_n=1") == [{START_STATION_COL: "A", "trip_count": 3}]
+
+
+def test_daily_rides_with_rider_type(api_url):
+    base, _ = api_url
+
+    rows = _get(f"{base}/daily-rides?rider_type=Casual")
+    assert rows == [
+        {"Date": "2024-08-01", "total_rides": 1},
+        {"Date": "2024-08-02", "total_rides": 0},
+        {"Date": "2024-08-03", "total_rides": 1},
+    ]
+
+
+def test_trips_are_filtered_and_paginated(api_url):
+    base, _ = api_url
+
+    page = _get(f"{base}/trips?min_duration=15&page=2&page_size=2")
+    assert page["total"] == 4
+    assert page["page"] == 2
+    assert [row[DURATION_MIN_COL] for row in page["rows"]] == [40.0, 50.0]
+
+
+def test_equivalent_queries_share_one_cache_entry(api_url):
+    base, api = api_url
+
+    _get(f"{base}/top-stations?top_n=3")
+    _get(f"{base}/top-stations/?top_n=03")
+
+    assert api.cache.misses == 1
+    assert api.cache.hits == 1
+
+
+def test_errors_map_to_status_codes(api_url):
+    base, _ = api_url
+
+    with pytest.raises(urllib.error.HTTPError) as not_found:
+        _get(f"{base}/unknown")
+    assert not_found.value.code == 404
+
+    with pytest.raises(urllib.error.HTTPError) as bad_request:
+        _get(f"{base}/daily-rides?rider_type=VIP")
+    assert bad_request.value.code == 400
+
+
+def test_load_test_reports_latency_percentiles(api_url):
+    base, _ = api_url
+
+    result = asyncio.run(run_load_test(base, concurrency=4, total_requests=40))
+
+    assert result["requests"] == 40
+    assert result["errors"] == 0
+    assert 0 < result["p50_ms"] <= result["p99_ms"]
+    assert result["requests_per_sec"] > 0
+
+
+def test_lru_cache_evicts_least_recently_used():
+    cache = LRUCache(capacity=2)
+    cache.put(("a",), b"1")
+    cache.put(("b",), b"2")
+    cache.get(("a",))
+    cache.put(("c",), b"3")
+
+    assert cache.get(("b",)) is None
+    assert cache.get(("a",)) == b"1"
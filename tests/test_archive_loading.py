@@ -0,0 +1,88 @@
+import gzip
+import os
+import zipfile
+
+import pandas as pd
+import pytest
+
+from src.data_processor.loading_cleaning import (
+    prepare_data, prepare_archive, iter_prepared_chunks, iter_archive_members
+)
+from src.config import (
+    TRIP_ID_COL, TRIP_DURATION_COL, START_TIME_COL, END_TIME_COL, USER_TYPE_COL,
+    START_STATION_COL, END_STATION_COL, START_STATION_ID_COL, END_STATION_ID_COL,
+    BIKE_ID_COL, MODEL_COL
+)
+
+
+def _monthly_csv(month: int, n: int) -> str:
+    """Raw export for one month; the last row has a negative duration and is cleaned away."""
+    starts = pd.date_range(f"2024-{month:02d}-01 08:00", periods=n, freq="h")
+    return pd.DataFrame({
+        TRIP_ID_COL: range(month * 100, month * 100 + n),
+        TRIP_DURATION_COL: [600] * (n - 1) + [-5],
+        START_STATION_ID_COL: 7000,
+        START_TIME_COL: starts.strftime("%m/%d/%Y %H:%M"),
+        START_STATION_COL: "A",
+        END_STATION_ID_COL: 7001,
+        END_TIME_COL: (starts + pd.Timedelta(minutes=10)).strftime("%m/%d/%Y %H:%M"),
+        END_STATION_COL: "B",
+        BIKE_ID_COL: 1,
+        USER_TYPE_COL: "Annual Member",
+        MODEL_COL: "ICONIC",
+    }).to_csv(index=False)
+
+
+@pytest.fixture
+def yearly_bundle(tmp_path):
+    path = tmp_path / "bikeshare-ridership-2024.zip"
+    with zipfile.ZipFile(path, "w", compression=zipfile.ZIP_DEFLATED) as bundle:
+        bundle.writestr("2024/Bike share ridership 2024-02.csv", _monthly_csv(2, 6))
+        bundle.writestr("2024/Bike share ridership 2024-01.csv", _monthly_csv(1, 5))
+        bundle.writestr("__MACOSX/2024/._Bike share ridership 2024-01.csv", b"junk")
+        bundle.writestr("2024/readme.txt", "not a csv")
+    return str(path)
+
+
+def test_zip_members_are_read_in_order_without_extracting(yearly_bundle, tmp_path):
+    before = set(os.listdir(tmp_path))
+
+    names = [name for name, _ in iter_archive_members(yearly_bundle)]
+    df = prepare_data(yearly_bundle)
+
+    assert names == ["2024/Bike share ridership 2024-01.csv", "2024/Bike share ridership 2024-02.csv"]
+    assert len(df) == 4 + 5
+    assert list(df.index) == list(range(9))
+    assert df[TRIP_ID_COL].iloc[0] == 100
+    assert pd.api.types.is_datetime64_any_dtype(df[START_TIME_COL])
+    assert set(os.listdir(tmp_path)) == before
+
+
+def test_parallel_and_chunked_reads_match_sequential(yearly_bundle):
+    sequential = prepare_archive(yearly_bundle)
+
+    pd.testing.assert_frame_equal(prepare_archive(yearly_bundle, max_workers=2), sequential)
+    pd.testing.assert_frame_equal(pd.concat(iter_prepared_chunks(yearly_bundle, chunksize=2)), sequential)
+
+
+def test_gzip_file_is_streamed(tmp_path):
+    path = tmp_path / "Bike share ridership 2024-01.csv.gz"
+    with gzip.open(path, "wt") as fh:
+        fh.write(_monthly_csv(1, 5))
+
+    assert len(prepare_archive(str(path))) == 4
+    assert len(prepare_data(str(path))) == 4
+
+
+def test_missing_archive_raises(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        prepare_archive(str(tmp_path / "missing.zip"))
+
+
+def test_archive_without_csv_raises(tmp_path):
+    path = tmp_path / "empty.zip"
+    with zipfile.ZipFile(path, "w") as bundle:
+        bundle.writestr("readme.txt", "nothing here")
+
+    with pytest.raises(ValueError):
+        prepare_archive(str(path))
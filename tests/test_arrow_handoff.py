@@ -0,0 +1,103 @@
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pytest
+
+from src.data_processor.arrow_handoff import (
+    export_handoff, load_handoff, open_arrow, read_arrow, standard_tables, write_arrow
+)
+from src.data_processor.feature_engineering import add_calendar_features, calculate_trip_metrics
+from src.data_processor.rider_categorization import categorize_riders
+from src.config import (
+    TRIP_ID_COL, TRIP_DURATION_COL, START_TIME_COL, END_TIME_COL, USER_TYPE_COL, START_STATION_COL,
+    END_STATION_COL, START_STATION_ID_COL, END_STATION_ID_COL, BIKE_ID_COL, MODEL_COL, DURATION_MIN_COL,
+    HANDOFF_DICTIONARY_COLUMNS
+)
+
+
+@pytest.fixture
+def mock_processed():
+    """300 processed trips with a non-contiguous index (as after cleaning drops rows)."""
+    rng = np.random.default_rng(4)
+    n = 300
+    starts = pd.Timestamp("2024-08-01") + pd.to_timedelta(np.sort(rng.integers(0, 30 * 1440, n)), unit="min")
+    durations = rng.integers(120, 3600, n)
+    df = pd.DataFrame({
+        TRIP_ID_COL: np.arange(n) + 26_000_000,
+        TRIP_DURATION_COL: durations,
+        START_STATION_ID_COL: rng.integers(7000, 7020, n),
+        START_TIME_COL: starts,
+        START_STATION_COL: rng.choice(["Bay St / Albert St", "King St W / Tecumseth St", None], n),
+        END_STATION_ID_COL: rng.integers(7000, 7020, n),
+        END_TIME_COL: starts + pd.to_timedelta(durations, unit="s"),
+        END_STATION_COL: rng.choice(["York St / Queens Quay W", "Beverly St / College St"], n),
+        BIKE_ID_COL: pd.array(np.where(rng.random(n) < 0.1, None, rng.integers(1, 9000, n)), dtype="Int64"),
+        USER_TYPE_COL: rng.choice(["Annual Member", "Casual Member"], n),
+        MODEL_COL: rng.choice(["ICONIC", "EFIT"], n),
+    }, index=np.arange(n) * 3 + 7)
+    return calculate_trip_metrics(add_calendar_features(categorize_riders(df)))
+
+
+def _as_categoricals(df: pd.DataFrame) -> pd.DataFrame:
+    return df.astype({col: "category" for col in HANDOFF_DICTIONARY_COLUMNS if col in df.columns})
+
+
+def test_round_trip_keeps_types(mock_processed, tmp_path):
+    path = str(tmp_path / "trips.arrow")
+    assert write_arrow(mock_processed, path) > 0
+    back = read_arrow(path)
+
+    pd.testing.assert_frame_equal(back, _as_categoricals(mock_processed))
+    assert back[START_TIME_COL].dtype == "datetime64[ns]" and back[BIKE_ID_COL].dtype == "Int64"
+    assert back["start_hour"].dtype == "int8" and back["is_holiday"].dtype == "bool"
+    assert set(back[MODEL_COL].cat.categories) == {"ICONIC", "EFIT"}
+    assert not (tmp_path / "trips.arrow.partial").exists()
+
+
+def test_open_is_memory_mapped(mock_processed, tmp_path):
+    path = str(tmp_path / "trips.arrow")
+    write_arrow(pd.concat([mock_processed] * 50), path)
+
+    allocated = pa.total_allocated_bytes()
+    table = open_arrow(path)
+    assert pa.total_allocated_bytes() == allocated  # buffers point into the mapped file
+    assert table.num_rows == 50 * len(mock_processed)
+    assert pa.types.is_dictionary(table.schema.field(START_STATION_COL).type)
+
+    # Null-free numeric and timestamp columns come out as views, not copies.
+    durations = read_arrow(path, [DURATION_MIN_COL])[DURATION_MIN_COL].to_numpy()
+    assert durations.base is not None and not durations.flags.owndata
+
+
+def test_column_subset_keeps_index(mock_processed, tmp_path):
+    path = str(tmp_path / "trips.arrow")
+    write_arrow(mock_processed, path)
+
+    subset = read_arrow(path, [START_TIME_COL, "rider_type"])
+    assert list(subset.columns) == [START_TIME_COL, "rider_type"]
+    pd.testing.assert_index_equal(subset.index, mock_processed.index)
+    with pytest.raises(KeyError):
+        read_arrow(path, ["no_such_column"])
+    with pytest.raises(FileNotFoundError):
+        read_arrow(str(tmp_path / "missing.arrow"))
+
+
+def test_handoff_directory_with_tables(mock_processed, tmp_path):
+    tables = standard_tables(mock_processed, top_n=2)
+    paths = export_handoff(mock_processed, tables, str(tmp_path / "handoff"))
+    assert len(paths) == 4
+
+    trips, loaded = load_handoff(str(tmp_path / "handoff"))
+    assert sorted(loaded) == ["daily_rides", "kpis", "top_stations"]
+    pd.testing.assert_frame_equal(loaded["daily_rides"], tables["daily_rides"], check_freq=False)
+    pd.testing.assert_frame_equal(loaded["kpis"], tables["kpis"])
+
+    # The analytics run unchanged on the categorical columns of the mapped frame.
+    again = standard_tables(trips, top_n=2)
+    assert again["kpis"].equals(tables["kpis"])
+    assert again["top_stations"][START_STATION_COL].astype(str).tolist() \
+        == tables["top_stations"][START_STATION_COL].tolist()
+    assert again["top_stations"]["trip_count"].tolist() == tables["top_stations"]["trip_count"].tolist()
+
+    with pytest.raises(ValueError):
+        export_handoff(mock_processed, {"trips": tables["kpis"]}, str(tmp_path / "other"))
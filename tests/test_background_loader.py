@@ -0,0 +1,122 @@
+import os
+
+import pandas as pd
+import pytest
+
+from src.analytics.incremental import PartialAggregates
+from src.analytics.stations import get_top_starting_stations
+from src.analytics.usage_patterns import calculate_daily_rides
+from src.data_processor.background_loader import BackgroundLoader, run_feature_pipeline
+from src.data_processor.loading_cleaning import prepare_data
+from src.config import (
+    TRIP_ID_COL, TRIP_DURATION_COL, START_TIME_COL, END_TIME_COL, USER_TYPE_COL,
+    START_STATION_COL, END_STATION_COL, START_STATION_ID_COL, END_STATION_ID_COL,
+    BIKE_ID_COL, MODEL_COL, DURATION_MIN_COL
+)
+
+
+@pytest.fixture
+def trips_csv(tmp_path):
+    """
+    Ten raw trips over four days; Trip Id 3 appears again in a later chunk.
+    """
+    starts = pd.to_datetime([
+        "2024-08-01 08:00", "2024-08-01 09:00", "2024-08-01 17:30", "2024-08-02 07:45",
+        "2024-08-02 12:00", "2024-08-04 08:15", "2024-08-04 16:30", "2024-08-04 18:00",
+        "2024-08-04 19:00", "2024-08-04 20:00",
+    ])
+    durations = [600, 900, 1200, 300, 1800, 660, 720, 480, 540, 420]
+    df = pd.DataFrame({
+        TRIP_ID_COL: [1, 2, 3, 4, 5, 6, 7, 3, 9, 10],
+        TRIP_DURATION_COL: durations,
+        START_STATION_ID_COL: [7000, 7001, 7000, 7002, 7001, 7000, 7003, 7000, 7002, 7001],
+        START_TIME_COL: starts.strftime("%m/%d/%Y %H:%M"),
+        START_STATION_COL: ["A", "B", "A", "C", "B", "A", "D", "A", "C", "B"],
+        END_STATION_ID_COL: [7001] * 10,
+        END_TIME_COL: (starts + pd.to_timedelta(durations, unit="s")).strftime("%m/%d/%Y %H:%M"),
+        END_STATION_COL: ["B"] * 10,
+        BIKE_ID_COL: range(100, 110),
+        USER_TYPE_COL: ["Annual Member", "Casual Member"] * 5,
+        MODEL_COL: ["ICONIC"] * 10,
+    })
+    path = tmp_path / "trips.csv"
+    df.to_csv(path, index=False)
+    return str(path)
+
+
+def test_loader_result_matches_synchronous_pipeline(trips_csv):
+    expected, _ = run_feature_pipeline(prepare_data(trips_csv))
+
+    loader = BackgroundLoader(trips_csv, chunksize=3).start()
+    result = loader.result()
+
+    assert loader.done
+    assert loader.progress == 1.0
+    pd.testing.assert_frame_equal(result, expected)
+    assert loader.quality_report().set_index("rule").loc["duplicate_trip_id", "violations"] == 1
+
+
+def test_partial_aggregates_match_full_analytics(trips_csv):
+    loader = BackgroundLoader(trips_csv, chunksize=4).start()
+    df = loader.result()
+    snapshot = loader.snapshot()
+
+    kpis = snapshot.kpis()
+    assert kpis["total_rides"] == len(df)
+    assert kpis["avg_duration"] == pytest.approx(df[DURATION_MIN_COL].mean())
+    assert kpis["subscriber_rate"] == pytest.approx((df["rider_type"] == "Annual member").mean() * 100)
+
+    pd.testing.assert_frame_equal(snapshot.daily_rides(), calculate_daily_rides(df), check_freq=False)
+    pd.testing.assert_frame_equal(snapshot.top_stations(3), get_top_starting_stations(df, 3))
+
+
+def test_partial_daily_rides_by_rider_type(trips_csv):
+    df, _ = run_feature_pipeline(prepare_data(trips_csv))
+    aggregates = PartialAggregates()
+    aggregates.update(df)
+
+    casual = df[df["rider_type"] == "Casual"]
+    pd.testing.assert_frame_equal(
+        aggregates.daily_rides("Casual"), calculate_daily_rides(casual), check_freq=False
+    )
+
+
+def test_empty_aggregates_have_no_rides():
+    aggregates = PartialAggregates()
+
+    assert aggregates.kpis()["total_rides"] == 0
+    assert aggregates.daily_rides().empty
+    assert aggregates.top_stations().empty
+
+
+def test_copies_are_unaffected_by_later_chunks(trips_csv):
+    df, _ = run_feature_pipeline(prepare_data(trips_csv))
+    aggregates = PartialAggregates()
+    aggregates.update(df.iloc[:4])
+    copied = aggregates.copy()
+    aggregates.update(df.iloc[4:])
+
+    assert copied.total_rides == 4 and copied.top_stations()["trip_count"].sum() == 4
+    assert copied.duration_sketch.counts.sum() == 4
+    assert copied.bike_sketch.estimate([]).iloc[0] == pytest.approx(4, abs=0.5)
+    assert aggregates.duration_sketch.counts.sum() == len(df)
+
+    loader = BackgroundLoader(trips_csv, chunksize=4).start()
+    loader.result()
+    assert loader.snapshot() is loader.snapshot()  # final aggregates are shared, not copied per rerun
+
+
+def test_version_changes_with_the_file_not_just_the_row_count(trips_csv):
+    first = BackgroundLoader(trips_csv, chunksize=4).start()
+    first.result()
+    again = BackgroundLoader(trips_csv, chunksize=4).start()
+    again.result()
+    assert first.version == again.version and first.version[-1] == len(first.result())
+
+    edited = pd.read_csv(trips_csv)
+    edited[TRIP_DURATION_COL] += 60  # same rows, different data
+    edited.to_csv(trips_csv, index=False)
+    os.utime(trips_csv, ns=(0, os.stat(trips_csv).st_mtime_ns + 1))
+    changed = BackgroundLoader(trips_csv, chunksize=4).start()
+    changed.result()
+    assert changed.version != first.version and changed.version[-1] == first.version[-1]
@@ -0,0 +1,67 @@
+import os
+
+import pandas as pd
+import pytest
+
+from src.reporting.batch_reports import render_reports, load_report, build_report_jobs
+from src.config import START_TIME_COL, START_STATION_COL, USER_TYPE_COL, DURATION_MIN_COL
+
+
+@pytest.fixture
+def mock_processed_trips():
+    """
+    Processed trips spanning two months with both rider types.
+    """
+    return pd.DataFrame({
+        START_TIME_COL: pd.to_datetime([
+            "2024-07-30 08:00", "2024-07-31 09:00", "2024-07-31 17:00",
+            "2024-08-01 08:00", "2024-08-01 12:00", "2024-08-02 18:00",
+        ]),
+        START_STATION_COL: ["A", "B", "A", "C", "A", "C"],
+        USER_TYPE_COL: ["Annual Member", "Casual Member", "Annual Member",
+                        "Annual Member", "Casual Member", "Casual Member"],
+        "rider_type": ["Annual member", "Casual", "Annual member", "Annual member", "Casual", "Casual"],
+        DURATION_MIN_COL: [10.0, 25.0, 12.0, 8.0, 40.0, 30.0],
+    })
+
+
+def test_jobs_cover_each_month_and_rider_type(mock_processed_trips, tmp_path):
+    jobs = build_report_jobs(mock_processed_trips, str(tmp_path))
+
+    assert {(job.month, job.rider_type) for job in jobs} == {
+        ("2024-07", "All"), ("2024-07", "Annual member"), ("2024-07", "Casual"),
+        ("2024-08", "All"), ("2024-08", "Annual member"), ("2024-08", "Casual"),
+    }
+
+
+def test_render_writes_artifacts_and_skips_unchanged_inputs(mock_processed_trips, tmp_path):
+    output_dir = str(tmp_path / "reports")
+
+    first = render_reports(mock_processed_trips, output_dir, top_n=3, max_workers=2)
+    assert (first["status"] == "rendered").all()
+
+    report_dir = os.path.join(output_dir, "2024-08", "casual")
+    for name in ["kpis.json", "daily_rides.parquet", "daily_rides.html", "duration_histogram.json",
+                 "top_stations.parquet", "top_stations.html"]:
+        assert os.path.exists(os.path.join(report_dir, name))
+
+    # Change one August trip: only the August reports that contain it are re-rendered.
+    changed = mock_processed_trips.copy()
+    changed.loc[5, DURATION_MIN_COL] = 31.0
+    second = render_reports(changed, output_dir, top_n=3, max_workers=2)
+    rendered = set(second.loc[second["status"] == "rendered", ["month", "rider_type"]].itertuples(index=False))
+    assert rendered == {("2024-08", "All"), ("2024-08", "Casual")}
+
+
+def test_load_report_round_trips_tables(mock_processed_trips, tmp_path):
+    output_dir = str(tmp_path / "reports")
+    render_reports(mock_processed_trips, output_dir, top_n=3, max_workers=1)
+
+    report = load_report(output_dir, "2024-07")
+
+    assert report["kpis"]["total_rides"] == 3
+    assert list(report["top_stations"][START_STATION_COL]) == ["A", "B"]
+    assert report["daily_rides"]["total_rides"].sum() == 3
+
+    with pytest.raises(FileNotFoundError):
+        load_report(output_dir, "2023-01")
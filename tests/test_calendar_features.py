@@ -0,0 +1,87 @@
+from datetime import date, time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.analytics.usage_patterns import calculate_daily_rides
+from src.data_processor.feature_engineering import add_calendar_features, label_rush_hour
+from src.data_processor.holiday_calendar import ontario_holidays
+from src.data_processor.utils import filter_data_advanced
+from src.config import (
+    START_TIME_COL, DURATION_MIN_COL, START_STATION_ID_COL, IS_RUSH_HOUR_COL,
+    HOUR_COL, DOW_COL, MINUTE_OF_DAY_COL, DAY_ORDINAL_COL, IS_HOLIDAY_COL, CALENDAR_COLS
+)
+
+
+@pytest.fixture
+def mock_trips():
+    """Minute-resolution start times (like the exports) over 2023-2024, with empty days and rush-hour edges."""
+    rng = np.random.default_rng(3)
+    minutes = rng.integers(0, 2 * 365 * 24 * 60, 20_000)
+    minutes = minutes[(minutes // (24 * 60)) % 30 != 7]  # leave gaps in the daily series
+    edges = [7 * 60, 8 * 60 + 59, 9 * 60, 16 * 60 - 1, 16 * 60, 17 * 60 + 59, 18 * 60]
+    minutes = np.concatenate([minutes, [400 * 24 * 60 + edge for edge in edges]])
+    n = len(minutes)
+    return pd.DataFrame({
+        START_TIME_COL: pd.Timestamp("2023-01-01") + pd.to_timedelta(minutes, unit="min"),
+        DURATION_MIN_COL: rng.uniform(1, 90, n),
+        START_STATION_ID_COL: rng.integers(7000, 7050, n),
+    })
+
+
+def test_ontario_holidays():
+    days_2024 = [day for day, _ in ontario_holidays(2024)]
+    assert days_2024 == [date(2024, 1, 1), date(2024, 2, 19), date(2024, 3, 29), date(2024, 5, 20),
+                         date(2024, 7, 1), date(2024, 8, 5), date(2024, 9, 2), date(2024, 10, 14),
+                         date(2024, 12, 25), date(2024, 12, 26)]
+    # 2022: New Year's Day on a Saturday, Christmas on a Sunday (Boxing Day keeps the Monday).
+    observed_2022 = {day for day, name in ontario_holidays(2022) if name.endswith("(observed)")}
+    assert observed_2022 == {date(2022, 1, 3), date(2022, 12, 27)}
+    # 2021: Christmas on a Saturday and Boxing Day on the Sunday.
+    assert {date(2021, 12, 27), date(2021, 12, 28)} <= {day for day, _ in ontario_holidays(2021)}
+
+
+def test_calendar_features_match_datetime_parts(mock_trips):
+    df = add_calendar_features(mock_trips.copy())
+    starts = df[START_TIME_COL]
+
+    assert df[CALENDAR_COLS].dtypes.astype(str).tolist() == ["int8", "int8", "int16", "int32", "bool"]
+    assert df[CALENDAR_COLS].memory_usage(index=False).sum() == 9 * len(df)
+    assert (df[HOUR_COL] == starts.dt.hour).all()
+    assert (df[DOW_COL] == starts.dt.dayofweek).all()
+    assert (df[MINUTE_OF_DAY_COL] == starts.dt.hour * 60 + starts.dt.minute).all()
+    assert (df[DAY_ORDINAL_COL] == (starts.dt.floor("D") - pd.Timestamp("1970-01-01")).dt.days).all()
+
+    holidays = {day for year in (2023, 2024) for day, _ in ontario_holidays(year)}
+    assert (df[IS_HOLIDAY_COL] == starts.dt.date.isin(holidays)).all()
+    assert df.loc[starts.dt.date == date(2024, 7, 1), IS_HOLIDAY_COL].all()
+
+    with pytest.raises(ValueError):
+        add_calendar_features(pd.DataFrame({START_TIME_COL: pd.to_datetime(["2024-01-01", None])}))
+
+
+def test_rush_hour_equivalence(mock_trips):
+    expected = label_rush_hour(mock_trips.copy())[IS_RUSH_HOUR_COL]
+    fast = label_rush_hour(add_calendar_features(mock_trips.copy()))[IS_RUSH_HOUR_COL]
+    pd.testing.assert_series_equal(fast, expected)
+    assert fast.any() and not fast.all()
+
+
+@pytest.mark.parametrize("time_range, durations, dates, stations", [
+    ((time(0, 0), time(23, 59)), (0, 1000), (date(2023, 1, 1), date(2024, 12, 31)), None),
+    ((time(7, 0), time(9, 0)), (5, 30), (date(2023, 3, 10), date(2023, 3, 10)), None),
+    ((time(16, 30, 15), time(18, 0, 45)), (10, 60), (date(2024, 2, 1), date(2024, 8, 31)), [7001, 7002, 7049]),
+])
+def test_filter_equivalence(mock_trips, time_range, durations, dates, stations):
+    expected = filter_data_advanced(mock_trips, time_range, *durations, *dates, station_ids=stations)
+    featured = add_calendar_features(mock_trips.copy())
+    fast = filter_data_advanced(featured, time_range, *durations, *dates, station_ids=stations)
+    pd.testing.assert_frame_equal(fast[mock_trips.columns], expected)
+
+
+def test_daily_rides_equivalence(mock_trips):
+    expected = calculate_daily_rides(mock_trips)
+    fast = calculate_daily_rides(add_calendar_features(mock_trips.copy()))
+    pd.testing.assert_frame_equal(fast, expected)
+    assert (fast["total_rides"] == 0).any()
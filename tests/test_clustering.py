@@ -0,0 +1,88 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.analytics.clustering import _hour_of_week, cluster_stations, hour_of_week_profiles, kmeans
+from src.config import START_TIME_COL, END_TIME_COL, START_STATION_COL, END_STATION_COL
+
+
+@pytest.fixture
+def mock_trips():
+    """
+    30 stations of three kinds over eight weeks: homes (weekday 8am departures to offices, 5pm
+    arrivals back), offices (the reverse) and parks (weekend afternoon round trips).
+    """
+    rng = np.random.default_rng(11)
+    homes, offices, parks = [f"Home {i}" for i in range(10)], [f"Office {i}" for i in range(10)], \
+        [f"Park {i}" for i in range(10)]
+    weeks = pd.Timestamp("2024-01-01") + pd.to_timedelta(7 * rng.integers(0, 8, 3000), unit="D")
+
+    frames = []
+    for kind, (origins, destinations, days, hour) in {
+        "morning": (homes, offices, rng.integers(0, 5, 3000), 8),
+        "evening": (offices, homes, rng.integers(0, 5, 3000), 17),
+        "weekend": (parks, parks, rng.integers(5, 7, 3000), 14),
+    }.items():
+        starts = weeks + pd.to_timedelta(days * 24 + hour, unit="h") + pd.to_timedelta(rng.integers(0, 3600, 3000), unit="s")
+        frames.append(pd.DataFrame({
+            START_TIME_COL: starts, END_TIME_COL: starts + pd.Timedelta(minutes=20),
+            START_STATION_COL: rng.choice(origins, 3000), END_STATION_COL: rng.choice(destinations, 3000),
+        }))
+    return pd.concat(frames, ignore_index=True)
+
+
+def test_hour_of_week_matches_calendar():
+    times = pd.Series(pd.to_datetime(["2024-08-05 00:30", "2024-08-07 13:05", "2024-08-11 23:59", "1969-12-29 01:00"]))
+    expected = times.dt.dayofweek * 24 + times.dt.hour
+    assert list(_hour_of_week(times)) == list(expected)
+
+
+def test_profiles_count_departures_and_arrivals(mock_trips):
+    profiles = hour_of_week_profiles(mock_trips, min_trips=1)
+    row = profiles.stations.get_loc("Home 3")
+
+    home = mock_trips[mock_trips[START_STATION_COL] == "Home 3"]
+    expected = (home[START_TIME_COL].dt.dayofweek * 24 + home[START_TIME_COL].dt.hour).value_counts()
+    assert dict(zip(np.flatnonzero(profiles.departures[row]), profiles.departures[row][profiles.departures[row] > 0])) \
+        == expected.sort_index().to_dict()
+    assert profiles.arrivals[row].sum() == (mock_trips[END_STATION_COL] == "Home 3").sum()
+    np.testing.assert_allclose(profiles.features.sum(axis=1), 1.0)
+    assert len(hour_of_week_profiles(mock_trips, min_trips=10_000).stations) == 0
+
+
+def test_kmeans_separates_blobs_and_keeps_best_restart():
+    rng = np.random.default_rng(2)
+    centres = np.array([[0.0, 0.0], [10.0, 0.0], [0.0, 10.0]])
+    X = np.vstack([centre + rng.normal(0, 0.5, (50, 2)) for centre in centres])
+
+    result = kmeans(X, k=3, n_init=5, seed=1)
+
+    assert len(set(result.labels[:50])) == len(set(result.labels[50:100])) == len(set(result.labels[100:])) == 1
+    assert len(set(result.labels)) == 3
+    assert result.inertia <= kmeans(X, k=3, n_init=1, seed=7).inertia + 1e-9
+    with pytest.raises(ValueError):
+        kmeans(X[:2], k=3)
+
+
+def test_cluster_stations_names_behaviour_groups(mock_trips):
+    clusters = cluster_stations(mock_trips, k=3, min_trips=1)
+
+    kind = clusters.assignments[START_STATION_COL].str.split().str[0]
+    names = clusters.assignments["cluster"].map(clusters.summary["name"])
+    assert set(names[kind == "Home"]) == {"Commuter origin"}
+    assert set(names[kind == "Office"]) == {"Commuter destination"}
+    assert set(names[kind == "Park"]) == {"Leisure / weekend"}
+    assert clusters.centroids.shape == (3, 336)
+    assert clusters.summary["stations"].is_monotonic_decreasing
+
+
+def test_integer_station_codes_cluster_like_names(mock_trips):
+    codes = {name: i for i, name in enumerate(sorted(set(mock_trips[START_STATION_COL]) | set(mock_trips[END_STATION_COL])))}
+    encoded = mock_trips.assign(**{START_STATION_COL: mock_trips[START_STATION_COL].map(codes),
+                                   END_STATION_COL: mock_trips[END_STATION_COL].map(codes)})
+
+    by_name = cluster_stations(mock_trips, k=3, min_trips=1).assignments
+    by_code = cluster_stations(encoded, k=3, min_trips=1).assignments
+
+    by_name = by_name.assign(code=by_name[START_STATION_COL].map(codes)).set_index("code").sort_index()
+    assert by_code.set_index(START_STATION_COL).sort_index()["cluster"].tolist() == by_name["cluster"].tolist()
@@ -0,0 +1,80 @@
+import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.analytics.comparison import assign_periods, compare_periods, compute_deltas
+from src.config import START_TIME_COL, START_STATION_COL, DURATION_MIN_COL
+
+
+@pytest.fixture
+def mock_trips():
+    """
+    Trips on Thu 2024-08-01, Fri 2024-08-02 (weekdays), Sat 2024-08-03 (weekend) and Sun 2024-09-01 (weekend).
+    """
+    return pd.DataFrame({
+        START_TIME_COL: pd.to_datetime([
+            "2024-08-01 08:00", "2024-08-01 08:30", "2024-08-02 17:00",
+            "2024-08-03 14:00", "2024-08-03 15:00", "2024-09-01 14:30",
+        ]),
+        START_STATION_COL: ["A", "A", "B", "C", "C", "A"],
+        DURATION_MIN_COL: [10.0, 12.0, 20.0, 30.0, 50.0, 40.0],
+        "rider_type": ["Annual member", "Annual member", "Casual", "Casual", "Casual", "Annual member"],
+    })
+
+
+def test_weekday_weekend_kpis_in_one_pass(mock_trips):
+    periods = assign_periods(mock_trips, grouping="weekday_weekend")
+    result = compare_periods(mock_trips, periods)
+
+    assert list(result.kpis.columns) == ["Weekday", "Weekend"]
+    assert result.kpis.loc["total_rides", "Weekday"] == 3
+    assert result.kpis.loc["rides_per_day", "Weekday"] == pytest.approx(1.5)
+    assert result.kpis.loc["avg_duration", "Weekend"] == pytest.approx(40.0)
+    assert result.kpis.loc["median_duration", "Weekday"] == pytest.approx(12.0)
+    assert result.kpis.loc["subscriber_rate", "Weekend"] == pytest.approx(100 / 3)
+
+
+def test_station_hour_and_duration_tables(mock_trips):
+    periods = assign_periods(mock_trips, grouping="month")
+    result = compare_periods(mock_trips, periods)
+
+    assert list(result.stations.columns) == ["2024-08", "2024-09"]
+    assert result.stations.loc["A", "2024-08"] == 2
+    assert result.stations.loc["C", "2024-09"] == 0
+    assert np.allclose(result.hourly.sum(), 1.0)
+    assert result.hourly.loc[14, "2024-09"] == pytest.approx(1.0)
+    assert result.durations.loc["45-60", "2024-08"] == pytest.approx(0.2)
+
+
+def test_custom_periods_match_per_group_computation(mock_trips):
+    periods = assign_periods(mock_trips, periods={
+        "first": (datetime.date(2024, 8, 1), datetime.date(2024, 8, 2)),
+        "second": (datetime.date(2024, 8, 3), datetime.date(2024, 8, 31)),
+    })
+    result = compare_periods(mock_trips, periods)
+
+    # The 2024-09-01 trip falls outside both ranges.
+    assert periods.isna().sum() == 1
+    second = mock_trips[periods == "second"]
+    assert result.kpis.loc["avg_duration", "second"] == pytest.approx(second[DURATION_MIN_COL].mean())
+
+
+def test_deltas_against_baseline(mock_trips):
+    periods = assign_periods(mock_trips, grouping="weekday_weekend")
+    deltas = compute_deltas(compare_periods(mock_trips, periods).kpis)
+
+    assert deltas.loc["total_rides", "Weekend Δ"] == 0
+    assert deltas.loc["avg_duration", "Weekend Δ"] == pytest.approx(40.0 - 14.0)
+    assert deltas.loc["avg_duration", "Weekend %Δ"] == pytest.approx((40.0 - 14.0) / 14.0 * 100)
+
+    with pytest.raises(KeyError):
+        compute_deltas(compare_periods(mock_trips, periods).kpis, baseline="Holiday")
+
+
+def test_invalid_arguments_raise(mock_trips):
+    with pytest.raises(ValueError):
+        assign_periods(mock_trips)
+    with pytest.raises(ValueError):
+        assign_periods(mock_trips, grouping="quarter")
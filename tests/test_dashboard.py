@@ -0,0 +1,48 @@
+import pandas as pd
+import pytest
+
+import dashboard
+from src.config import (
+    TRIP_ID_COL, TRIP_DURATION_COL, START_TIME_COL, END_TIME_COL, USER_TYPE_COL,
+    START_STATION_COL, END_STATION_COL, START_STATION_ID_COL, END_STATION_ID_COL,
+    BIKE_ID_COL, MODEL_COL
+)
+
+
+@pytest.fixture
+def mock_trips():
+    """Four raw trips on one day."""
+    starts = pd.to_datetime(["2024-08-01 08:00", "2024-08-01 09:00", "2024-08-01 17:30", "2024-08-01 18:00"])
+    durations = [600, 900, 1200, 300]
+    return pd.DataFrame({
+        TRIP_ID_COL: [1, 2, 3, 4],
+        TRIP_DURATION_COL: durations,
+        START_STATION_ID_COL: [7000, 7001, 7000, 7002],
+        START_TIME_COL: starts.strftime("%m/%d/%Y %H:%M"),
+        START_STATION_COL: ["A", "B", "A", "C"],
+        END_STATION_ID_COL: [7001] * 4,
+        END_TIME_COL: (starts + pd.to_timedelta(durations, unit="s")).strftime("%m/%d/%Y %H:%M"),
+        END_STATION_COL: ["B"] * 4,
+        BIKE_ID_COL: [100, 101, 102, 103],
+        USER_TYPE_COL: ["Annual Member", "Casual Member"] * 2,
+        MODEL_COL: ["ICONIC"] * 4,
+    })
+
+
+def test_failed_load_is_evicted_and_retried(mock_trips, tmp_path, monkeypatch):
+    monkeypatch.setattr(dashboard, "STATION_DIM_FILE_PATH", str(tmp_path / "stations.parquet"))
+    source = str(tmp_path / "trips.csv")
+
+    failed = dashboard.get_loader(source)
+    with pytest.raises(FileNotFoundError):
+        failed.result()
+    assert dashboard.get_loader(source) is failed  # cached until the failure is seen
+    with pytest.raises(FileNotFoundError):
+        dashboard.raise_if_failed(failed)
+
+    mock_trips.to_csv(source, index=False)
+    retried = dashboard.get_loader(source)
+    assert retried is not failed
+    assert len(retried.result()) == len(mock_trips)
+    dashboard.raise_if_failed(retried)
+    assert dashboard.get_loader(source) is retried
@@ -0,0 +1,142 @@
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pandas as pd
+import pytest
+
+from src.data_processor import loading_cleaning
+from src.data_processor.fetch import fetch_cached, is_remote
+from src.data_processor.schema_profiles import CURRENT_COLUMNS, sniff_header
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """
+    Minimal stand-in for the release-asset server: ETag revalidation, Range resume and an optional dropped connection.
+    """
+    original_body = b"Trip Id,Trip  Duration\n" + b"".join(b"%d,600\n" % i for i in range(5000))
+    body = original_body
+    etag = '"v1"'
+    requests = []
+    bytes_sent = 0
+    drop_after = None  # Close the connection after this many body bytes (once).
+
+    def log_message(self, *args):
+        pass
+
+    def _send_body(self, payload: bytes, status: int, extra_headers: dict) -> None:
+        self.send_response(status)
+        self.send_header("ETag", self.etag)
+        self.send_header("Content-Length", str(len(payload)))
+        for name, value in extra_headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+
+        cls = type(self)
+        if cls.drop_after is not None:
+            payload, cls.drop_after = payload[:cls.drop_after], None
+            self.close_connection = True
+        self.wfile.write(payload)
+        cls.bytes_sent += len(payload)
+
+    def do_GET(self):
+        cls = type(self)
+        cls.requests.append(dict(self.headers))
+
+        if self.headers.get("If-None-Match") == cls.etag:
+            self.send_response(304)
+            self.end_headers()
+            return
+
+        range_header = self.headers.get("Range")
+        if range_header and self.headers.get("If-Range") == cls.etag:
+            start = int(range_header.split("=")[1].rstrip("-"))
+            total = len(cls.body)
+            self._send_body(cls.body[start:], 206, {"Content-Range": f"bytes {start}-{total - 1}/{total}"})
+            return
+
+        self._send_body(cls.body, 200, {})
+
+
+@pytest.fixture
+def server():
+    StandInHandler.requests = []
+    StandInHandler.bytes_sent = 0
+    StandInHandler.drop_after = None
+    StandInHandler.etag = '"v1"'
+    StandInHandler.body = StandInHandler.original_body
+
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), StandInHandler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}/Bike.share.ridership.csv"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def test_first_fetch_downloads_and_rerun_transfers_nothing(server, tmp_path):
+    path = fetch_cached(server, cache_dir=str(tmp_path), chunk_size=4096)
+
+    with open(path, "rb") as fh:
+        assert fh.read() == StandInHandler.body
+    assert os.path.exists(path + ".meta.json")
+
+    sent_before = StandInHandler.bytes_sent
+    assert fetch_cached(server, cache_dir=str(tmp_path)) == path
+    assert StandInHandler.bytes_sent == sent_before
+    assert StandInHandler.requests[-1]["If-None-Match"] == '"v1"'
+
+
+def test_changed_remote_file_is_downloaded_again(server, tmp_path):
+    fetch_cached(server, cache_dir=str(tmp_path))
+
+    StandInHandler.etag = '"v2"'
+    StandInHandler.body = StandInHandler.body + b"5000,600\n"
+    path = fetch_cached(server, cache_dir=str(tmp_path))
+
+    with open(path, "rb") as fh:
+        assert fh.read().endswith(b"5000,600\n")
+
+
+def test_interrupted_download_resumes_with_range(server, tmp_path):
+    StandInHandler.drop_after = 10_000
+
+    path = fetch_cached(server, cache_dir=str(tmp_path), chunk_size=1024)
+
+    with open(path, "rb") as fh:
+        assert fh.read() == StandInHandler.body
+    assert StandInHandler.requests[-1]["Range"] == "bytes=10000-"
+    assert StandInHandler.bytes_sent == len(StandInHandler.body)
+
+
+def test_offline_serves_cached_copy_and_fails_without_one(server, tmp_path):
+    path = fetch_cached(server, cache_dir=str(tmp_path))
+    offline_url = "http://127.0.0.1:9/Bike.share.ridership.csv"
+
+    assert fetch_cached(offline_url, cache_dir=str(tmp_path), retries=0, timeout=1) == path
+    with pytest.raises(ConnectionError):
+        fetch_cached(offline_url, cache_dir=str(tmp_path / "empty"), retries=0, timeout=1)
+
+
+def test_is_remote():
+    assert is_remote("https://github.com/x/y.csv")
+    assert not is_remote("data/bike_share_data.csv")
+
+
+def test_loaders_download_a_remote_source_once(server, tmp_path, monkeypatch):
+    StandInHandler.body = pd.DataFrame({
+        "Trip Id": [1, 2], "Trip  Duration": [600, 420], "Start Station Id": [7000, 7001],
+        "Start Time": ["08/01/2024 08:00", "08/01/2024 08:05"], "Start Station Name": ["A", "B"],
+        "End Station Id": [7001, 7000], "End Time": ["08/01/2024 08:10", "08/01/2024 08:12"],
+        "End Station Name": ["B", "A"], "Bike Id": [10, 11], "User Type": ["Annual Member", "Casual Member"],
+        "Model": ["ICONIC", "EFIT"],
+    }).to_csv(index=False).encode()
+    monkeypatch.setattr(loading_cleaning, "fetch_cached",
+                        lambda url: fetch_cached(url, cache_dir=str(tmp_path)))
+
+    assert sniff_header(server) == CURRENT_COLUMNS
+    StandInHandler.requests = []
+    assert len(loading_cleaning.prepare_data(server)) == 2
+    assert len(StandInHandler.requests) == 1  # header and rows both come from the cached copy
+    assert len(pd.concat(loading_cleaning.iter_prepared_chunks(server, chunksize=1))) == 2
+    assert StandInHandler.requests[-1]["If-None-Match"] == '"v1"'
@@ -0,0 +1,100 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.analytics.forecasting import forecast_station_demand, hour_of_week_profile, station_hour_matrix
+from src.config import START_TIME_COL, START_STATION_COL
+
+
+def _trips(counts: np.ndarray, stations, start: str = "2024-06-03") -> pd.DataFrame:
+    """Trips realising a stations x days x 24 count array, at 10 past each hour."""
+    s_idx, d_idx, h_idx = np.nonzero(counts)
+    repeats = counts[s_idx, d_idx, h_idx]
+    hours = np.repeat(d_idx * 24 + h_idx, repeats)
+    return pd.DataFrame({
+        START_TIME_COL: pd.Timestamp(start) + pd.to_timedelta(hours * 60 + 10, unit="min"),
+        START_STATION_COL: np.asarray(stations, dtype=object)[np.repeat(s_idx, repeats)],
+    })
+
+
+@pytest.fixture
+def mock_weekly_counts():
+    """Three stations repeating the same week exactly for 5 weeks (Monday start): commuter, leisure, quiet."""
+    weekday = np.zeros(24, dtype=np.int64)
+    weekday[[7, 8, 17]] = [4, 6, 5]
+    weekend = np.zeros(24, dtype=np.int64)
+    weekend[11:17] = 3
+    week = np.stack([weekday] * 5 + [weekend] * 2)
+    stations = np.stack([week, week[::-1] // 3, (week > 4).astype(np.int64)])
+    return np.tile(stations, (1, 5, 1))
+
+
+def test_station_hour_matrix_counts_every_trip(mock_weekly_counts):
+    df = _trips(mock_weekly_counts, ["Bay St", "Union Station", "Dundas St"])
+    df = pd.concat([df, pd.DataFrame({START_TIME_COL: pd.to_datetime([None]), START_STATION_COL: ["Bay St"]})],
+                   ignore_index=True)
+    history = station_hour_matrix(df)
+
+    assert list(history.stations) == ["Bay St", "Dundas St", "Union Station"]  # sorted
+    assert history.start == pd.Timestamp("2024-06-03") and history.n_days == 35
+    np.testing.assert_array_equal(history.daily, mock_weekly_counts[[0, 2, 1]])
+    assert history.counts.sum() == len(df) - 1
+    assert list(history.weekdays[:8]) == [0, 1, 2, 3, 4, 5, 6, 0]
+
+    with pytest.raises(KeyError):
+        station_hour_matrix(df.drop(columns=[START_STATION_COL]))
+
+
+def test_profile_blends_towards_network():
+    daily = np.zeros((2, 7, 24), dtype=np.float32)
+    daily[0, :, 8] = 1000  # Busy: every departure at 8:00
+    daily[1, :, 20] = 1    # Quiet: 7 departures, all at 20:00
+    profile = hour_of_week_profile(daily, np.arange(7), prior_trips=200)
+
+    np.testing.assert_allclose(profile.sum(axis=(1, 2)), [7, 7], rtol=1e-5)  # one per average day
+    assert profile[0, 0, 8] > 0.99 and profile[1, 0, 8] > 0.95  # the quiet station borrows the network's shape
+    assert profile[1, 0, 20] == pytest.approx(7 / 207 + 200 / 207 / 1001, rel=1e-4)
+    with pytest.raises(ValueError):
+        hour_of_week_profile(daily[:, :5], np.arange(5))
+
+
+def test_repeating_week_is_forecast_exactly(mock_weekly_counts):
+    forecast = forecast_station_demand(_trips(mock_weekly_counts, ["A", "B", "C"]), backtest_days=7,
+                                       prior_trips=0)  # each station's own (exact) profile
+
+    assert forecast.backtest_start == pd.Timestamp("2024-07-01")
+    assert forecast.forecast_start == pd.Timestamp("2024-07-08")  # a Monday
+    np.testing.assert_allclose(forecast.backtest, mock_weekly_counts[:, -7:].reshape(3, -1), atol=1e-3)
+    np.testing.assert_allclose(forecast.next_day().to_numpy(), mock_weekly_counts[:, 0], atol=1e-3)
+    assert forecast.metrics["mae"].max() < 1e-3 and forecast.summary["wape"] < 0.1
+    assert (forecast.metrics["naive_mae"] == 0).all()
+
+    series = forecast.station_series("A")
+    assert len(series) == 8 * 24 and series["actual"].iloc[-24:].isna().all()
+    assert series.loc["2024-07-08 08:00", "forecast"] == pytest.approx(6, abs=1e-3)
+    with pytest.raises(KeyError):
+        forecast.station_series("Z")
+
+
+def test_trend_and_backtest_errors():
+    rng = np.random.default_rng(5)
+    days = 70
+    shape = np.array([0] * 7 + [2, 3, 2] + [1] * 7 + [3, 3] + [1] * 3 + [0] * 2, dtype=float)
+    growth = np.linspace(1, 2, days)  # demand doubles over ten weeks
+    rates = np.stack([np.outer(growth, shape) * scale for scale in (1, 4, 10)])
+    counts = rng.poisson(rates)
+    forecast = forecast_station_demand(_trips(counts, ["A", "B", "C"]), backtest_days=14)
+
+    # One-day-ahead forecasts follow the growth (a flat profile average would lag far behind).
+    daily_forecast = forecast.backtest.reshape(3, 14, 24).sum(axis=2)
+    expected = rates[:, -14:].sum(axis=2)
+    assert np.abs(daily_forecast / expected - 1).mean() < 0.15
+
+    metrics = forecast.metrics
+    assert list(metrics.columns) == ["trips", "mae", "rmse", "wape", "naive_mae", "skill"]
+    assert (metrics["trips"] == counts[:, -14:].sum(axis=(1, 2))).all()
+    assert (metrics["rmse"] >= metrics["mae"]).all() and (metrics["skill"] > 0).all()
+    assert forecast.summary["wape"] < forecast.summary["naive_wape"]
+
+    with pytest.raises(ValueError):
+        forecast_station_demand(_trips(counts[:, :20], ["A", "B", "C"]), backtest_days=14)
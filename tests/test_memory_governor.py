@@ -0,0 +1,181 @@
+import os
+import time
+import tracemalloc
+from functools import partial
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.data_processor.background_loader import BackgroundLoader
+from src.data_processor.memory_governor import MB, MemoryGovernor, frame_bytes, resident_bytes
+from src.config import (
+    TRIP_ID_COL, TRIP_DURATION_COL, START_TIME_COL, END_TIME_COL, USER_TYPE_COL,
+    START_STATION_COL, END_STATION_COL, START_STATION_ID_COL, END_STATION_ID_COL,
+    BIKE_ID_COL, MODEL_COL
+)
+
+
+def _write_trips(path, n: int) -> str:
+    """n raw trips over a week."""
+    rng = np.random.default_rng(2)
+    starts = pd.Timestamp("2024-08-05") + pd.to_timedelta(np.sort(rng.integers(0, 7 * 1440, n)), unit="min")
+    durations = rng.integers(120, 3600, n)
+    pd.DataFrame({
+        TRIP_ID_COL: np.arange(n) + 1000,
+        TRIP_DURATION_COL: durations,
+        START_STATION_ID_COL: rng.integers(7000, 7010, n),
+        START_TIME_COL: starts.strftime("%m/%d/%Y %H:%M"),
+        START_STATION_COL: rng.choice(["A", "B", "C"], n),
+        END_STATION_ID_COL: rng.integers(7000, 7010, n),
+        END_TIME_COL: (starts + pd.to_timedelta(durations // 60 * 60, unit="s")).strftime("%m/%d/%Y %H:%M"),
+        END_STATION_COL: rng.choice(["A", "B", "C"], n),
+        BIKE_ID_COL: rng.integers(1, 50, n),
+        USER_TYPE_COL: rng.choice(["Annual Member", "Casual Member"], n),
+        MODEL_COL: rng.choice(["ICONIC", "EFIT"], n),
+    }).to_csv(path, index=False)
+    return str(path)
+
+
+@pytest.fixture
+def mock_trips_csv(tmp_path):
+    """200 raw trips over a week (loaded in chunks of 50)."""
+    return _write_trips(tmp_path / "trips.csv", 200)
+
+
+class FakeMeter:
+    """Resident size that jumps over the budget after a number of readings."""
+
+    def __init__(self, calm_readings: int):
+        self.readings = 0
+        self.calm_readings = calm_readings
+
+    def __call__(self) -> int:
+        self.readings += 1
+        return 10 * MB if self.readings <= self.calm_readings else 1000 * MB
+
+
+def test_spill_and_read_back(tmp_path):
+    governor = MemoryGovernor(budget_mb=100, spill_dir=str(tmp_path), cold_columns=[BIKE_ID_COL, MODEL_COL])
+    df = pd.DataFrame({
+        START_TIME_COL: pd.date_range("2024-08-01", periods=6, freq="h"),
+        BIKE_ID_COL: pd.array([1, None, 3, 4, 5, 6], dtype="Int64"),
+        MODEL_COL: ["ICONIC", "EFIT", "ICONIC", None, "EFIT", "ICONIC"],
+    }, index=[10, 11, 12, 20, 21, 22])
+
+    kept = pd.concat([governor.spill(df.iloc[:3]), governor.spill(df.iloc[3:])])
+    assert list(kept.columns) == [START_TIME_COL]
+    assert governor.spill(kept) is kept  # nothing cold left
+    assert governor.spilled_columns == [BIKE_ID_COL, MODEL_COL]
+
+    pd.testing.assert_frame_equal(governor.restore(kept), df)
+    subset = governor.read_spilled(pd.Index([21, 10, 99]), [MODEL_COL])
+    assert subset[MODEL_COL].tolist()[:2] == ["EFIT", "ICONIC"] and pd.isna(subset.loc[99, MODEL_COL])
+
+    status = governor.status()
+    assert status.spilling and status.spilled_rows == 6 and status.spilled_bytes > 0
+    governor.clear()
+    assert not os.path.exists(governor.spill_dir) and not governor.status().spilling
+
+
+def test_pressure_threshold(tmp_path):
+    governor = MemoryGovernor(budget_mb=100, high_water=0.5, spill_dir=str(tmp_path), measure=lambda: 49 * MB)
+    assert not governor.under_pressure()
+    governor.measure = lambda: 50 * MB
+    assert governor.under_pressure()
+
+    # Without an OS reading, the bytes of the held frames are the footprint.
+    governor.measure = lambda: None
+    assert not governor.under_pressure(held_bytes=10 * MB) and governor.under_pressure(held_bytes=60 * MB)
+    assert governor.status().usage == pytest.approx(0.6)
+
+    with pytest.raises(ValueError):
+        MemoryGovernor(budget_mb=0)
+    assert resident_bytes() is None or resident_bytes() > 0
+
+
+def test_loader_within_budget_keeps_every_column(mock_trips_csv, tmp_path):
+    expected = BackgroundLoader(mock_trips_csv, chunksize=50).start().result()
+    governor = MemoryGovernor(budget_mb=100, spill_dir=str(tmp_path), measure=lambda: 1 * MB)
+    loader = BackgroundLoader(mock_trips_csv, chunksize=50, governor=governor).start()
+
+    pd.testing.assert_frame_equal(loader.result(), expected)
+    assert not governor.status().spilling
+    assert governor.status().held_bytes == pytest.approx(frame_bytes(expected), rel=0.05)  # index layout differs
+
+
+@pytest.mark.parametrize("calm_readings", [0, 2])
+def test_loader_spills_cold_columns_under_pressure(mock_trips_csv, tmp_path, calm_readings):
+    expected = BackgroundLoader(mock_trips_csv, chunksize=50).start().result()
+    governor = MemoryGovernor(budget_mb=100, spill_dir=str(tmp_path), measure=FakeMeter(calm_readings))
+    loader = BackgroundLoader(mock_trips_csv, chunksize=50, governor=governor).start()
+    result = loader.result()
+
+    # Every chunk is spilled, including those held before the pressure started.
+    cold = [TRIP_ID_COL, END_STATION_ID_COL, BIKE_ID_COL, MODEL_COL, "distance_km"]
+    assert set(governor.spilled_columns) == set(cold)
+    assert list(result.columns) == [col for col in expected.columns if col not in cold]
+    assert governor.status().spilled_rows == len(expected)
+    assert governor.status().held_bytes < frame_bytes(expected)
+    # Still over budget after spilling, so the hot numeric columns were mapped to disk as well.
+    assert START_TIME_COL in governor.mapped_columns and governor.status().mapped_rows == len(expected)
+
+    # Views see the same hot data, and the spilled columns come back for any rows.
+    pd.testing.assert_frame_equal(result, expected.drop(columns=cold))
+    assert loader.snapshot().total_rides == len(expected)
+    rows = result.sample(20, random_state=0)
+    pd.testing.assert_frame_equal(governor.restore(rows)[expected.columns], expected.loc[rows.index])
+
+
+def test_hot_columns_are_mapped_to_disk_in_row_order(tmp_path):
+    governor = MemoryGovernor(budget_mb=100, spill_dir=str(tmp_path))
+    df = pd.DataFrame({
+        START_TIME_COL: pd.date_range("2024-08-01", periods=6, freq="h"),
+        "code": np.array([0, 1, 2, 0, 1, 2], dtype="int16"),
+        "rider_type": ["Casual", "Annual member"] * 3,
+        "is_holiday": [False, True] * 3,
+    }, index=[10, 11, 12, 20, 21, 22])
+
+    first = governor.map_hot(df.iloc[:3])
+    assert list(first.columns) == ["rider_type"]
+    assert governor.map_hot(first) is first  # already mapped
+    governor.map_hot(df.iloc[3:].assign(code=np.array([40_000, 1, 2], dtype="int32")))  # codes outgrow int16
+
+    mapped = governor.mapped()
+    assert mapped["code"].dtype == "int32" and mapped["code"].tolist() == [0, 1, 2, 40_000, 1, 2]
+    np.testing.assert_array_equal(mapped[START_TIME_COL], df[START_TIME_COL].to_numpy())
+    assert mapped["is_holiday"].tolist() == df["is_holiday"].tolist()
+    assert governor.status().mapped_rows == 6
+    with pytest.raises(ValueError):
+        governor.map_hot(df.drop(columns=["code"]))
+
+
+def test_relieve_releases_caches_until_under_the_mark(tmp_path):
+    released = []
+    governor = MemoryGovernor(budget_mb=1000, high_water=0.8, spill_dir=str(tmp_path),
+                              measure=lambda: (900 - 300 * len(released)) * MB)
+    for name in ["forecast", "clusters", "sample"]:
+        governor.on_pressure(name, partial(released.append, name))
+
+    assert governor.relieve() == ["forecast"] and released == ["forecast"]
+    assert governor.relieve() == []  # back under the high-water mark
+    assert governor.status().released == ("forecast",)
+
+
+def test_result_stays_within_the_loaded_footprint(tmp_path):
+    source = _write_trips(tmp_path / "trips.csv", 20_000)
+    tracemalloc.start()
+    try:
+        loader = BackgroundLoader(source, chunksize=2_000).start()
+        while not loader.done:
+            time.sleep(0.01)
+        footprint, _ = tracemalloc.get_traced_memory()
+        budget = 1.3 * footprint  # Room for the chunks, not for a second full copy of them
+        tracemalloc.reset_peak()
+        result = loader.result()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    assert len(result) == 20_000
+    assert peak < budget
@@ -0,0 +1,68 @@
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.analytics.parallel import run_concurrently, run_task, shared_executor
+from src.analytics.stations import get_top_starting_stations
+from src.analytics.usage_patterns import calculate_daily_rides, calculate_kpis
+from src.config import START_TIME_COL, START_STATION_COL, DURATION_MIN_COL
+
+
+@pytest.fixture
+def mock_trips():
+    """
+    5,000 synthetic trips over two weeks.
+    """
+    rng = np.random.default_rng(9)
+    n = 5_000
+    return pd.DataFrame({
+        START_TIME_COL: pd.Timestamp("2024-08-01") + pd.to_timedelta(rng.integers(0, 14 * 86400, n), unit="s"),
+        START_STATION_COL: rng.choice([f"Station {i}" for i in range(30)], n),
+        "rider_type": rng.choice(["Annual member", "Casual"], n),
+        DURATION_MIN_COL: rng.gamma(2.0, 7.0, n),
+    })
+
+
+def test_concurrent_results_match_sequential(mock_trips):
+    tasks = {
+        "kpis": lambda: calculate_kpis(mock_trips),
+        "daily": lambda: calculate_daily_rides(mock_trips),
+        "stations": lambda: get_top_starting_stations(mock_trips, 10),
+    }
+
+    run = run_concurrently(tasks)
+
+    assert run.outcomes["kpis"].value == calculate_kpis(mock_trips)
+    pd.testing.assert_frame_equal(run.outcomes["daily"].value, calculate_daily_rides(mock_trips))
+    pd.testing.assert_frame_equal(run.outcomes["stations"].value, get_top_starting_stations(mock_trips, 10))
+
+
+def test_a_failing_task_does_not_affect_the_others(mock_trips):
+    run = run_concurrently({
+        "ok": lambda: len(mock_trips),
+        "broken": lambda: mock_trips["missing column"],
+    })
+
+    assert run.outcomes["ok"].value == 5_000
+    assert run.outcomes["ok"].error is None
+    assert isinstance(run.outcomes["broken"].error, KeyError)
+    assert list(run.timings()["ok"].sort_index()) == [False, True]
+
+
+def test_critical_path_is_the_slowest_task():
+    # sleep releases the GIL like the pandas/NumPy kernels do, so the batch costs about the longest task.
+    run = run_concurrently({f"task {i}": (lambda: time.sleep(0.2)) for i in range(4)})
+
+    assert run.sequential_seconds >= 0.8
+    assert run.wall_seconds < 0.6
+    assert run.speedup > 1.5
+
+
+def test_run_task_captures_errors_and_the_pool_is_shared():
+    outcome = run_task(lambda: 1 / 0)
+
+    assert outcome.value is None
+    assert isinstance(outcome.error, ZeroDivisionError)
+    assert shared_executor() is shared_executor()
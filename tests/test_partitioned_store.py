@@ -0,0 +1,127 @@
+import os
+from datetime import date
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.data_processor.loading_cleaning import iter_prepared_chunks, prepare_data
+from src.data_processor.partitioned_store import plan_scan, read_manifest, read_partitions, write_partitions
+from src.config import START_TIME_COL, START_STATION_COL, TRIP_ID_COL
+
+
+@pytest.fixture
+def mock_trips():
+    """
+    600 trips spread over March-May 2024, in shuffled order.
+    """
+    rng = np.random.default_rng(3)
+    starts = pd.Timestamp("2024-03-01") + pd.to_timedelta(rng.integers(0, 92 * 86400, 600), unit="s")
+    return pd.DataFrame({
+        TRIP_ID_COL: np.arange(600),
+        START_TIME_COL: starts,
+        START_STATION_COL: rng.choice(["A", "B", "C"], 600),
+    })
+
+
+def _sorted(df: pd.DataFrame) -> pd.DataFrame:
+    return df.sort_values([START_TIME_COL, TRIP_ID_COL]).reset_index(drop=True)
+
+
+def test_round_trip_by_month(mock_trips, tmp_path):
+    added = write_partitions(mock_trips, str(tmp_path))
+
+    assert list(added["path"]) == [os.path.join("year=2024", f"month={m:02d}", "part-00000.parquet") for m in (3, 4, 5)]
+    assert added["rows"].sum() == 600
+    pd.testing.assert_frame_equal(_sorted(read_partitions(str(tmp_path))), _sorted(mock_trips))
+
+
+def test_date_range_reads_only_overlapping_row_groups(mock_trips, tmp_path):
+    write_partitions(mock_trips, str(tmp_path), row_group_rows=20)
+    start, end = date(2024, 4, 10), date(2024, 4, 12)
+
+    result = read_partitions(str(tmp_path), start, end, columns=[TRIP_ID_COL])
+    days = mock_trips[START_TIME_COL].dt.floor("D")
+    expected = mock_trips.loc[(days >= pd.Timestamp(start)) & (days <= pd.Timestamp(end)), TRIP_ID_COL]
+
+    assert sorted(result[TRIP_ID_COL]) == sorted(expected)
+    assert list(result.columns) == [TRIP_ID_COL]
+    plan = plan_scan(str(tmp_path), start, end)
+    assert set(plan["path"]) == {os.path.join("year=2024", "month=04", "part-00000.parquet")}
+    assert plan["rows"].sum() <= 40 < len(mock_trips)
+
+
+def test_appending_a_month_only_writes_new_files(mock_trips, tmp_path):
+    root = str(tmp_path)
+    write_partitions(mock_trips, root)
+    march = os.path.join(root, "year=2024", "month=03", "part-00000.parquet")
+    march_mtime = os.path.getmtime(march)
+
+    june = mock_trips.head(5).assign(**{START_TIME_COL: pd.Timestamp("2024-06-15 08:00")})
+    added = write_partitions(june, root)
+
+    assert list(added["path"]) == [os.path.join("year=2024", "month=06", "part-00000.parquet")]
+    assert os.path.getmtime(march) == march_mtime
+    assert len(read_manifest(root)) == 4
+    assert len(read_partitions(root, date(2024, 6, 1), date(2024, 6, 30))) == 5
+
+
+def test_reloading_a_month_errors_appends_or_overwrites(mock_trips, tmp_path):
+    root = str(tmp_path)
+    write_partitions(mock_trips, root)
+    april = mock_trips[mock_trips[START_TIME_COL].dt.month == 4]
+    march_dir = os.path.join(root, "year=2024", "month=03")
+
+    with pytest.raises(ValueError):
+        write_partitions(april, root)
+    assert len(read_manifest(root)) == 3
+
+    added = write_partitions(april.head(10), root, mode="append")
+    assert list(added["path"]) == [os.path.join("year=2024", "month=04", "part-00001.parquet")]
+    assert len(read_partitions(root, date(2024, 4, 1), date(2024, 4, 30))) == len(april) + 10
+
+    # Overwriting April replaces both of its files; March is untouched.
+    added = write_partitions(april, root, mode="overwrite")
+    assert list(added["path"]) == [os.path.join("year=2024", "month=04", "part-00002.parquet")]
+    assert sorted(os.listdir(os.path.join(root, "year=2024", "month=04"))) == ["part-00002.parquet"]
+    assert os.listdir(march_dir) == ["part-00000.parquet"]
+    pd.testing.assert_frame_equal(_sorted(read_partitions(root)), _sorted(mock_trips))
+
+    # A day of a monthly partition: numbered in its own directory, and the month overwrites it.
+    day = mock_trips[mock_trips[START_TIME_COL].dt.date == date(2024, 3, 5)]
+    for mode in ("error", "overwrite"):
+        with pytest.raises(ValueError):
+            write_partitions(day, root, granularity="day", mode=mode)
+    added = write_partitions(day, root, granularity="day", mode="append")
+    assert list(added["path"]) == [os.path.join("year=2024", "month=03", "day=05", "part-00000.parquet")]
+    march = mock_trips[mock_trips[START_TIME_COL].dt.month == 3]
+    write_partitions(march, root, mode="overwrite")
+    assert len(read_partitions(root, date(2024, 3, 1), date(2024, 3, 31))) == len(march)
+    assert len(read_manifest(root)) == 3
+
+
+def test_daily_partitions_and_empty_ranges(mock_trips, tmp_path):
+    root = str(tmp_path)
+    added = write_partitions(mock_trips, root, granularity="day")
+
+    assert added["day"].between(1, 31).all()
+    assert added["path"].str.contains("day=").all()
+    empty = read_partitions(root, date(2025, 1, 1), date(2025, 1, 31))
+    assert empty.empty and list(empty.columns) == list(mock_trips.columns)
+
+
+def test_loaders_read_a_dataset_directory(mock_trips, tmp_path):
+    write_partitions(mock_trips, str(tmp_path))
+
+    chunks = list(iter_prepared_chunks(str(tmp_path)))
+
+    pd.testing.assert_frame_equal(pd.concat(chunks), prepare_data(str(tmp_path)))
+    assert len(chunks) == 3
+
+
+def test_missing_start_times_are_rejected(mock_trips, tmp_path):
+    mock_trips.loc[0, START_TIME_COL] = pd.NaT
+    with pytest.raises(ValueError):
+        write_partitions(mock_trips, str(tmp_path))
+    with pytest.raises(ValueError):
+        write_partitions(mock_trips.dropna(), str(tmp_path), granularity="week")
@@ -0,0 +1,70 @@
+import subprocess
+import sys
+
+import pytest
+
+from src.analytics import registry
+from src.analytics.registry import LazyModule, get_view, register_view
+from src.import_benchmark import parse_importtime
+
+
+def _modules_loaded_after(statement: str) -> set:
+    """Runs statement in a fresh interpreter and returns the heavy charting modules it left in sys.modules."""
+    probe = f"import sys; {statement}; print(','.join(m for m in ('plotly.express', 'altair') if m in sys.modules))"
+    result = subprocess.run([sys.executable, "-c", probe], capture_output=True, text=True, check=True)
+    return set(filter(None, result.stdout.strip().split(",")))
+
+
+def test_importing_plot_modules_does_not_load_charting_stacks():
+    assert _modules_loaded_after(
+        "import src.analytics.plotting, src.analytics.plot_top_stations, src.analytics.registry"
+    ) == set()
+
+
+def test_charting_stack_loads_on_first_plot():
+    assert _modules_loaded_after(
+        "import pandas as pd; from src.analytics.registry import get_view; "
+        "get_view('plot_daily_rides')(pd.DataFrame({'total_rides': [1, 2]}))"
+    ) == {"plotly.express"}
+
+
+def test_get_view_resolves_and_caches():
+    from src.analytics.usage_patterns import calculate_kpis
+
+    assert get_view("calculate_kpis") is calculate_kpis
+    assert registry._resolved["calculate_kpis"] is calculate_kpis
+
+    with pytest.raises(KeyError):
+        get_view("no_such_view")
+
+
+def test_register_view_validates_target(monkeypatch):
+    monkeypatch.setattr(registry, "VIEWS", dict(registry.VIEWS))
+    monkeypatch.setattr(registry, "_resolved", dict(registry._resolved))
+    register_view("sqrt", "math:sqrt")
+    assert get_view("sqrt")(9) == 3
+
+    with pytest.raises(ValueError):
+        register_view("bad", "math.sqrt")
+
+
+def test_lazy_module_imports_on_first_attribute():
+    colorsys = LazyModule("colorsys")
+    assert colorsys._module is None
+    assert colorsys.rgb_to_hsv(1.0, 0.0, 0.0) == (0.0, 1.0, 1.0)
+    assert colorsys._module is not None
+
+
+def test_parse_importtime_reads_depth_and_times():
+    stderr = "\n".join([
+        "import time: self [us] | cumulative | imported package",
+        "import time:       120 |        120 |     _weakref",
+        "import time:      2000 |       2120 |   pandas",
+        "import time:       500 |       2620 | dashboard",
+    ])
+
+    parsed = parse_importtime(stderr)
+
+    assert list(parsed["module"]) == ["_weakref", "pandas", "dashboard"]
+    assert list(parsed["depth"]) == [2, 1, 0]
+    assert parsed.loc[2, "cumulative_ms"] == pytest.approx(2.62)
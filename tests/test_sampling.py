@@ -0,0 +1,74 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.analytics.sampling import (
+    build_stratified_sample, approximate_kpis, approximate_daily_rides,
+    approximate_top_stations, approximate_duration_bins
+)
+from src.analytics.stations import get_top_starting_stations
+from src.analytics.usage_patterns import calculate_daily_rides
+from src.config import START_TIME_COL, START_STATION_COL, DURATION_MIN_COL, SAMPLE_WEIGHT_COL
+
+
+@pytest.fixture
+def mock_trips():
+    """
+    20,000 synthetic trips over 30 days with skewed station popularity.
+    """
+    rng = np.random.default_rng(42)
+    n = 20_000
+    return pd.DataFrame({
+        START_TIME_COL: pd.Timestamp("2024-08-01") + pd.to_timedelta(rng.integers(0, 30 * 86400, n), unit="s"),
+        "rider_type": rng.choice(["Annual member", "Casual"], n, p=[0.7, 0.3]),
+        START_STATION_COL: rng.choice([f"Station {i}" for i in range(20)], n, p=np.arange(20, 0, -1) / 210),
+        DURATION_MIN_COL: rng.gamma(2.0, 7.0, n),
+    })
+
+
+def test_sample_size_is_capped_and_weights_sum_to_population(mock_trips):
+    ss = build_stratified_sample(mock_trips, max_rows=2_000)
+
+    # 30 days x 2 rider types, each stratum rounded up -> at most one extra row per stratum.
+    assert len(ss.sample) <= 2_000 + len(ss.strata)
+    assert ss.sample[SAMPLE_WEIGHT_COL].sum() == pytest.approx(len(mock_trips))
+
+
+def test_daily_rides_are_exact_because_strata_include_the_date(mock_trips):
+    ss = build_stratified_sample(mock_trips, max_rows=2_000)
+
+    approx = approximate_daily_rides(ss)
+    exact = calculate_daily_rides(mock_trips)
+
+    assert list(approx["total_rides"]) == list(exact["total_rides"])
+
+
+def test_kpis_and_stations_fall_within_confidence_intervals(mock_trips):
+    ss = build_stratified_sample(mock_trips, max_rows=4_000)
+
+    kpis = approximate_kpis(ss)
+    assert kpis["total_rides"] == len(mock_trips)
+    assert abs(kpis["avg_duration"] - mock_trips[DURATION_MIN_COL].mean()) <= kpis["avg_duration_ci"]
+
+    approx = approximate_top_stations(ss, top_n=5).set_index(START_STATION_COL)
+    exact = get_top_starting_stations(mock_trips, top_n=20).set_index(START_STATION_COL)["trip_count"]
+    covered = (exact[approx.index] >= approx["ci_low"]) & (exact[approx.index] <= approx["ci_high"])
+    assert covered.mean() >= 0.8
+    assert list(approx.index[:2]) == ["Station 0", "Station 1"]
+
+
+def test_full_sample_gives_exact_results_with_zero_width_intervals(mock_trips):
+    ss = build_stratified_sample(mock_trips, max_rows=len(mock_trips))
+
+    kpis = approximate_kpis(ss)
+    assert kpis["avg_duration"] == pytest.approx(mock_trips[DURATION_MIN_COL].mean())
+    assert kpis["avg_duration_ci"] == pytest.approx(0.0)
+
+    bins = approximate_duration_bins(ss)
+    assert bins["trip_count"].sum() == (mock_trips[DURATION_MIN_COL] <= 60).sum()
+    assert (bins["ci_high"] - bins["ci_low"]).abs().max() == pytest.approx(0.0)
+
+
+def test_missing_rider_type_raises(mock_trips):
+    with pytest.raises(KeyError):
+        build_stratified_sample(mock_trips.drop(columns=["rider_type"]))
@@ -0,0 +1,125 @@
+import zipfile
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.data_processor.loading_cleaning import iter_prepared_chunks, prepare_archive, prepare_data
+from src.data_processor.rider_categorization import categorize_riders
+from src.data_processor.schema_profiles import CURRENT_COLUMNS, detect_profile, parse_datetimes, sniff_profile
+from src.config import (
+    TRIP_ID_COL, TRIP_DURATION_COL, START_TIME_COL, END_TIME_COL, USER_TYPE_COL, START_STATION_COL,
+    END_STATION_COL, START_STATION_ID_COL, END_STATION_ID_COL, BIKE_ID_COL, MODEL_COL
+)
+
+LEGACY_2017 = """trip_id,trip_start_time,trip_stop_time,trip_duration_seconds,from_station_id,from_station_name,to_station_id,to_station_name,user_type
+712382,1/1/2017 0:00,1/1/2017 0:03,223,7051,Wellesley St E / Yonge St Green P,7089,Church St  / Wood St,Member
+712383,13/1/2017 0:00,13/1/2017 0:05,279,7143,Kendal Ave / Bernard Ave,7154,Bathurst Subway Station,Member
+712384,25/2/2017 17:42,25/2/2017 18:10,1680,7113,Parliament St / Aberdeen Ave,7199,College St W / Markham St,Casual
+712385,3/3/2017 8:15,3/3/2017 8:05,-600,7113,Parliament St / Aberdeen Ave,7199,College St W / Markham St,Casual
+"""
+
+SUBSCRIPTION_2019 = """\ufeffTrip Id,Subscription Id,Trip Duration,Start Station Id,Start Time,Start Station Name,End Station Id,End Time,End Station Name,Bike Id,User Type
+4581278,199751,1547,7021,01/01/2019 00:08,Bay St / Albert St,7233,01/01/2019 00:33,King / Cowan Ave - SMART,1296,Annual Member
+4581279,294730,1112,7160,01/01/2019 00:10,King St W / Tecumseth St,7051,01/01/2019 00:29,Wellesley St E / Yonge St (Green P),2947,Annual Member
+4581280,197878,589,,01/01/2019 00:15,Lansdowne Subway Green P,7303,01/01/2019 00:25,Lansdowne Ave / Whytock Ave,5,Casual Member
+"""
+
+
+def _current_csv() -> str:
+    return pd.DataFrame({
+        TRIP_ID_COL: [26682755, 26682756], TRIP_DURATION_COL: [1076, 488],
+        START_STATION_ID_COL: [7533, 7161], START_TIME_COL: ["08/01/2024 00:00", "08/01/2024 00:01"],
+        START_STATION_COL: ["Housey St / Dan Leckie Way", "Beverly St / College St"],
+        END_STATION_ID_COL: [7076, 7162], END_TIME_COL: ["08/01/2024 00:17", "08/01/2024 00:09"],
+        END_STATION_COL: ["York St / Queens Quay W", "Hayter St / Laplante Ave"],
+        BIKE_ID_COL: [4750, 6143], USER_TYPE_COL: ["Casual Member", "Annual Member"], MODEL_COL: ["ICONIC", "EFIT"],
+    }).to_csv(index=False)
+
+
+def test_detect_profile_by_header():
+    assert detect_profile(LEGACY_2017.splitlines()[0].split(",")).name == "2017"
+    assert detect_profile(SUBSCRIPTION_2019.splitlines()[0].split(",")).name == "2019"
+    assert detect_profile(CURRENT_COLUMNS).name == "current"
+    assert detect_profile(["Trip Duration" if col == TRIP_DURATION_COL else col for col in CURRENT_COLUMNS]).name \
+        == "current"
+    assert detect_profile(["trip_id", "duration"]) is None
+
+
+def test_legacy_2017_normalised_to_current_schema(tmp_path):
+    path = tmp_path / "Bikeshare Ridership (2017 Q1).csv"
+    path.write_text(LEGACY_2017)
+    df = prepare_data(str(path))
+
+    assert list(df.columns) == CURRENT_COLUMNS
+    assert df[TRIP_ID_COL].tolist() == [712382, 712383, 712384]  # negative duration dropped
+    # Day-first dates: 13/1 can only be 13 January, so the whole file is read day-first.
+    assert df[START_TIME_COL].tolist() == list(pd.to_datetime(["2017-01-01 00:00", "2017-01-13 00:00",
+                                                               "2017-02-25 17:42"]))
+    assert df[BIKE_ID_COL].isna().all() and df[MODEL_COL].eq("Unknown").all()
+    assert df[START_STATION_ID_COL].dtype == "int64"
+    assert categorize_riders(df)["rider_type"].tolist() == ["Annual member", "Annual member", "Casual"]
+
+
+def test_2019_subscription_export(tmp_path):
+    path = tmp_path / "Bike share ridership 2019-01.csv"
+    path.write_text(SUBSCRIPTION_2019)
+    df = prepare_data(str(path))
+
+    assert list(df.columns) == CURRENT_COLUMNS
+    assert df[TRIP_ID_COL].tolist() == [4581278, 4581279]  # missing station id dropped
+    assert df[END_STATION_ID_COL].dtype == "int64" and df[BIKE_ID_COL].dtype == "int64"
+    assert df[END_TIME_COL].iloc[0] == pd.Timestamp("2019-01-01 00:33")
+    assert (df[MODEL_COL] == "Unknown").all()
+
+
+def test_multi_year_bundle_and_chunks(tmp_path):
+    path = tmp_path / "history.zip"
+    with zipfile.ZipFile(path, "w") as bundle:
+        bundle.writestr("2017/2017 Q1.csv", LEGACY_2017)
+        bundle.writestr("2019/2019-01.csv", SUBSCRIPTION_2019)
+        bundle.writestr("2024/2024-08.csv", _current_csv())
+
+    df = prepare_archive(str(path))
+    assert len(df) == 3 + 2 + 2
+    assert list(df.columns) == CURRENT_COLUMNS
+    assert df[START_TIME_COL].dt.year.tolist() == [2017] * 3 + [2019] * 2 + [2024] * 2
+    assert df[MODEL_COL].tolist()[-2:] == ["ICONIC", "EFIT"]
+
+    chunked = pd.concat(list(iter_prepared_chunks(str(path), chunksize=2)))
+    pd.testing.assert_frame_equal(chunked, df)
+
+
+def test_day_first_order_settled_for_the_whole_source(tmp_path):
+    # Only the last row (13/1) shows the file is day-first; the first chunks alone would read as month-first.
+    header, *rows = LEGACY_2017.splitlines()
+    ambiguous = rows[0].replace("1/1/2017", "2/1/2017")  # 2 January, or 1 February if read month-first
+    lines = [header] + [ambiguous] * 5 + [rows[1]]
+    path = tmp_path / "Bikeshare Ridership (2017 Q1).csv"
+    path.write_text("\n".join(lines) + "\n")
+
+    chunks = list(iter_prepared_chunks(str(path), chunksize=2))
+    assert len(chunks) == 3
+    starts = pd.concat(chunks)[START_TIME_COL]
+    assert (starts.dt.month == 1).all() and starts.dt.day.tolist() == [2] * 5 + [13]
+    pd.testing.assert_frame_equal(pd.concat(chunks), prepare_data(str(path)))
+
+    with open(path, "rb") as stream:
+        profile, options = sniff_profile(stream)
+        assert stream.tell() == 0
+    assert profile.name == "2017" and all(fmt.startswith("%d/%m") for fmt in profile.datetime_formats)
+    assert "trip_start_time" in options["usecols"]
+
+
+def test_fixed_width_parse_matches_pandas():
+    values = pd.Series(["08/01/2024 00:00", "12/31/2023 23:59", None, "02/29/2024 07:05"], index=[5, 6, 7, 8])
+    parsed = parse_datetimes(values, ["%m/%d/%Y %H:%M"])
+    pd.testing.assert_series_equal(parsed, pd.to_datetime(values, format="%m/%d/%Y %H:%M"))
+
+    # Unpadded, impossible or differently laid out values go through strptime (or the next format).
+    assert parse_datetimes(pd.Series(["8/1/2024 7:05"]), ["%m/%d/%Y %H:%M"])[0] == pd.Timestamp("2024-08-01 07:05")
+    assert parse_datetimes(pd.Series(["30/01/2024 07:05"]), ["%m/%d/%Y %H:%M", "%d/%m/%Y %H:%M"])[0] \
+        == pd.Timestamp("2024-01-30 07:05")
+    with pytest.raises(ValueError):
+        parse_datetimes(pd.Series(["02/30/2024 07:05"]), ["%m/%d/%Y %H:%M"])
+    assert np.isnat(parse_datetimes(pd.Series([None, None], dtype=object), ["%m/%d/%Y %H:%M"]).to_numpy()).all()
@@ -0,0 +1,109 @@
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.analytics.single_flight import ComputationRegistry, normalise, shared_registry
+from src.analytics.stations import get_top_starting_stations
+from src.config import START_STATION_COL
+
+
+@pytest.fixture
+def mock_trips():
+    """
+    20,000 trips over 50 stations, shared by every simulated session.
+    """
+    rng = np.random.default_rng(5)
+    return pd.DataFrame({START_STATION_COL: rng.choice([f"Station {i}" for i in range(50)], 20_000)})
+
+
+def _simultaneous(n_sessions: int, session) -> list:
+    """Runs session() on n threads released at the same instant; returns their results in order."""
+    barrier = threading.Barrier(n_sessions)
+    results = [None] * n_sessions
+
+    def worker(i):
+        barrier.wait()
+        results[i] = session()
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(n_sessions)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def test_simultaneous_identical_requests_do_one_unit_of_work(mock_trips):
+    registry = ComputationRegistry(max_workers=2)
+    calls = []
+
+    def top_stations(df, top_n):
+        calls.append(top_n)
+        time.sleep(0.2)  # keep the first computation in flight while the other sessions arrive
+        return get_top_starting_stations(df, top_n)
+
+    results = _simultaneous(8, lambda: registry.call(top_stations, mock_trips, 10, dataset_version="2024-08"))
+
+    assert calls == [10]
+    assert registry.started == 1 and registry.coalesced == 7
+    assert all(result is results[0] for result in results)
+    pd.testing.assert_frame_equal(results[0], get_top_starting_stations(mock_trips, 10))
+    assert registry.in_flight() == 0
+
+
+def test_pool_caps_simultaneous_heavy_jobs():
+    registry = ComputationRegistry(max_workers=2)
+    running, peak, lock = [0], [0], threading.Lock()
+
+    def job(i):
+        with lock:
+            running[0] += 1
+            peak[0] = max(peak[0], running[0])
+        time.sleep(0.05)
+        with lock:
+            running[0] -= 1
+        return i
+
+    futures = [registry.submit(("job", i), job, i) for i in range(6)]
+
+    assert [future.result() for future in futures] == list(range(6))
+    assert registry.started == 6
+    assert peak[0] == 2
+
+
+def test_failure_reaches_every_waiter_and_next_call_retries():
+    registry = ComputationRegistry(max_workers=1)
+    release = threading.Event()
+
+    def failing():
+        release.wait()
+        raise ValueError("source unavailable")
+
+    first, second = registry.submit("load", failing), registry.submit("load", failing)
+    release.set()
+
+    assert first is second
+    with pytest.raises(ValueError):
+        first.result()
+    assert registry.run("load", lambda: "reloaded") == "reloaded"
+    assert registry.started == 2
+
+
+def test_nested_computation_does_not_deadlock_a_full_pool():
+    registry = ComputationRegistry(max_workers=1)
+
+    def outer():
+        return registry.run("inner", lambda: 21) * 2
+
+    assert registry.run("outer", outer, timeout=5) == 42
+
+
+def test_keys_normalise_arguments(mock_trips):
+    assert normalise({"b": [1, 2], "a": {3}}) == normalise({"a": {3}, "b": (1, 2)})
+    assert normalise(mock_trips) != normalise(mock_trips.copy())
+    with pytest.raises(TypeError):
+        normalise(object.__new__(type("Unhashable", (), {"__hash__": None})))
+    assert shared_registry() is shared_registry()
@@ -0,0 +1,146 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.analytics.sketches import DistinctCountSketch, DurationQuantileSketch
+from src.config import START_TIME_COL, START_STATION_COL, DURATION_MIN_COL, BIKE_ID_COL
+
+ACCURACY = 0.01
+
+
+@pytest.fixture
+def mock_trips():
+    """
+    30,000 synthetic trips with long-tailed durations over 5 stations and 2 rider types.
+    """
+    rng = np.random.default_rng(3)
+    n = 30_000
+    return pd.DataFrame({
+        START_TIME_COL: pd.Timestamp("2024-08-01") + pd.to_timedelta(rng.integers(0, 30 * 86400, n), unit="s"),
+        START_STATION_COL: rng.choice([f"Station {i}" for i in range(5)], n),
+        "rider_type": rng.choice(["Annual member", "Casual"], n),
+        DURATION_MIN_COL: rng.lognormal(2.3, 0.8, n),
+    })
+
+
+def _exact(df: pd.DataFrame, by: list, q: float) -> pd.Series:
+    keys = [df[START_TIME_COL].dt.hour.rename("hour") if key == "hour" else df[key] for key in by]
+    return df.groupby(keys)[DURATION_MIN_COL].quantile(q, interpolation="lower")
+
+
+def test_group_quantiles_are_within_relative_accuracy(mock_trips):
+    sketch = DurationQuantileSketch(relative_accuracy=ACCURACY).update(mock_trips)
+    result = sketch.quantiles([0.5, 0.9, 0.99])
+
+    for q, column in [(0.5, "p50"), (0.9, "p90"), (0.99, "p99")]:
+        exact = _exact(mock_trips, [START_STATION_COL, "hour", "rider_type"], q)
+        relative_error = (result[column] - exact).abs() / exact
+        assert relative_error.max() <= ACCURACY + 1e-9
+    assert result["trips"].sum() == len(mock_trips)
+
+
+def test_chunked_and_merged_sketches_match_a_single_pass(mock_trips):
+    single = DurationQuantileSketch().update(mock_trips)
+
+    # Two "months" built chunk by chunk, then unioned.
+    first, second = DurationQuantileSketch(), DurationQuantileSketch()
+    for start in range(0, 15_000, 1_000):
+        first.update(mock_trips.iloc[start:start + 1_000])
+    second.update(mock_trips.iloc[15_000:])
+    merged = first.merge(second)
+
+    pd.testing.assert_series_equal(merged.counts.sort_index(), single.counts.sort_index())
+
+
+def test_rollup_matches_exact_quantiles_per_hour_and_overall(mock_trips):
+    sketch = DurationQuantileSketch().update(mock_trips)
+
+    by_hour = sketch.quantiles([0.9], by=["hour"])["p90"]
+    exact = _exact(mock_trips, ["hour"], 0.9)
+    assert ((by_hour - exact).abs() / exact).max() <= ACCURACY + 1e-9
+
+    overall = sketch.quantiles([0.5], by=[])
+    expected = np.quantile(mock_trips[DURATION_MIN_COL], 0.5, method="lower")
+    assert overall.loc[0, "p50"] == pytest.approx(expected, rel=ACCURACY)
+    assert overall.loc[0, "trips"] == len(mock_trips)
+
+
+def test_round_trip_through_parquet(mock_trips, tmp_path):
+    sketch = DurationQuantileSketch().update(mock_trips)
+    path = tmp_path / "duration_sketch.parquet"
+    sketch.to_frame().to_parquet(path)
+
+    restored = DurationQuantileSketch.from_frame(pd.read_parquet(path))
+
+    pd.testing.assert_frame_equal(restored.quantiles(), sketch.quantiles())
+
+
+def test_zero_and_missing_durations():
+    trips = pd.DataFrame({
+        START_TIME_COL: pd.to_datetime(["2024-08-01 08:00"] * 4),
+        START_STATION_COL: ["A"] * 4,
+        "rider_type": ["Casual"] * 4,
+        DURATION_MIN_COL: [0.0, 0.0, np.nan, 12.0],
+    })
+
+    result = DurationQuantileSketch().update(trips).quantiles([0.0, 1.0], by=[])
+
+    assert result.loc[0, "p0"] == 0.0
+    assert result.loc[0, "p100"] == pytest.approx(12.0, rel=ACCURACY)
+    assert result.loc[0, "trips"] == 3
+
+
+def test_invalid_arguments_raise(mock_trips):
+    with pytest.raises(ValueError):
+        DurationQuantileSketch(relative_accuracy=0)
+    with pytest.raises(ValueError):
+        DurationQuantileSketch().merge(DurationQuantileSketch(relative_accuracy=0.05))
+    with pytest.raises(KeyError):
+        DurationQuantileSketch().update(mock_trips).quantiles(by=["End Station Name"])
+
+
+@pytest.fixture
+def mock_bike_trips():
+    """
+    40,000 trips by 3,000 bikes over 10 days and 4 stations.
+    """
+    rng = np.random.default_rng(11)
+    n = 40_000
+    return pd.DataFrame({
+        START_TIME_COL: pd.Timestamp("2024-08-01") + pd.to_timedelta(rng.integers(0, 10 * 86400, n), unit="s"),
+        START_STATION_COL: rng.choice([f"Station {i}" for i in range(4)], n),
+        "rider_type": rng.choice(["Annual member", "Casual"], n),
+        BIKE_ID_COL: rng.integers(1, 3_001, n),
+    })
+
+
+def test_distinct_counts_are_close_to_nunique(mock_bike_trips):
+    sketch = DistinctCountSketch().update(mock_bike_trips)
+    days = mock_bike_trips[START_TIME_COL].dt.floor("D").rename("day")
+
+    per_group = sketch.estimate()
+    exact = mock_bike_trips.groupby([mock_bike_trips[START_STATION_COL], days, "rider_type"])[BIKE_ID_COL].nunique()
+    assert ((per_group - exact).abs() / exact).mean() < 0.02
+
+    per_day = sketch.estimate(by=["day"])
+    exact_per_day = mock_bike_trips.groupby(days)[BIKE_ID_COL].nunique()
+    assert ((per_day - exact_per_day).abs() / exact_per_day).max() < 0.05
+
+    overall = sketch.estimate(by=[])
+    assert overall[0] == pytest.approx(mock_bike_trips[BIKE_ID_COL].nunique(), rel=0.05)
+
+
+def test_distinct_sketches_union_across_months_via_parquet(mock_bike_trips, tmp_path):
+    first_half = mock_bike_trips[mock_bike_trips[START_TIME_COL] < "2024-08-06"]
+    second_half = mock_bike_trips[mock_bike_trips[START_TIME_COL] >= "2024-08-06"]
+
+    # Each "month" is sketched separately (ids read as text in one export), saved, reloaded and unioned.
+    DistinctCountSketch().update(first_half).to_frame().to_parquet(tmp_path / "first.parquet")
+    as_text = second_half.assign(**{BIKE_ID_COL: second_half[BIKE_ID_COL].astype(str)})
+    DistinctCountSketch().update(as_text).to_frame().to_parquet(tmp_path / "second.parquet")
+    union = DistinctCountSketch.from_frame(pd.read_parquet(tmp_path / "first.parquet")).merge(
+        DistinctCountSketch.from_frame(pd.read_parquet(tmp_path / "second.parquet"))
+    )
+
+    single = DistinctCountSketch().update(mock_bike_trips)
+    pd.testing.assert_series_equal(union.estimate(by=[START_STATION_COL]), single.estimate(by=[START_STATION_COL]))
@@ -0,0 +1,109 @@
+import datetime
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.analytics.spatial import StationIndex, load_station_coordinates, station_mask
+from src.data_processor.utils import filter_data_advanced
+from src.config import START_TIME_COL, DURATION_MIN_COL, START_STATION_ID_COL
+
+UNION_STATION = (43.6453, -79.3806)
+
+
+@pytest.fixture
+def stations():
+    """
+    400 random stations scattered over downtown Toronto.
+    """
+    rng = np.random.default_rng(7)
+    return pd.DataFrame({
+        "station_id": np.arange(7000, 7400),
+        "name": [f"Station {i}" for i in range(400)],
+        "lat": rng.uniform(43.62, 43.70, 400),
+        "lon": rng.uniform(-79.45, -79.32, 400),
+    })
+
+
+def _brute_force_distances(index: StationIndex, lat, lon) -> np.ndarray:
+    qx, qy = index.project(lat, lon)
+    return np.hypot(qx[:, None] - index._x[None, :], qy[:, None] - index._y[None, :])
+
+
+def test_radius_query_matches_brute_force(stations):
+    index = StationIndex(stations, cell_size_m=300)
+    rng = np.random.default_rng(1)
+    lat, lon = rng.uniform(43.62, 43.70, 50), rng.uniform(-79.45, -79.32, 50)
+
+    result = index.query_radius(lat, lon, radius_m=800)
+    distances = _brute_force_distances(index, lat, lon)
+
+    for q in range(50):
+        expected = set(index.station_ids[distances[q] <= 800])
+        assert set(result.loc[result["query"] == q, "station_id"]) == expected
+    assert result.groupby("query")["distance_m"].apply(lambda d: d.is_monotonic_increasing).all()
+
+
+def test_projected_distance_is_close_to_haversine(stations):
+    index = StationIndex(stations)
+    result = index.query_knn(*UNION_STATION, k=1)
+    nearest = stations.set_index("station_id").loc[result.loc[0, "station_id"]]
+
+    lat1, lon1, lat2, lon2 = map(np.radians, [UNION_STATION[0], UNION_STATION[1], nearest["lat"], nearest["lon"]])
+    haversine = 2 * 6_371_008.8 * np.arcsin(np.sqrt(
+        np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    ))
+    assert result.loc[0, "distance_m"] == pytest.approx(haversine, rel=0.005)
+
+
+def test_knn_returns_sorted_nearest_stations(stations):
+    index = StationIndex(stations)
+    lat, lon = np.array([43.65, 43.66]), np.array([-79.38, -79.40])
+
+    result = index.query_knn(lat, lon, k=5, block_size=1)
+    distances = _brute_force_distances(index, lat, lon)
+
+    for q in range(2):
+        rows = result[result["query"] == q]
+        assert list(rows["rank"]) == [0, 1, 2, 3, 4]
+        assert list(rows["station_id"]) == list(index.station_ids[np.argsort(distances[q])[:5]])
+
+    empty = index.query_knn(np.array([]), np.array([]), k=5)
+    assert empty.empty and list(empty.columns) == list(result.columns)
+
+
+def test_station_ids_feed_filter_data_advanced(stations):
+    index = StationIndex(stations)
+    nearby = index.station_ids_within(*UNION_STATION, radius_m=1000)
+    trips = pd.DataFrame({
+        START_TIME_COL: pd.to_datetime(["2024-08-01 09:00"] * 4),
+        DURATION_MIN_COL: [10.0] * 4,
+        START_STATION_ID_COL: [nearby[0], 9999, nearby[-1], 9998],
+    })
+
+    filtered = filter_data_advanced(
+        trips, (datetime.time(0, 0), datetime.time(23, 59)), 0.0, 100.0,
+        datetime.date(2024, 8, 1), datetime.date(2024, 8, 31), station_ids=nearby
+    )
+
+    assert list(filtered.index) == [0, 2]
+    assert list(station_mask(trips, nearby)) == [True, False, True, False]
+
+
+def test_load_gbfs_station_information(tmp_path):
+    path = tmp_path / "station_information.json"
+    path.write_text(json.dumps({"data": {"stations": [
+        {"station_id": "7000", "name": "Fort York Blvd / Capreol Ct", "lat": 43.6398, "lon": -79.3955, "capacity": 35},
+        {"station_id": "7001", "name": "Wellesley Station Green P", "lat": 43.6650, "lon": -79.3838, "capacity": 23},
+    ]}}))
+
+    stations = load_station_coordinates(str(path))
+
+    assert list(stations.columns) == ["station_id", "name", "lat", "lon"]
+    assert stations["station_id"].tolist() == [7000, 7001]
+
+
+def test_empty_station_table_raises():
+    with pytest.raises(ValueError):
+        StationIndex(pd.DataFrame(columns=["station_id", "name", "lat", "lon"]))
@@ -0,0 +1,110 @@
+import pandas as pd
+import pytest
+
+from src.analytics.stations import get_top_starting_stations
+from src.data_processor.background_loader import BackgroundLoader
+from src.data_processor.station_dimension import StationDimension, UNKNOWN_CODE
+from src.config import (
+    TRIP_ID_COL, TRIP_DURATION_COL, START_TIME_COL, END_TIME_COL, USER_TYPE_COL,
+    START_STATION_COL, END_STATION_COL, START_STATION_ID_COL, END_STATION_ID_COL,
+    START_STATION_CODE_COL, END_STATION_CODE_COL, BIKE_ID_COL, MODEL_COL
+)
+
+
+def _trips(start_ids, start_names, end_ids, end_names, day):
+    starts = pd.Timestamp(day) + pd.to_timedelta(range(len(start_ids)), unit="h")
+    return pd.DataFrame({
+        START_STATION_ID_COL: start_ids, START_STATION_COL: start_names,
+        END_STATION_ID_COL: end_ids, END_STATION_COL: end_names,
+        START_TIME_COL: starts, END_TIME_COL: starts + pd.Timedelta(minutes=15),
+    })
+
+
+@pytest.fixture
+def monthly_files():
+    """
+    Two monthly exports; station 7001 is renamed in the second one and station 7003 is new.
+    """
+    january = _trips([7000, 7001, 7001, 7002], ["Bay St", "King St W", "King St W", "Queen St"],
+                     [7001, 7000, 7002, 7000], ["King St W", "Bay St", "Queen St", "Bay St"], "2024-01-10")
+    february = _trips([7003, 7001, 7001, 7000], ["Front St", "King St West", "King St West", "Bay St"],
+                      [7000, 7003, 7000, 7001], ["Bay St", "Front St", "Bay St", "King St West"], "2024-02-10")
+    return january, february
+
+
+def test_codes_are_stable_across_incremental_updates(monthly_files):
+    january, february = monthly_files
+    dimension = StationDimension(path=None).update(january)
+    january_codes = dimension.encode(january)[START_STATION_CODE_COL].tolist()
+
+    dimension.update(february)
+    table = dimension.table.set_index("station_id")
+
+    assert dimension.encode(january)[START_STATION_CODE_COL].tolist() == january_codes
+    assert table.loc[7003, "code"] == 3
+    assert table.loc[7001, "name"] == "King St West"
+    assert table.loc[7001, "aliases"] == ["King St W", "King St West"]
+    assert table.loc[7001, "first_seen"] == pd.Timestamp("2024-01-10 00:15")  # as an end station
+    assert table.loc[7003, "last_seen"] == pd.Timestamp("2024-02-10 01:15")
+
+
+def test_counts_by_code_merge_renamed_stations(monthly_files):
+    dimension = StationDimension(path=None)
+    trips = pd.concat([dimension.update(month).encode(month) for month in monthly_files], ignore_index=True)
+
+    by_name = get_top_starting_stations(trips, 10)
+    by_code = dimension.decode(get_top_starting_stations(trips, 10, station_col=START_STATION_CODE_COL))
+
+    assert by_name.loc[by_name[START_STATION_COL] == "King St W", "trip_count"].item() == 2
+    assert list(by_code.columns) == [START_STATION_COL, "trip_count"]
+    assert by_code.iloc[0].tolist() == ["King St West", 4]
+
+
+def test_encode_can_drop_names_and_marks_unknown_ids(monthly_files):
+    january, february = monthly_files
+    dimension = StationDimension(path=None).update(january)
+
+    encoded = dimension.encode(february, drop_names=True)
+
+    assert START_STATION_COL not in encoded.columns and END_STATION_COL not in encoded.columns
+    assert encoded[START_STATION_CODE_COL].dtype == "int16"
+    assert encoded[START_STATION_CODE_COL].tolist() == [UNKNOWN_CODE, 1, 1, 0]
+    assert dimension.names(encoded[END_STATION_CODE_COL]).tolist() == ["Bay St", "Unknown", "Bay St", "King St W"]
+
+
+def test_save_and_load_round_trip(monthly_files, tmp_path):
+    january, february = monthly_files
+    path = str(tmp_path / "stations.parquet")
+    StationDimension(path).update(january).save()
+
+    reloaded = StationDimension.load(path).update(february)
+    direct = StationDimension(path=None).update(january).update(february)
+
+    pd.testing.assert_frame_equal(reloaded.table, direct.table)
+    assert len(StationDimension.load(str(tmp_path / "missing.parquet"))) == 0
+
+
+def test_background_loader_encodes_chunks_and_saves_dimension(monthly_files, tmp_path):
+    trips = pd.concat(monthly_files, ignore_index=True)
+    trips = trips.assign(**{
+        TRIP_ID_COL: range(len(trips)), TRIP_DURATION_COL: 900, BIKE_ID_COL: range(100, 100 + len(trips)),
+        USER_TYPE_COL: "Annual Member", MODEL_COL: "ICONIC",
+        START_TIME_COL: trips[START_TIME_COL].dt.strftime("%m/%d/%Y %H:%M"),
+        END_TIME_COL: trips[END_TIME_COL].dt.strftime("%m/%d/%Y %H:%M"),
+    })
+    source, path = str(tmp_path / "trips.csv"), str(tmp_path / "stations.parquet")
+    trips.to_csv(source, index=False)
+
+    loader = BackgroundLoader(source, chunksize=3, station_dimension=StationDimension(path)).start()
+    result = loader.result()
+
+    assert result[START_STATION_CODE_COL].tolist() == [0, 1, 1, 2, 3, 1, 1, 0]
+    assert result[END_STATION_CODE_COL].tolist() == [1, 0, 2, 0, 0, 3, 0, 1]
+    assert START_STATION_COL not in result.columns and END_STATION_COL not in result.columns
+    assert len(StationDimension.load(path)) == 4
+
+    # Aggregates are keyed by code, so both names of station 7001 count towards it; names are joined last.
+    aggregates = loader.snapshot()
+    assert loader.decode(aggregates.top_stations(1)).iloc[0].tolist() == ["King St West", 4]
+    distinct_bikes = aggregates.bike_sketch.estimate(by=[START_STATION_CODE_COL])
+    assert distinct_bikes.loc[1] == pytest.approx(4, abs=0.5)
@@ -0,0 +1,88 @@
+import pandas as pd
+import pytest
+
+from src.data_processor.validation import validate_data, RULE_BITS
+from src.config import (
+    TRIP_ID_COL, TRIP_DURATION_COL, START_TIME_COL, END_TIME_COL,
+    START_STATION_ID_COL, END_STATION_ID_COL, QUALITY_FLAGS_COL
+)
+
+
+@pytest.fixture
+def mock_trips():
+    """
+    One clean trip followed by one trip per data-quality rule.
+    """
+    start = pd.to_datetime([
+        "2024-08-01 08:00",  # Row 0: clean
+        "2024-08-01 09:00",  # Row 1: reported duration does not match the timestamps
+        "2024-08-01 10:00",  # Row 2: ends before it starts
+        "2024-08-01 11:00",  # Row 3: duplicate of Row 0's Trip Id
+        "2024-08-01 12:00",  # Row 4: impossible station id
+        "2024-08-01 13:00",  # Row 5: two-day trip (outlier)
+    ])
+    end = pd.to_datetime([
+        "2024-08-01 08:10",
+        "2024-08-01 09:10",
+        "2024-08-01 09:50",
+        "2024-08-01 11:10",
+        "2024-08-01 12:10",
+        "2024-08-03 13:00",
+    ])
+    return pd.DataFrame({
+        TRIP_ID_COL: [1, 2, 3, 1, 5, 6],
+        TRIP_DURATION_COL: [600, 60, 600, 600, 600, 172800],
+        START_TIME_COL: start,
+        END_TIME_COL: end,
+        START_STATION_ID_COL: [7000, 7001, 7002, 7003, -4, 7005],
+        END_STATION_ID_COL: [7001, 7002, 7003, 7004, 7005, 7006],
+    })
+
+
+def test_report_counts_each_rule(mock_trips):
+    result = validate_data(mock_trips)
+    counts = dict(zip(result.report["rule"], result.report["violations"]))
+
+    # Row 2's reported 600 s also disagrees with its -600 s timestamps.
+    assert counts == {
+        "duration_mismatch": 2,
+        "end_before_start": 1,
+        "duplicate_trip_id": 1,
+        "invalid_station_id": 1,
+        "duration_outlier": 1,
+    }
+
+
+def test_drop_policy_keeps_only_clean_rows_and_quarantines_the_rest(mock_trips):
+    result = validate_data(mock_trips, policy="drop", quarantine=True)
+
+    assert list(result.data.index) == [0]
+    assert QUALITY_FLAGS_COL not in result.data.columns
+    assert list(result.quarantine.index) == [1, 2, 3, 4, 5]
+    assert result.quarantine.loc[4, QUALITY_FLAGS_COL] == RULE_BITS["invalid_station_id"]
+
+
+def test_flag_policy_keeps_all_rows_with_bitmask(mock_trips):
+    result = validate_data(mock_trips, policy="flag")
+
+    assert len(result.data) == len(mock_trips)
+    assert result.quarantine is None
+    assert result.data.loc[0, QUALITY_FLAGS_COL] == 0
+    assert result.data.loc[2, QUALITY_FLAGS_COL] == RULE_BITS["end_before_start"] | RULE_BITS["duration_mismatch"]
+
+
+def test_prior_trip_ids_catch_duplicates_across_chunks(mock_trips):
+    result = validate_data(mock_trips.iloc[[1]], prior_trip_ids=pd.Index([2]))
+
+    assert result.data.empty
+    assert result.report.set_index("rule").loc["duplicate_trip_id", "violations"] == 1
+
+
+def test_invalid_policy_raises(mock_trips):
+    with pytest.raises(ValueError):
+        validate_data(mock_trips, policy="ignore")
+
+
+def test_missing_column_raises(mock_trips):
+    with pytest.raises(KeyError):
+        validate_data(mock_trips.drop(columns=[TRIP_ID_COL]))
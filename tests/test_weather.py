@@ -0,0 +1,105 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.analytics.usage_patterns import calculate_daily_rides, calculate_kpis
+from src.analytics.weather import (
+    attach_weather, join_daily_weather, kpis_by_weather, load_weather, weather_at
+)
+from src.config import START_TIME_COL, DURATION_MIN_COL, WEATHER_TIME_COL, TEMP_C_COL, PRECIP_MM_COL
+
+
+@pytest.fixture
+def mock_weather(tmp_path):
+    """Three days of hourly observations in Environment Canada's export format, shuffled, with a gap."""
+    hours = pd.date_range("2024-08-01", periods=72, freq="h")
+    raw = pd.DataFrame({
+        "Longitude (x)": -79.4,
+        "Date/Time (LST)": hours.strftime("%Y-%m-%d %H:%M"),
+        "Temp (°C)": np.arange(72) % 35 - 5.0,
+        "Precip. Amount (mm)": np.where(np.arange(72) % 10 == 0, 3.0, 0.0),
+        "Weather": "NA",
+    })
+    raw = raw.drop(index=range(30, 36)).sample(frac=1, random_state=0)  # 06:00-11:00 on Aug 2 missing
+    path = tmp_path / "weather.csv"
+    raw.to_csv(path, index=False)
+    return load_weather(str(path))
+
+
+@pytest.fixture
+def mock_trips():
+    rng = np.random.default_rng(5)
+    starts = pd.Timestamp("2024-07-31 22:00") + pd.to_timedelta(rng.integers(0, 76 * 3600, 2000), unit="s")
+    return pd.DataFrame({
+        START_TIME_COL: starts,
+        DURATION_MIN_COL: rng.uniform(2, 40, 2000),
+        "rider_type": rng.choice(["Annual member", "Casual member"], 2000),
+        "Bike Id": rng.integers(1, 500, 2000),
+    }, index=pd.RangeIndex(100, 2100))
+
+
+def test_load_weather_normalises_columns(mock_weather):
+    assert list(mock_weather.columns) == [WEATHER_TIME_COL, TEMP_C_COL, PRECIP_MM_COL]
+    assert len(mock_weather) == 66
+    assert mock_weather[WEATHER_TIME_COL].is_monotonic_increasing
+
+
+def test_attach_matches_naive_lookup(mock_trips, mock_weather):
+    joined = attach_weather(mock_trips, mock_weather, columns=[START_TIME_COL])
+    assert list(joined.columns) == [START_TIME_COL, WEATHER_TIME_COL, TEMP_C_COL, PRECIP_MM_COL]
+    assert joined.index.equals(mock_trips.index)
+
+    observations = mock_weather.set_index(WEATHER_TIME_COL)
+    for start, row in zip(mock_trips[START_TIME_COL], joined.itertuples(index=False)):
+        earlier = observations[observations.index <= start]
+        if earlier.empty or start - earlier.index[-1] > pd.Timedelta(hours=3):
+            assert np.isnan(row.temp_c)
+        else:
+            assert row.weather_time == earlier.index[-1]
+            assert row.temp_c == earlier[TEMP_C_COL].iloc[-1]
+
+
+def test_attach_equals_merge_asof(mock_trips, mock_weather):
+    ordered = mock_trips.sort_values(START_TIME_COL)
+    expected = pd.merge_asof(ordered, mock_weather, left_on=START_TIME_COL, right_on=WEATHER_TIME_COL,
+                             tolerance=pd.Timedelta(hours=1))
+    joined = attach_weather(ordered, mock_weather, max_gap_hours=1)
+    pd.testing.assert_frame_equal(joined.reset_index(drop=True), expected)
+
+
+def test_trips_outside_coverage_get_no_weather(mock_weather):
+    times = pd.Series(pd.to_datetime(["2024-07-31 23:59", "2024-08-02 10:30", "2024-08-02 07:15", None]))
+    matched = weather_at(times, mock_weather)
+    assert matched[TEMP_C_COL].isna().tolist() == [True, True, False, True]
+    assert matched.loc[2, WEATHER_TIME_COL] == pd.Timestamp("2024-08-02 05:00")
+
+    with pytest.raises(ValueError):
+        weather_at(times, mock_weather.iloc[::-1])
+
+
+def test_daily_join(mock_trips, mock_weather):
+    daily = join_daily_weather(calculate_daily_rides(mock_trips), mock_weather)
+    assert list(daily.columns) == ["total_rides", "temp_mean", "temp_min", "temp_max", "precip_total", "hours"]
+    assert np.isnan(daily.loc["2024-07-31", "temp_mean"])
+    aug2 = mock_weather[mock_weather[WEATHER_TIME_COL].dt.day == 2]
+    assert daily.loc["2024-08-02", "hours"] == 18
+    assert daily.loc["2024-08-02", "precip_total"] == aug2[PRECIP_MM_COL].sum()
+
+
+def test_kpis_by_weather_match_per_bucket_kpis(mock_trips, mock_weather):
+    result = kpis_by_weather(mock_trips, mock_weather, by="temperature")
+    joined = attach_weather(mock_trips, mock_weather)
+    assert result["total_rides"].sum() == joined[TEMP_C_COL].notna().sum()
+
+    mild = joined[(joined[TEMP_C_COL] >= 10) & (joined[TEMP_C_COL] < 20)]
+    expected = calculate_kpis(mild)
+    assert result.loc["10 to 20 °C", "total_rides"] == expected["total_rides"]
+    assert result.loc["10 to 20 °C", "avg_duration"] == pytest.approx(expected["avg_duration"])
+    assert result.loc["10 to 20 °C", "subscriber_rate"] == pytest.approx(expected["subscriber_rate"])
+
+    wet = kpis_by_weather(mock_trips, mock_weather, by="precipitation")
+    assert wet.loc["Heavy rain", "hours"] == (mock_weather[PRECIP_MM_COL] >= 2.5).sum()
+    with pytest.raises(ValueError):
+        kpis_by_weather(mock_trips, mock_weather, by="wind")
+    with pytest.raises(KeyError):
+        kpis_by_weather(mock_trips.drop(columns=[DURATION_MIN_COL]), mock_weather)